@@ -26,6 +26,15 @@ from bs4 import BeautifulSoup
 import requests
 import os
 
+from metrics import track_browser
+from tracing import span, traced
+
+
+async def _playwright_step(name: str, awaitable):
+    """Await one Playwright call inside a trace span."""
+    with span(f"playwright.{name}", "playwright"):
+        return await awaitable
+
 # 导入浏览器设置模块
 def get_browser_path():
     """获取可用的浏览器路径"""
@@ -180,6 +189,7 @@ class ForumClient:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36'
         })
 
+    @traced("forum.browser_context", "forum")
     async def _get_browser_context(self, p: Any, email: str, password: str, timeout_seconds: int = 30):
         """Authenticate and return a browser context with the session."""
         # Import brain_client here to avoid circular dependency
@@ -228,20 +238,22 @@ class ForumClient:
         ]
         
         try:
-            if browser_path and os.path.exists(browser_path):
-                log(f"使用自定义浏览器路径: {browser_path}", "INFO")
-                browser = await asyncio.wait_for(
-                    p.chromium.launch(executable_path=browser_path, args=browser_args, timeout=timeout_seconds * 1000),
-                    timeout=timeout_seconds + 10
-                )
-            else:
-                log("使用默认Playwright浏览器", "INFO")
-                browser = await asyncio.wait_for(
-                    p.chromium.launch(headless=self.headless, args=browser_args, timeout=timeout_seconds * 1000),
-                    timeout=timeout_seconds + 10
-                )
+            with span("playwright.launch", "playwright"):
+                if browser_path and os.path.exists(browser_path):
+                    log(f"使用自定义浏览器路径: {browser_path}", "INFO")
+                    browser = await asyncio.wait_for(
+                        p.chromium.launch(executable_path=browser_path, args=browser_args, timeout=timeout_seconds * 1000),
+                        timeout=timeout_seconds + 10
+                    )
+                else:
+                    log("使用默认Playwright浏览器", "INFO")
+                    browser = await asyncio.wait_for(
+                        p.chromium.launch(headless=self.headless, args=browser_args, timeout=timeout_seconds * 1000),
+                        timeout=timeout_seconds + 10
+                    )
         except asyncio.TimeoutError:
             raise Exception(f"Browser launch timed out after {timeout_seconds + 10}s")
+        track_browser(browser, "forum")
             
         try:
             context = await asyncio.wait_for(
@@ -254,7 +266,7 @@ class ForumClient:
 
         log("Transferring authentication session to browser...", "INFO")
         try:
-            cookies = brain_client.session.cookies
+            cookies = brain_client.session.cookies.jar
             playwright_cookies = []
             for cookie in cookies:
                 cookie_dict = {
@@ -270,13 +282,14 @@ class ForumClient:
                     cookie_dict['expires'] = cookie.expires
                 playwright_cookies.append(cookie_dict)
             
-            await asyncio.wait_for(context.add_cookies(playwright_cookies), timeout=10)
+            await _playwright_step("add_cookies", asyncio.wait_for(context.add_cookies(playwright_cookies), timeout=10))
             log("Session transferred.", "SUCCESS")
         except Exception as e:
             log(f"Cookie transfer warning (continuing): {str(e)}", "WARNING")
         
         return browser, context
 
+    @traced("forum.get_glossary_terms", "forum")
     async def get_glossary_terms(self, email: str, password: str) -> List[Dict[str, str]]:
         """Extract glossary terms from the forum using Playwright."""
         if async_playwright is None:
@@ -288,12 +301,12 @@ class ForumClient:
                 log("Starting glossary extraction process with Playwright", "INFO")
                 browser, context = await self._get_browser_context(p, email, password)
                 
-                page = await context.new_page()
+                page = await _playwright_step("new_page", context.new_page())
                 log("Navigating to BRAIN support forum glossary...", "INFO")
-                await page.goto("https://support.worldquantbrain.com/hc/en-us/articles/4902349883927-Click-here-for-a-list-of-terms-and-their-definitions")
+                await _playwright_step("goto", page.goto("https://support.worldquantbrain.com/hc/en-us/articles/4902349883927-Click-here-for-a-list-of-terms-and-their-definitions"))
                 
                 log("Extracting glossary content...", "INFO")
-                content = await page.content()
+                content = await _playwright_step("content", page.content())
                 
                 terms = _parse_glossary_terms(content)
                 
@@ -309,6 +322,7 @@ class ForumClient:
                     await browser.close()
                     log("Browser closed.", "INFO")
 
+    @traced("forum.search_forum_posts", "forum")
     async def search_forum_posts(self, email: str, password: str, search_query: str, max_results: int = 50, locale: str = "zh-cn") -> Dict[str, Any]:
         """Search for posts on the forum using Playwright, with pagination and timeout protection."""
         if async_playwright is None:
@@ -328,7 +342,7 @@ class ForumClient:
                         timeout=timeout_seconds + 15
                     )
 
-                    page = await asyncio.wait_for(context.new_page(), timeout=timeout_seconds)
+                    page = await _playwright_step("new_page", asyncio.wait_for(context.new_page(), timeout=timeout_seconds))
                     page.set_default_timeout(timeout_seconds * 1000)
                     page.set_default_navigation_timeout(timeout_seconds * 1000)
                     
@@ -342,7 +356,7 @@ class ForumClient:
                         
                         try:
                             response = await asyncio.wait_for(
-                                page.goto(search_url, wait_until="domcontentloaded"),
+                                _playwright_step("goto", page.goto(search_url, wait_until="domcontentloaded")),
                                 timeout=timeout_seconds
                             )
                             if response and response.status == 404:
@@ -350,7 +364,7 @@ class ForumClient:
                                 break
                             
                             await asyncio.wait_for(
-                                page.wait_for_selector('ul.search-results-list', timeout=self.selector_timeout_ms),
+                                _playwright_step("wait_for_selector", page.wait_for_selector('ul.search-results-list', timeout=self.selector_timeout_ms)),
                                 timeout=min(timeout_seconds, 15)
                             )
                         except asyncio.TimeoutError:
@@ -361,7 +375,7 @@ class ForumClient:
                             break
 
                         try:
-                            content = await asyncio.wait_for(page.content(), timeout=10)
+                            content = await _playwright_step("content", asyncio.wait_for(page.content(), timeout=10))
                         except asyncio.TimeoutError:
                             log(f"Page content retrieval timed out on page {page_num}", "WARNING")
                             break
@@ -473,6 +487,7 @@ class ForumClient:
                 "error": f"Forum search timed out after {overall_timeout}s"
             }
 
+    @traced("forum.read_full_forum_post", "forum")
     async def read_full_forum_post(self, email: str, password: str, post_url_or_id: str, include_comments: bool = True) -> Dict[str, Any]:
         """Read a complete forum post and all its comments using Playwright."""
         if async_playwright is None:
@@ -489,18 +504,18 @@ class ForumClient:
                     initial_url = f"https://support.worldquantbrain.com/hc/zh-cn/community/posts/{post_url_or_id}"
 
                 browser, context = await self._get_browser_context(p, email, password)
-                page = await context.new_page()
+                page = await _playwright_step("new_page", context.new_page())
 
                 # --- Get Main Post Content and Final URL ---
                 log(f"Navigating to initial URL: {initial_url}", "INFO")
-                await page.goto(initial_url)
-                await page.wait_for_selector('.post-body, .article-body', timeout=self.selector_timeout_ms)
+                await _playwright_step("goto", page.goto(initial_url))
+                await _playwright_step("wait_for_selector", page.wait_for_selector('.post-body, .article-body', timeout=self.selector_timeout_ms))
                 
                 # Get the final URL after any redirects
                 base_url = re.sub(r'(\?|&)page=\d+', '', page.url).split('#')[0]
                 log(f"Resolved to Base URL: {base_url}", "INFO")
-                await page.wait_for_selector('.post-body, .article-body', timeout=self.selector_timeout_ms)
-                content = await page.content()
+                await _playwright_step("wait_for_selector", page.wait_for_selector('.post-body, .article-body', timeout=self.selector_timeout_ms))
+                content = await _playwright_step("content", page.content())
                 soup = BeautifulSoup(content, 'html.parser')
 
                 post_data = {}
@@ -530,16 +545,16 @@ class ForumClient:
                         log(f"Navigating to comment page: {comment_url}", "INFO")
                         
                         try:
-                            response = await page.goto(comment_url)
+                            response = await _playwright_step("goto", page.goto(comment_url))
                             if response.status == 404:
                                 log(f"Page {page_num} returned 404. End of comments.", "INFO")
                                 break
-                            await page.wait_for_selector('.comment-list', timeout=self.selector_timeout_ms)
+                            await _playwright_step("wait_for_selector", page.wait_for_selector('.comment-list', timeout=self.selector_timeout_ms))
                         except Exception as e:
                             log(f"Could not load page {page_num}: {e}. Assuming end of comments.", "INFO")
                             break
 
-                        comment_soup = BeautifulSoup(await page.content(), 'html.parser')
+                        comment_soup = BeautifulSoup(await _playwright_step("content", page.content()), 'html.parser')
                         comment_elements = comment_soup.select('.comment')
 
                         if not comment_elements:
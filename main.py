@@ -7,8 +7,9 @@ A comprehensive Model Context Protocol (MCP) server for WorldQuant BRAIN platfor
 import json
 import time
 import asyncio
+import contextvars
 import logging
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any, Union, Tuple
 import re
 import base64
 from bs4 import BeautifulSoup
@@ -19,20 +20,36 @@ import sys
 from pathlib import Path
 from time import sleep
 from urllib.parse import urljoin
+from email.utils import parsedate_to_datetime
 import redis
 import hashlib
-
-import requests
+import functools
+import heapq
+import math
+import random
+import sqlite3
+import threading
+import uuid
+import weakref
+import zlib
+from collections import OrderedDict, deque
+from contextlib import aclosing, asynccontextmanager
+
+import httpx
 import pandas as pd
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field, EmailStr
 
 # Import the new forum client
 from forum_functions import forum_client
+from metrics import registry as metrics_registry, track_browser
+from tracing import detached, span, trace_call, traced, traced_sleep
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+# httpx logs every request at INFO; keep stderr readable
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 # Pydantic models for type safety
 class AuthCredentials(BaseModel):
@@ -65,8 +82,1246 @@ class SimulationData(BaseModel):
     combo: Optional[str] = None
     selection: Optional[str] = None
 
+class MemoryLRUCache:
+    """Size-bounded in-process LRU holding parsed cache values with per-entry expiry.
+
+    Values are shared between callers, so they must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int = 512):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_with_ttl(key)[0]
+
+    def get_with_ttl(self, key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """Return (value, remaining_ttl), or (None, None) if missing/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        expires_at, _, value = entry
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            self.delete(key)
+            return None, None
+        self._entries.move_to_end(key)
+        return value, remaining
+
+    @classmethod
+    def estimate_size(cls, value: Any, sample: int = 64) -> int:
+        """Approximate bytes held by a parsed JSON value, counting every container and leaf.
+
+        Dict keys are left out (json.loads shares them between objects); lists longer than
+        `sample` are extrapolated from evenly spaced elements so large catalogs stay cheap to size.
+        """
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(cls.estimate_size(item, sample) for item in value.values())
+        if isinstance(value, (list, tuple)):
+            size = sys.getsizeof(value)
+            count = len(value)
+            if count > sample:
+                step = count / sample
+                picked = sum(cls.estimate_size(value[int(i * step)], sample) for i in range(sample))
+                return size + int(picked * count / sample)
+            return size + sum(cls.estimate_size(item, sample) for item in value)
+        return sys.getsizeof(value)
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store value; its estimated in-memory size counts against the memory cap."""
+        self.delete(key)
+        if ttl <= 0:
+            return
+        size = self.estimate_size(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (time.time() + ttl, size, value)
+        self._bytes += size
+        while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def delete(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def usage(self) -> Dict[str, int]:
+        return {'entries': len(self._entries), 'bytes': self._bytes, 'max_bytes': self.max_bytes}
+
+
+class DiskCache:
+    """Local file cache used as the second tier when Redis is unavailable.
+
+    Each key is stored as '<expires_at>\n<json>' in its own file.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.md5(key.encode()).hexdigest()}.json"
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (raw_json, remaining_ttl) or None if missing/expired."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                expires_at = float(f.readline())
+                raw = f.read()
+        except (OSError, ValueError):
+            return None
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            self.delete(key)
+            return None
+        return raw, remaining
+
+    def set(self, key: str, raw: str, ttl: float):
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(f"{time.time() + ttl}\n")
+            f.write(raw)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str):
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+
+class CatalogSnapshotStore:
+    """Date-versioned SQLite store of full datasets/datafields catalogs.
+
+    Each catalog is one zlib-compressed JSON blob keyed by (version, cache_key), where
+    cache_key is the same key get_datasets/get_datafields use for the live cache.
+    Readers only see versions marked complete.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "version TEXT PRIMARY KEY, started_at REAL, completed_at REAL, catalog_count INTEGER DEFAULT 0)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS catalogs ("
+                "version TEXT, cache_key TEXT, kind TEXT, params TEXT, item_count INTEGER, data BLOB, "
+                "PRIMARY KEY (version, cache_key))"
+            )
+
+    def latest_version(self) -> Optional[Tuple[str, float]]:
+        """(version, completed_at) of the newest complete snapshot, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, completed_at FROM snapshots WHERE completed_at IS NOT NULL "
+                "ORDER BY version DESC LIMIT 1"
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def get(self, cache_key: str, version: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM catalogs WHERE version = ? AND cache_key = ?", (version, cache_key)
+            ).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row else None
+
+    @staticmethod
+    def staging_version(version: str) -> str:
+        """Name a version is built under until finish() publishes it."""
+        return f"staging:{version}"
+
+    def begin(self, version: str) -> str:
+        """Start building version into a fresh staging version and return its name.
+
+        The published version (if any) stays readable until finish() replaces it.
+        """
+        staging = self.staging_version(version)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM catalogs WHERE version = ?", (staging,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (version, started_at, completed_at, catalog_count) VALUES (?, ?, NULL, 0)",
+                (staging, time.time()),
+            )
+        return staging
+
+    def put(self, version: str, cache_key: str, kind: str, params: Dict[str, Any], data: Dict[str, Any]):
+        blob = zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalogs (version, cache_key, kind, params, item_count, data) VALUES (?, ?, ?, ?, ?, ?)",
+                (version, cache_key, kind, json.dumps(params, sort_keys=True), len(data.get('results', [])), blob),
+            )
+
+    def finish(self, version: str, keep: int = 3):
+        """Publish the staged build of version in one transaction and drop all but the newest `keep` complete versions."""
+        staging = self.staging_version(version)
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT started_at FROM snapshots WHERE version = ?", (staging,)).fetchone()
+            started_at = row[0] if row else time.time()
+            count = self._conn.execute("SELECT COUNT(*) FROM catalogs WHERE version = ?", (staging,)).fetchone()[0]
+            self._conn.execute("DELETE FROM catalogs WHERE version = ?", (version,))
+            self._conn.execute("UPDATE catalogs SET version = ? WHERE version = ?", (version, staging))
+            self._conn.execute("DELETE FROM snapshots WHERE version = ?", (staging,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (version, started_at, completed_at, catalog_count) VALUES (?, ?, ?, ?)",
+                (version, started_at, time.time(), count),
+            )
+            stale = [row[0] for row in self._conn.execute(
+                "SELECT version FROM snapshots WHERE completed_at IS NOT NULL ORDER BY version DESC LIMIT -1 OFFSET ?",
+                (max(1, keep),),
+            )]
+            for old_version in stale:
+                self._conn.execute("DELETE FROM catalogs WHERE version = ?", (old_version,))
+                self._conn.execute("DELETE FROM snapshots WHERE version = ?", (old_version,))
+
+    def discard(self, version: str):
+        """Drop the staged build of version, leaving the published version untouched."""
+        staging = self.staging_version(version)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM catalogs WHERE version = ?", (staging,))
+            self._conn.execute("DELETE FROM snapshots WHERE version = ?", (staging,))
+
+    def info(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT version, started_at, completed_at, catalog_count FROM snapshots ORDER BY version DESC"
+            ).fetchall()
+        return [
+            {'version': v, 'started_at': s, 'completed_at': c, 'catalog_count': n, 'complete': c is not None}
+            for v, s, c, n in rows
+        ]
+
+
+def datafield_search_text(item: Dict[str, Any]) -> str:
+    """Lower-cased text a datafield is searched on: name, description, id and dataset name/vendor/id."""
+    searchable_text_parts = []
+    for key in ('name', 'description', 'id'):
+        if item.get(key):
+            searchable_text_parts.append(str(item[key]))
+    dataset = item.get('dataset', {})
+    if isinstance(dataset, dict):
+        for key in ('name', 'vendor', 'id'):
+            if dataset.get(key):
+                searchable_text_parts.append(str(dataset[key]))
+    return ' '.join(searchable_text_parts).lower()
+
+
+def dataset_search_text(item: Dict[str, Any]) -> str:
+    """Lower-cased text a dataset is searched on: id, name, description, category, subcategory and themes."""
+    searchable_text_parts = []
+    for key in ('id', 'name', 'description'):
+        if item.get(key):
+            searchable_text_parts.append(str(item[key]))
+    for key in ('category', 'subcategory'):
+        value = item.get(key)
+        if isinstance(value, dict):
+            searchable_text_parts.extend(str(value[k]) for k in ('id', 'name') if value.get(k))
+        elif value:
+            searchable_text_parts.append(str(value))
+    themes = item.get('themes')
+    if isinstance(themes, list):
+        for theme in themes:
+            name = theme.get('name') if isinstance(theme, dict) else theme
+            if name:
+                searchable_text_parts.append(str(name))
+    return ' '.join(searchable_text_parts).lower()
+
+
+def dataset_match_rank(item: Dict[str, Any], term: str) -> int:
+    """Match quality of a search phrase for a dataset: exact id/name > prefix > name/id > category > other."""
+    term = term.lower()
+    identifiers = [str(item.get(key) or '').lower() for key in ('id', 'name')]
+    if term in identifiers:
+        return 4
+    if any(value.startswith(term) for value in identifiers):
+        return 3
+    if any(term in value for value in identifiers):
+        return 2
+    for key in ('category', 'subcategory'):
+        value = item.get(key)
+        if isinstance(value, dict) and any(term in str(value.get(k) or '').lower() for k in ('id', 'name')):
+            return 1
+    return 0
+
+
+def datafield_rank_fields(item: Dict[str, Any]) -> Tuple[str, str]:
+    """(name text, description text) of a datafield for field-weighted ranking."""
+    name_text = ' '.join(str(item[k]) for k in ('id', 'name') if item.get(k))
+    return name_text, datafield_search_text({k: v for k, v in item.items() if k not in ('id', 'name')})
+
+
+def dataset_rank_fields(item: Dict[str, Any]) -> Tuple[str, str]:
+    """(name text, description text) of a dataset for field-weighted ranking."""
+    name_text = ' '.join(str(item[k]) for k in ('id', 'name') if item.get(k))
+    return name_text, dataset_search_text({k: v for k, v in item.items() if k not in ('id', 'name')})
+
+
+def project_fields(item: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Return a new dict with only the requested fields of item.
+
+    Dotted names select nested values ("dataset.id" -> {"dataset": {"id": ...}});
+    missing fields are left out. The cached item itself is never modified.
+    """
+    projected: Dict[str, Any] = {}
+    for field in fields:
+        source: Any = item
+        parts = field.split('.')
+        for part in parts:
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = source
+    return projected
+
+
+def normalize_fields(fields: Optional[Any]) -> Optional[List[str]]:
+    """Accept fields as a list or a comma-separated string ("id,type,coverage")."""
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    normalized = [str(field).strip() for field in fields if str(field).strip()]
+    return normalized or None
+
+
+_RANK_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+class CatalogSearchIndex:
+    """Character-trigram inverted index over the searchable text of a catalog.
+
+    Multi-keyword queries are AND-ed substring matches, exactly like a linear scan:
+    posting lists narrow down the candidates and every candidate is then verified with `in`.
+    Results keep catalog order.
+    """
+
+    NGRAM = 3
+    # Ranking: BM25 per field, name/id matches weigh more than description matches
+    FIELD_WEIGHTS = (3.0, 1.0)
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+
+    def __init__(self, items: List[Dict[str, Any]], text_fn, rank_fields_fn=None):
+        self.items = items
+        self.rank_fields_fn = rank_fields_fn
+        self._field_postings: Optional[List[Dict[str, List[Tuple[int, int]]]]] = None
+        self.texts = [text_fn(item) for item in items]
+        postings: Dict[str, List[int]] = {}
+        n = self.NGRAM
+        for doc_id, text in enumerate(self.texts):
+            for gram in {text[i:i + n] for i in range(len(text) - n + 1)}:
+                postings.setdefault(gram, []).append(doc_id)
+        self.postings = postings
+
+    def candidates(self, keyword: str) -> Optional[set]:
+        """Doc ids that contain every trigram of keyword; None if keyword is too short to index."""
+        n = self.NGRAM
+        if len(keyword) < n:
+            return None
+        grams = {keyword[i:i + n] for i in range(len(keyword) - n + 1)}
+        lists = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        result = set(lists[0])
+        for posting in lists[1:]:
+            if not result:
+                break
+            result.intersection_update(posting)
+        return result
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        keywords = [kw.strip().lower() for kw in query.split() if kw.strip()]
+        if not keywords:
+            return list(self.items)
+        doc_ids: Optional[set] = None
+        # Longest keywords first: they have the most selective posting lists
+        for keyword in sorted(keywords, key=len, reverse=True):
+            found = self.candidates(keyword)
+            if found is None:
+                continue
+            doc_ids = found if doc_ids is None else doc_ids & found
+            if not doc_ids:
+                return []
+        ordered = sorted(doc_ids) if doc_ids is not None else range(len(self.texts))
+        texts = self.texts
+        return [self.items[i] for i in ordered if all(kw in texts[i] for kw in keywords)]
+
+    def _build_rank_index(self):
+        """Token postings per field, built on the first ranked query."""
+        field_count = len(self.FIELD_WEIGHTS)
+        postings: List[Dict[str, List[Tuple[int, int]]]] = [{} for _ in range(field_count)]
+        lengths = [[0] * len(self.items) for _ in range(field_count)]
+        for doc_id, item in enumerate(self.items):
+            for field, text in enumerate(self.rank_fields_fn(item)):
+                tokens = _RANK_TOKEN_RE.findall(text.lower())
+                lengths[field][doc_id] = len(tokens)
+                counts: Dict[str, int] = {}
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+                for token, tf in counts.items():
+                    postings[field].setdefault(token, []).append((doc_id, tf))
+        self._field_lengths = lengths
+        self._avg_lengths = [(sum(field_lengths) / len(field_lengths)) if field_lengths else 0.0 for field_lengths in lengths]
+        self._field_postings = postings
+
+    def _expand(self, field: int, keyword: str) -> List[Tuple[str, float]]:
+        """Vocabulary tokens a keyword matches in one field: exact 1.0, prefix 0.7, substring 0.4."""
+        vocabulary = self._field_postings[field]
+        if len(keyword) < 2:
+            return [(keyword, 1.0)] if keyword in vocabulary else []
+        expansions = []
+        for token in vocabulary:
+            if token == keyword:
+                expansions.append((token, 1.0))
+            elif token.startswith(keyword):
+                expansions.append((token, 0.7))
+            elif keyword in token:
+                expansions.append((token, 0.4))
+        return expansions
+
+    def rank(self, query: str, offset: int = 0, limit: int = 20,
+             tier_fn: Optional[Callable[[Dict[str, Any], str], int]] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """Top results for query by field-weighted BM25 with fuzzy (prefix/substring) term matching.
+
+        Returns (page of result copies carrying 'search_score', total number of matching items).
+        Items matching more of the query keywords score proportionally higher. tier_fn(item, query)
+        optionally groups results first (higher tiers before lower), BM25 ordering within a tier.
+        """
+        if self.rank_fields_fn is None:
+            raise ValueError("This catalog index does not support ranking")
+        if self._field_postings is None:
+            self._build_rank_index()
+        keywords = list(dict.fromkeys(_RANK_TOKEN_RE.findall(query.lower())))
+        if not keywords:
+            return [], 0
+
+        doc_count = len(self.items)
+        k1, b = self.BM25_K1, self.BM25_B
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for keyword in keywords:
+            keyword_docs = set()
+            for field, weight in enumerate(self.FIELD_WEIGHTS):
+                avg_length = self._avg_lengths[field] or 1.0
+                field_lengths = self._field_lengths[field]
+                for token, match_weight in self._expand(field, keyword):
+                    posting = self._field_postings[field][token]
+                    idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+                    for doc_id, tf in posting:
+                        norm = tf * (k1 + 1) / (tf + k1 * (1 - b + b * field_lengths[doc_id] / avg_length))
+                        scores[doc_id] = scores.get(doc_id, 0.0) + weight * match_weight * idf * norm
+                        keyword_docs.add(doc_id)
+            for doc_id in keyword_docs:
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+
+        for doc_id in scores:
+            scores[doc_id] *= matched[doc_id] / len(keywords)
+        if tier_fn is not None:
+            tiers = {doc_id: tier_fn(self.items[doc_id], query) for doc_id in scores}
+            order_key = lambda pair: (-tiers[pair[0]], -pair[1], pair[0])
+        else:
+            order_key = lambda pair: (-pair[1], pair[0])
+        # Ties keep catalog order
+        top = heapq.nsmallest(offset + limit, scores.items(), key=order_key)[offset:]
+        page = [{**self.items[doc_id], 'search_score': round(score, 4)} for doc_id, score in top]
+        return page, len(scores)
+
+    def search_phrase(self, phrase: str) -> List[Dict[str, Any]]:
+        """Items whose text contains the whole phrase (spaces included), in catalog order."""
+        phrase = phrase.lower()
+        doc_ids = self.candidates(phrase)
+        ordered = sorted(doc_ids) if doc_ids is not None else range(len(self.texts))
+        texts = self.texts
+        return [self.items[i] for i in ordered if phrase in texts[i]]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How GETs to one kind of endpoint are retried by BrainApiClient._request.
+
+    Waits use full-jitter exponential backoff (uniform between 0 and base_delay * 2^n, capped
+    at max_delay) unless the response carries Retry-After, which is honoured as given. Retrying
+    stops after max_attempts or once the next wait would pass max_elapsed seconds; the last
+    response is then returned (or the last connection error raised). With retry_empty, a
+    successful response whose body is empty (or empty JSON) means "not computed yet".
+    """
+
+    name: str
+    max_attempts: int = 5
+    max_elapsed: float = 60.0
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    retry_empty: bool = False
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def retry_reason(self, response: httpx.Response) -> Optional[str]:
+        if response.status_code == 429:
+            return 'rate_limited'
+        if response.status_code in self.retry_statuses:
+            return 'error'
+        if self.retry_empty and response.is_success:
+            if not (response.text or "").strip():
+                return 'empty_body'
+            try:
+                if not response.json():
+                    return 'empty_body'
+            except ValueError:
+                return 'parse_error'
+        return None
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+# Retry policies for GET endpoints, first matching path pattern wins; other requests are not retried
+RETRY_POLICIES: List[Tuple["re.Pattern[str]", RetryPolicy]] = [
+    (re.compile(r'^/alphas/[^/]+/recordsets/[^/]+$'),
+     RetryPolicy('alpha_recordset', max_attempts=8, max_elapsed=90, base_delay=2, max_delay=15, retry_empty=True)),
+    (re.compile(r'^/alphas/[^/]+/correlations/[^/]+$'),
+     RetryPolicy('alpha_correlation', max_attempts=60, max_elapsed=600, base_delay=5, max_delay=30, retry_empty=True)),
+    (re.compile(r'^/alphas/[^/]+$'),
+     RetryPolicy('alpha_details', max_attempts=5, max_elapsed=60, base_delay=3, max_delay=15)),
+]
+
+
+def retry_policy_for(method: str, url: str) -> Optional[RetryPolicy]:
+    if method.upper() != 'GET':
+        return None
+    path = httpx.URL(url).path
+    for pattern, policy in RETRY_POLICIES:
+        if pattern.match(path):
+            return policy
+    return None
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised without contacting BRAIN while the circuit breaker is open."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"BRAIN API is unavailable (circuit breaker open), retry in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Fails requests fast while BRAIN is down.
+
+    After failure_threshold consecutive failures (connection errors, timeouts, 5xx) the circuit
+    opens and requests raise CircuitOpenError for reset_timeout seconds. Then a single probe
+    request is let through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = 'closed', 'half_open', 'open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def before_request(self):
+        if self.state == self.CLOSED:
+            return
+        if self.state == self.OPEN:
+            remaining = self.retry_in()
+            if remaining > 0:
+                self.rejected += 1
+                raise CircuitOpenError(remaining)
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self._probe_in_flight:
+            self.rejected += 1
+            raise CircuitOpenError(1.0)
+        self._probe_in_flight = True
+
+    def record(self, success: Optional[bool]) -> Optional[str]:
+        """Record a request outcome (None: cancelled). Returns the new state when it changed."""
+        if success is None:
+            self._probe_in_flight = False
+            return None
+        if success:
+            self.failures = 0
+            self._probe_in_flight = False
+            if self.state != self.CLOSED:
+                self.state = self.CLOSED
+                return self.CLOSED
+            return None
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+            return self.OPEN
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'rejected': self.rejected,
+            'retry_in_seconds': round(self.retry_in(), 1) if self.state == self.OPEN else 0,
+        }
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency window for upstream requests.
+
+    While the window is in use and responses are healthy (latency within
+    `latency_tolerance` x the running baseline, recent error rate below `max_error_rate`)
+    it grows by about one request per window of responses. Overload signals (429s, error
+    responses carrying Retry-After, timeouts) multiply it by `decrease_factor`, at most once
+    per `cooldown` seconds so a burst of throttled requests sent together counts once.
+    """
+
+    def __init__(self, initial: int, min_limit: int = 1, max_limit: int = 64, adaptive: bool = True,
+                 latency_tolerance: float = 2.0, max_error_rate: float = 0.05,
+                 decrease_factor: float = 0.5, cooldown: float = 1.0):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.adaptive = adaptive
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._baseline_latency: Optional[float] = None
+        self._error_rate = 0.0
+        self._last_decrease = 0.0
+
+    @property
+    def window(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self):
+        if self.in_flight < self.window and not self._waiters:
+            self.in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the waiter was cancelled
+                self.in_flight -= 1
+                self._wake()
+            else:
+                future.cancel()
+                try:
+                    self._waiters.remove(future)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self, signal: str, latency: float) -> bool:
+        """Give back a permit. signal is 'ok', 'error', 'overload' or 'dropped' (cancelled).
+
+        Returns True when the window was cut.
+        """
+        self.in_flight -= 1
+        was_full = self.in_flight + 1 >= self.window
+        cut = self._adjust(signal, latency, was_full)
+        self._wake()
+        return cut
+
+    def _adjust(self, signal: str, latency: float, was_full: bool) -> bool:
+        if not self.adaptive or signal == 'dropped':
+            return False
+        self._error_rate = 0.9 * self._error_rate + (0.1 if signal in ('error', 'overload') else 0.0)
+        if signal == 'overload':
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return False
+            self._last_decrease = now
+            previous = self.limit
+            self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+            return self.limit < previous
+        if signal != 'ok':
+            return False
+        if self._baseline_latency is None:
+            self._baseline_latency = latency
+        threshold = self.latency_tolerance * self._baseline_latency
+        # Spikes are clamped so one slow response does not drag the baseline up
+        self._baseline_latency += 0.05 * (min(latency, threshold) - self._baseline_latency)
+        if was_full and latency <= threshold and self._error_rate < self.max_error_rate:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        return False
+
+    def _wake(self):
+        while self._waiters and self.in_flight < self.window:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'limit': round(self.limit, 2),
+            'in_flight': self.in_flight,
+            'waiting': len(self._waiters),
+            'min_limit': self.min_limit,
+            'max_limit': self.max_limit,
+            'adaptive': self.adaptive,
+            'baseline_latency_seconds': round(self._baseline_latency, 4) if self._baseline_latency else None,
+            'error_rate': round(self._error_rate, 4),
+        }
+
+
+# MCP client (session) of the tool call being served; set per call by the tool wrapper
+current_mcp_client: contextvars.ContextVar[str] = contextvars.ContextVar('brain_mcp_client', default='local')
+
+
+class SimulationSlotScheduler:
+    """Fair queue for the account's quota of running simulations.
+
+    A slot is held from submission until the simulation (or multisimulation) has finished
+    on BRAIN; the POST itself is bounded separately by the client's submission semaphore.
+    Waiters queue per priority class and per MCP client: 'interactive' requests are served
+    before 'batch' ones, except that batch gets every `batch_every`-th slot while both are
+    waiting; within a class clients take turns, each client's own requests in order.
+    """
+
+    PRIORITIES = ('interactive', 'batch')
+
+    def __init__(self, capacity: int, batch_every: int = 4):
+        self.capacity = max(1, capacity)
+        self.batch_every = batch_every
+        self.in_use = 0
+        self.granted = 0
+        self._queues: Dict[str, "OrderedDict[str, deque]"] = {priority: OrderedDict() for priority in self.PRIORITIES}
+        self._interactive_streak = 0
+        self._holders: Dict[str, int] = {}
+
+    def set_capacity(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._dispatch()
+
+    def waiting(self) -> int:
+        return sum(len(waiters) for queue in self._queues.values() for waiters in queue.values())
+
+    @asynccontextmanager
+    async def slot(self, priority: str = 'interactive', client: Optional[str] = None,
+                   on_wait: Optional[Callable[[int, int], Awaitable[None]]] = None):
+        client = client or current_mcp_client.get()
+        await self.acquire(priority, client, on_wait)
+        try:
+            yield
+        finally:
+            self.release(client)
+
+    async def acquire(self, priority: str, client: str,
+                      on_wait: Optional[Callable[[int, int], Awaitable[None]]] = None,
+                      force: bool = False, report_every: float = 5.0):
+        """Wait for a slot. on_wait gets (queue position, total waiting) every report_every seconds.
+
+        force takes a slot even beyond capacity, for simulations already running upstream.
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown simulation priority: {priority}")
+        if force or (self.in_use < self.capacity and not self.waiting()):
+            self._grant(client)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(client, deque()).append(future)
+        try:
+            while not future.done():
+                if on_wait is not None:
+                    await on_wait(self.position(future), self.waiting())
+                await asyncio.wait([future], timeout=report_every)
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # Granted just as the waiter gave up
+                self.release(client)
+            else:
+                future.cancel()
+                self._remove(priority, client, future)
+            raise
+
+    def release(self, client: str):
+        self.in_use = max(0, self.in_use - 1)
+        held = self._holders.get(client, 0) - 1
+        if held > 0:
+            self._holders[client] = held
+        else:
+            self._holders.pop(client, None)
+        self._dispatch()
+
+    def position(self, future: "asyncio.Future") -> int:
+        """1-based place of a waiter in the order slots would be handed out."""
+        queues = {priority: OrderedDict((client, deque(waiters)) for client, waiters in queue.items())
+                  for priority, queue in self._queues.items()}
+        streak = self._interactive_streak
+        position = 0
+        while True:
+            priority = self._pick(queues, streak)
+            if priority is None:
+                return position + 1
+            streak = 0 if priority == 'batch' else streak + 1
+            position += 1
+            if self._take(queues[priority]) is future:
+                return position
+
+    def snapshot(self, client: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            'capacity': self.capacity,
+            'in_use': self.in_use,
+            'waiting': {
+                priority: {name: len(waiters) for name, waiters in queue.items()}
+                for priority, queue in self._queues.items()
+            },
+            'held_by_client': dict(self._holders),
+            **({'client': client} if client else {}),
+        }
+
+    def _grant(self, client: str):
+        self.in_use += 1
+        self.granted += 1
+        self._holders[client] = self._holders.get(client, 0) + 1
+
+    def _pick(self, queues: Dict[str, "OrderedDict[str, deque]"], streak: int) -> Optional[str]:
+        interactive, batch = queues['interactive'], queues['batch']
+        if batch and (not interactive or streak >= self.batch_every - 1):
+            return 'batch'
+        return 'interactive' if interactive else None
+
+    @staticmethod
+    def _take(queue: "OrderedDict[str, deque]") -> "asyncio.Future":
+        """Pop the next waiter of the client whose turn it is, then move that client to the back."""
+        client, waiters = next(iter(queue.items()))
+        future = waiters.popleft()
+        if waiters:
+            queue.move_to_end(client)
+        else:
+            del queue[client]
+        return future
+
+    def _remove(self, priority: str, client: str, future: "asyncio.Future"):
+        waiters = self._queues[priority].get(client)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._queues[priority][client]
+
+    def _dispatch(self):
+        while self.in_use < self.capacity:
+            priority = self._pick(self._queues, self._interactive_streak)
+            if priority is None:
+                return
+            queue = self._queues[priority]
+            client = next(iter(queue))
+            future = self._take(queue)
+            if future.done():
+                continue
+            self._interactive_streak = 0 if priority == 'batch' else self._interactive_streak + 1
+            self._grant(client)
+            future.set_result(None)
+
+
+class ToolProgress:
+    """MCP progress notifications for one long-running tool call.
+
+    Wraps the tool's Context (None when a tool is called directly, in which case every
+    update is a no-op). Progress is reported in percent of 100 with a message carrying the
+    status, elapsed time and the next Retry-After; notifications that fail to send are ignored.
+    """
+
+    def __init__(self, ctx: Optional[Context], label: str):
+        self.ctx = ctx
+        self.label = label
+        self.started = time.monotonic()
+        self.percent = 0.0
+
+    async def update(self, percent: Optional[float] = None, status: str = "running",
+                     retry_after: Optional[float] = None):
+        if self.ctx is None:
+            return
+        # MCP requires progress to increase with every notification, and each poll should
+        # still go out (it keeps the connection warm) even when BRAIN's percentage is unchanged
+        target = min(99.9, percent) if percent is not None else self.percent
+        self.percent = min(99.99, max(target, self.percent + 0.01))
+        message = f"{self.label}: {status}, {time.monotonic() - self.started:.0f}s elapsed"
+        if retry_after:
+            message += f", next check in {retry_after:.0f}s"
+        try:
+            await self.ctx.report_progress(round(self.percent, 2), 100, message)
+        except Exception:
+            pass
+
+    async def done(self, status: str = "done"):
+        if self.ctx is None:
+            return
+        self.percent = 100.0
+        try:
+            await self.ctx.report_progress(100, 100, f"{self.label}: {status}, {time.monotonic() - self.started:.0f}s elapsed")
+        except Exception:
+            pass
+
+    async def on_slot_wait(self, position: int, waiting: int):
+        """SimulationSlotScheduler on_wait callback."""
+        await self.update(None, f"queued for a simulation slot, position {position} of {waiting}")
+
+    async def on_simulation_poll(self, progress: Dict[str, Any], retry_after: Optional[float]):
+        """SimulationPoller on_poll callback for a single simulation."""
+        await self.update(simulation_percent(progress), str(progress.get('status') or 'simulating').lower(), retry_after)
+
+
+def simulation_percent(progress: Dict[str, Any]) -> Optional[float]:
+    """Percent complete from a simulation progress response ('progress' is 0..1), if present."""
+    try:
+        return float(progress['progress']) * 100
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class SimulationPoller:
+    """One background task that polls every in-flight simulation Location.
+
+    watch() returns a future resolved with the final progress JSON once a poll comes back
+    without Retry-After; a location is dropped once every watcher has cancelled. Each
+    location is re-polled after its own Retry-After plus up to `jitter` of it again, so
+    simulations started together drift apart instead of polling in lockstep; at most
+    `max_concurrent_polls` progress GETs are in flight at once.
+    """
+
+    def __init__(self, client: "BrainApiClient", max_concurrent_polls: int = 4, jitter: float = 0.2,
+                 default_interval: float = 5.0, max_errors: int = 5):
+        self.client = client
+        self.jitter = jitter
+        self.default_interval = default_interval
+        self.max_errors = max_errors
+        self._poll_slots = asyncio.Semaphore(max_concurrent_polls)
+        self._heap: List[Tuple[float, int, str]] = []
+        self._watches: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Strong references: the event loop only keeps weak ones to running tasks
+        self._poll_tasks: set = set()
+        self.polls = 0
+
+    def watch(self, location_url: str, timeout: float = 1800,
+              ready: Optional[Callable[[Dict[str, Any]], bool]] = None,
+              on_poll: Optional[Callable[[Dict[str, Any], Optional[float]], Awaitable[None]]] = None) -> "asyncio.Future":
+        """Future for the final progress JSON of location_url; several watchers share one poll.
+
+        With `ready`, the future resolves early with the first in-progress JSON it accepts
+        (e.g. a multisimulation once its children are listed). `on_poll` is awaited with the
+        in-progress JSON and the next Retry-After after every poll that is not final.
+        """
+        future = asyncio.get_running_loop().create_future()
+        entry = self._watches.get(location_url)
+        if entry is not None:
+            entry['waiters'].append(future)
+            if ready is not None:
+                entry['ready'][future] = ready
+            if on_poll is not None:
+                entry['listeners'][future] = on_poll
+            entry['deadline'] = max(entry['deadline'], time.time() + timeout)
+            return future
+        entry = {
+            'waiters': [future],
+            'ready': {future: ready} if ready is not None else {},
+            'listeners': {future: on_poll} if on_poll is not None else {},
+            'deadline': time.time() + timeout,
+            'errors': 0,
+            'polls': 0,
+        }
+        self._watches[location_url] = entry
+        # First poll after a short random delay so a burst of submissions does not poll together
+        self._schedule(location_url, random.uniform(0.5, 1.0 + self.jitter * self.default_interval))
+        return future
+
+    def in_flight(self) -> int:
+        return len(self._watches)
+
+    def stop(self):
+        """Cancel the poll loop and every poll in flight; pending watchers are cancelled too."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in list(self._poll_tasks):
+            task.cancel()
+        for entry in self._watches.values():
+            for waiter in entry['waiters']:
+                if not waiter.done():
+                    waiter.cancel()
+        self._watches.clear()
+        self._heap.clear()
+
+    @staticmethod
+    def _abandoned(entry: Dict[str, Any]) -> bool:
+        return all(waiter.done() for waiter in entry['waiters'])
+
+    def _schedule(self, location_url: str, delay: float):
+        self._seq += 1
+        heapq.heappush(self._heap, (time.monotonic() + delay, self._seq, location_url))
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(detached(self._run()))
+
+    async def _run(self):
+        while self._heap:
+            due_at, _, location_url = self._heap[0]
+            delay = due_at - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._heap)
+            entry = self._watches.get(location_url)
+            if entry is None:
+                continue
+            if self._abandoned(entry):
+                # Every watcher gave up (cancelled)
+                self._watches.pop(location_url, None)
+                continue
+            await self._poll_slots.acquire()
+            task = asyncio.create_task(self._poll(location_url, entry))
+            self._poll_tasks.add(task)
+            task.add_done_callback(self._poll_tasks.discard)
+            task.add_done_callback(lambda _t: self._poll_slots.release())
+
+    async def _poll(self, location_url: str, entry: Dict[str, Any]):
+        if time.time() > entry['deadline']:
+            self._finish(location_url, error=TimeoutError(
+                f"Simulation {location_url.split('/')[-1]} timed out after {entry['polls']} polls"))
+            return
+        try:
+            response = await self.client._request('GET', location_url)
+        except CircuitOpenError as e:
+            # BRAIN is down: check again once the breaker lets a probe through, without using up max_errors
+            self._schedule(location_url, e.retry_in + random.uniform(0, self.jitter * self.default_interval))
+            return
+        except (ConnectionError, TimeoutError) as e:
+            entry['errors'] += 1
+            if entry['errors'] >= self.max_errors:
+                self.client.log(f"❌ Polling failed after {entry['errors']} attempts for {location_url}: {str(e)}", "ERROR")
+                self._finish(location_url, error=e)
+                return
+            retry_wait = 3 * (1.5 ** (entry['errors'] - 1))
+            self.client._count_retry('simulation_poll', 'error')
+            self.client.log(f"⚠️ Polling connection error for {location_url} (attempt {entry['errors']}/{self.max_errors}), retrying in {retry_wait:.1f}s: {str(e)}", "WARNING")
+            self._schedule(location_url, retry_wait)
+            return
+        except Exception as e:
+            self._finish(location_url, error=e)
+            return
+        if self._watches.get(location_url) is not entry:
+            return
+        entry['errors'] = 0
+        entry['polls'] += 1
+        self.polls += 1
+
+        retry_after = self.client._parse_retry_after(response.headers.get('Retry-After'))
+        if response.status_code == 429:
+            self.client._count_retry('simulation_poll', 'rate_limited')
+            retry_after = retry_after or self.default_interval
+        elif response.status_code >= 400:
+            self._finish(location_url, error=Exception(
+                f"Simulation progress request failed with HTTP {response.status_code}: {response.text[:200]}"))
+            return
+        if retry_after:
+            if entry['listeners'] and response.status_code < 400:
+                await self._notify_listeners(entry, response, retry_after)
+            if entry['ready'] and response.status_code < 400:
+                self._resolve_ready(entry, response)
+                if self._abandoned(entry):
+                    self._watches.pop(location_url, None)
+                    return
+            self._schedule(location_url, retry_after * (1 + random.uniform(0, self.jitter)))
+            return
+        try:
+            self._finish(location_url, result=response.json())
+        except Exception as e:
+            self._finish(location_url, error=e)
+
+    @staticmethod
+    async def _notify_listeners(entry: Dict[str, Any], response: httpx.Response, retry_after: float):
+        try:
+            progress = response.json()
+        except Exception:
+            progress = {}
+        for waiter, listener in list(entry['listeners'].items()):
+            if waiter.done():
+                entry['listeners'].pop(waiter, None)
+                continue
+            try:
+                await listener(progress, retry_after)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _resolve_ready(entry: Dict[str, Any], response: httpx.Response):
+        try:
+            progress = response.json()
+        except Exception:
+            return
+        for waiter, ready in list(entry['ready'].items()):
+            if not waiter.done() and ready(progress):
+                waiter.set_result(progress)
+                del entry['ready'][waiter]
+
+    def _finish(self, location_url: str, result: Any = None, error: Optional[BaseException] = None):
+        entry = self._watches.pop(location_url, None)
+        if entry is None:
+            return
+        for waiter in entry['waiters']:
+            if waiter.done():
+                continue
+            if error is not None:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(result)
+
+
+class SimulationJobStore:
+    """Persistent simulation job records: Redis when available, else the local disk cache.
+
+    Each job is one JSON document under 'sim_job:<id>'; 'sim_jobs:<namespace>' indexes the
+    job ids of one account (a Redis sorted set by creation time, or a JSON list on disk).
+    Records expire after `ttl` seconds.
+    """
+
+    def __init__(self, redis_client, disk_cache: Optional[DiskCache], ttl: int = 7 * 86400):
+        self.redis_client = redis_client
+        self.disk_cache = disk_cache
+        self.ttl = ttl
+        # Always kept in memory too, so jobs work even with neither Redis nor disk
+        self._memory: Dict[str, Dict[str, Any]] = {}
+
+    def save(self, namespace: str, job: Dict[str, Any]):
+        self._memory[job['id']] = job
+        raw = json.dumps(job)
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline()
+                pipe.setex(f"sim_job:{job['id']}", self.ttl, raw)
+                pipe.zadd(f"sim_jobs:{namespace}", {job['id']: job['created_at']})
+                pipe.expire(f"sim_jobs:{namespace}", self.ttl)
+                pipe.execute()
+                return
+            except Exception:
+                pass
+        if self.disk_cache:
+            try:
+                self.disk_cache.set(f"sim_job:{job['id']}", raw, self.ttl)
+                ids = self._disk_index(namespace)
+                if job['id'] not in ids:
+                    ids.append(job['id'])
+                    self.disk_cache.set(f"sim_jobs:{namespace}", json.dumps(ids), self.ttl)
+            except OSError:
+                pass
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = None
+        if self.redis_client:
+            try:
+                raw = self.redis_client.get(f"sim_job:{job_id}")
+            except Exception:
+                raw = None
+        if raw is None and self.disk_cache:
+            entry = self.disk_cache.get(f"sim_job:{job_id}")
+            raw = entry[0] if entry else None
+        if raw is None:
+            return self._memory.get(job_id)
+        job = json.loads(raw)
+        self._memory[job_id] = job
+        return job
+
+    def job_ids(self, namespace: str) -> List[str]:
+        """Job ids of one account, newest first."""
+        ids: List[str] = []
+        if self.redis_client:
+            try:
+                ids = list(self.redis_client.zrevrange(f"sim_jobs:{namespace}", 0, -1))
+            except Exception:
+                ids = []
+        if not ids and self.disk_cache:
+            ids = list(reversed(self._disk_index(namespace)))
+        known = set(ids)
+        local = sorted((job for job in self._memory.values() if job['id'] not in known),
+                       key=lambda job: job['created_at'], reverse=True)
+        return ids + [job['id'] for job in local]
+
+    def _disk_index(self, namespace: str) -> List[str]:
+        entry = self.disk_cache.get(f"sim_jobs:{namespace}") if self.disk_cache else None
+        return json.loads(entry[0]) if entry else []
+
+
+TOOL_CALLS = metrics_registry.counter(
+    "brain_tool_calls_total", "MCP tool calls by tool and outcome (ok, error, exception).", ("tool", "outcome")
+)
+TOOL_DURATION = metrics_registry.histogram(
+    "brain_tool_duration_seconds", "MCP tool call latency.", ("tool",)
+)
+UPSTREAM_REQUESTS = metrics_registry.counter(
+    "brain_upstream_requests_total", "BRAIN API requests by method, endpoint and status.", ("method", "endpoint", "status")
+)
+UPSTREAM_DURATION = metrics_registry.histogram(
+    "brain_upstream_request_duration_seconds", "BRAIN API request latency by method, endpoint and status.",
+    ("method", "endpoint", "status")
+)
+RETRIES = metrics_registry.counter(
+    "brain_retries_total", "Retried BRAIN API operations by operation and reason.", ("operation", "reason")
+)
+CACHE_LOOKUPS = metrics_registry.counter(
+    "brain_cache_lookups_total", "Cache lookups by key prefix, tier and result (hit, miss).", ("prefix", "tier", "result")
+)
+
+# Fixed path segments of the BRAIN endpoints this client calls; anything else is an id or free text
+_ENDPOINT_STATIC_SEGMENTS = frozenset({
+    'activities', 'agreement', 'alphas', 'authentication', 'base-payment', 'boards', 'competitions',
+    'consultant', 'correlations', 'data-fields', 'data-sets', 'events', 'leader', 'messages',
+    'operators', 'other-payment', 'performance-comparison', 'pnl', 'prod', 'pyramid-alphas',
+    'pyramid-multipliers', 'recordsets', 'self', 'simulations', 'submit', 'super-selection',
+    'tutorial-pages', 'tutorials', 'users', 'yearly-stats',
+})
+
+
+def metrics_endpoint(url: str) -> str:
+    """Low-cardinality endpoint label: every path segment not in _ENDPOINT_STATIC_SEGMENTS becomes {id}."""
+    path = httpx.URL(url).path if url.startswith(('http://', 'https://')) else url.split('?', 1)[0]
+    segments = [seg if seg in _ENDPOINT_STATIC_SEGMENTS else '{id}' for seg in path.strip('/').split('/') if seg]
+    return '/' + '/'.join(segments)
+
+
 class BrainApiClient:
     """WorldQuant BRAIN API client with comprehensive functionality."""
+
+    # Largest page BRAIN serves for alpha and message listings
+    _LISTING_PAGE_SIZE = 100
+    _DATASETS_NOTE = "if your returned result is 0, you may want to check your parameter by using get_platform_setting_options tool to got correct parameter"
+    _DATAFIELDS_NOTE = "if your returned result is 0, you may want to check your parameter by using get_platform_setting_options tool to got correct parameter. Search supports fuzzy matching with multiple keywords (space-separated, AND logic)."
     
     def __init__(self):
         # Best-effort: load .env early so env overrides are available here
@@ -96,26 +1351,96 @@ class BrainApiClient:
                 pass
 
         self.base_url = "https://api.worldquantbrain.com"
-        self.session = requests.Session()
         self.auth_credentials = None
         self.is_authenticating = False
-        self._request_semaphore = asyncio.Semaphore(int(os.environ.get("BRAIN_MAX_CONCURRENCY", "8")))
-        self._session_lock = asyncio.Lock()
+        # Upstream request concurrency: an AIMD window starting at BRAIN_MAX_CONCURRENCY that moves
+        # between BRAIN_MIN_CONCURRENCY and BRAIN_MAX_CONCURRENCY_CEILING (BRAIN_ADAPTIVE_CONCURRENCY=false pins it)
+        try:
+            initial_concurrency = int(os.environ.get("BRAIN_MAX_CONCURRENCY", "8"))
+            min_concurrency = int(os.environ.get("BRAIN_MIN_CONCURRENCY", "1"))
+            self._max_concurrency = int(os.environ.get("BRAIN_MAX_CONCURRENCY_CEILING", str(max(initial_concurrency, 32))))
+        except Exception:
+            initial_concurrency, min_concurrency, self._max_concurrency = 8, 1, 32
+        adaptive = os.environ.get("BRAIN_ADAPTIVE_CONCURRENCY", "true").strip().lower() in ("1", "true", "yes", "on")
+        if not adaptive:
+            self._max_concurrency = initial_concurrency
+        self._request_limiter = AdaptiveConcurrencyLimiter(
+            initial_concurrency, min_limit=min_concurrency, max_limit=self._max_concurrency, adaptive=adaptive)
+        try:
+            circuit_threshold = int(os.environ.get("BRAIN_CIRCUIT_FAILURE_THRESHOLD", "5"))
+            circuit_reset = float(os.environ.get("BRAIN_CIRCUIT_RESET_SECONDS", "30"))
+        except Exception:
+            circuit_threshold, circuit_reset = 5, 30.0
+        self._circuit_breaker = CircuitBreaker(circuit_threshold, circuit_reset)
         self._auth_lock = asyncio.Lock()
         # Allow timeout override via env (e.g., API_SETTINGS_TIMEOUT)
         try:
             self._default_timeout_seconds = int(os.environ.get("API_SETTINGS_TIMEOUT", "30"))
         except Exception:
             self._default_timeout_seconds = 30
-        self._create_simulation_semaphore = asyncio.Semaphore(int(os.environ.get("BRAIN_CREATE_SIMULATION_MAX_CONCURRENCY", "6")))
+        # Simulation POSTs in flight at once; released as soon as BRAIN returns the Location
+        try:
+            self._create_simulation_max_concurrency = max(1, int(os.environ.get("BRAIN_CREATE_SIMULATION_MAX_CONCURRENCY", "6")))
+        except Exception:
+            self._create_simulation_max_concurrency = 6
+        self._create_simulation_semaphore = asyncio.Semaphore(self._create_simulation_max_concurrency)
+        # Running simulations of the account, shared fairly between MCP clients.
+        # BRAIN_SIMULATION_SLOTS_BY_ACCOUNT ("email=10,other@x.com=3") overrides it per login.
+        try:
+            simulation_slots = int(os.environ.get("BRAIN_SIMULATION_SLOTS", "6"))
+        except Exception:
+            simulation_slots = 6
+        self._default_simulation_slots = simulation_slots
+        self._simulation_slots_by_account: Dict[str, int] = {}
+        for item in os.environ.get("BRAIN_SIMULATION_SLOTS_BY_ACCOUNT", "").split(','):
+            account, _, slots = item.partition('=')
+            try:
+                self._simulation_slots_by_account[account.strip().lower()] = int(slots)
+            except ValueError:
+                continue
+        self._simulation_slots = SimulationSlotScheduler(simulation_slots)
+        # Simulations that are only waiting are polled centrally and hold no submission slot,
+        # only their running-simulation slot
+        try:
+            poll_concurrency = max(1, int(os.environ.get("BRAIN_SIMULATION_POLL_CONCURRENCY", "4")))
+        except Exception:
+            poll_concurrency = 4
+        self._simulation_poller = SimulationPoller(self, max_concurrent_polls=poll_concurrency)
+        self._job_tasks: Dict[str, asyncio.Task] = {}
+        self._jobs_resumed = False
+        # Identical simulation payloads are answered from the result cache for this long (0 disables)
+        try:
+            self._simulation_cache_seconds = int(float(os.environ.get("BRAIN_SIMULATION_CACHE_HOURS", "168")) * 3600)
+        except Exception:
+            self._simulation_cache_seconds = 168 * 3600
+        # Multisimulations a batch keeps in flight; BRAIN rejects submissions beyond the account's limit
+        try:
+            self._batch_max_in_flight = max(1, int(os.environ.get("BRAIN_BATCH_MAX_IN_FLIGHT", "3")))
+        except Exception:
+            self._batch_max_in_flight = 3
+        # Local JWT freshness tracking so ensure_authenticated does not hit /authentication on every call
+        self._token_expires_at: Optional[float] = None
+        try:
+            self._token_refresh_margin = int(os.environ.get("BRAIN_TOKEN_REFRESH_MARGIN", "600"))
+        except Exception:
+            self._token_refresh_margin = 600
+        self._token_expiry_skew = 30
+        self._reauth_task: Optional[asyncio.Task] = None
+        # Single-flight table for identical in-flight GET requests
+        self._inflight_gets: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._coalesced_request_count = 0
+        # Adaptive pagination throttle: no delay until BRAIN answers 429 / Retry-After
+        try:
+            self._pagination_concurrency = max(1, int(os.environ.get("BRAIN_PAGINATION_CONCURRENCY", "4")))
+        except Exception:
+            self._pagination_concurrency = 4
+        self._pagination_delay = 0.0
+        self._pagination_not_before = 0.0
         self._forum_rate_limit_lock = asyncio.Lock()
         self._forum_rate_limit_until = 0.0
         
-        # Configure session
-        self.session.timeout = self._default_timeout_seconds
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Configure session (pooled keep-alive connections shared by all requests)
+        self.session = self._build_http_client()
         
         # Initialize Redis connection
         try:
@@ -136,13 +1461,111 @@ class BrainApiClient:
             self.redis_client.ping()
             self.log("Redis connection established", "INFO")
         except Exception as e:
-            self.log(f"Redis connection failed: {str(e)}, caching disabled", "WARNING")
+            self.log(f"Redis connection failed: {str(e)}, using local cache tiers only", "WARNING")
             self.redis_client = None
+
+        # Cache tiers in front of / behind Redis: parsed-object LRU, then Redis, then local disk
+        try:
+            memory_cache_mb = float(os.environ.get("BRAIN_MEMORY_CACHE_MB", "256"))
+        except Exception:
+            memory_cache_mb = 256
+        self._memory_cache = MemoryLRUCache(int(memory_cache_mb * 1024 * 1024))
+        self._disk_cache: Optional[DiskCache] = None
+        if os.environ.get("BRAIN_DISK_CACHE", "true").strip().lower() in ("1", "true", "yes", "on"):
+            disk_cache_dir = os.environ.get("BRAIN_DISK_CACHE_DIR") or str(Path(__file__).parent / ".cache" / "brain_mcp")
+            try:
+                self._disk_cache = DiskCache(Path(disk_cache_dir))
+            except Exception as e:
+                self.log(f"Disk cache unavailable at {disk_cache_dir}: {str(e)}", "WARNING")
+        self._cache_stats = {tier: {'hits': 0, 'misses': 0} for tier in ('memory', 'redis', 'disk')}
+        # Stale-while-revalidate: entries stay readable this long after their TTL while one refresh runs
+        try:
+            self._cache_stale_seconds = int(os.environ.get("BRAIN_CACHE_STALE_SECONDS", "86400"))
+        except Exception:
+            self._cache_stale_seconds = 86400
+        self._cache_fill_tasks: Dict[str, asyncio.Task] = {}
+        # Catalog fills that publish items as pages arrive, for narrow searches on a cold cache
+        self._catalog_streams: Dict[str, Dict[str, Any]] = {}
+        # Cache tags: per account/resource generation counters mixed into dependent cache keys.
+        # Without Redis the counters are process-local, so they start from a per-process epoch
+        # to never match disk entries written before a restart.
+        self._cache_generations: Dict[str, int] = {}
+        self._local_generation_epoch = int(time.time() * 1000)
+        # Search indexes over cached catalogs, keyed by cache key (rebuilt when the catalog is refilled)
+        self._search_indexes: "OrderedDict[str, Tuple[Optional[float], CatalogSearchIndex]]" = OrderedDict()
+        # Asynchronous simulation jobs, persisted so their polling resumes after a restart
+        self._job_store = SimulationJobStore(self.redis_client, self._disk_cache)
+        # Offline catalog snapshot: every region/delay/universe catalog, rebuilt in the background
+        self._catalog_snapshot: Optional[CatalogSnapshotStore] = None
+        if os.environ.get("BRAIN_CATALOG_SNAPSHOT", "true").strip().lower() in ("1", "true", "yes", "on"):
+            snapshot_path = os.environ.get("BRAIN_CATALOG_SNAPSHOT_PATH") or str(Path(__file__).parent / ".cache" / "catalog_snapshots.sqlite")
+            try:
+                self._catalog_snapshot = CatalogSnapshotStore(Path(snapshot_path))
+            except Exception as e:
+                self.log(f"Catalog snapshot store unavailable at {snapshot_path}: {str(e)}", "WARNING")
+        try:
+            self._catalog_snapshot_interval = float(os.environ.get("BRAIN_CATALOG_SNAPSHOT_INTERVAL_HOURS", "24")) * 3600
+        except Exception:
+            self._catalog_snapshot_interval = 86400
+        try:
+            self._catalog_snapshot_concurrency = max(1, int(os.environ.get("BRAIN_CATALOG_SNAPSHOT_CONCURRENCY", "2")))
+        except Exception:
+            self._catalog_snapshot_concurrency = 2
+        self._catalog_snapshot_task: Optional[asyncio.Task] = None
+        self._catalog_snapshot_build_task: Optional[asyncio.Task] = None
+        self._catalog_snapshot_status: Dict[str, Any] = {'running': False}
+        # Warm-up scheduler: keys read through _get_or_refresh_cached, scored by decayed access count
+        self._warmup_keys: Dict[str, Dict[str, Any]] = {}
+        self._warmup_enabled = os.environ.get("BRAIN_WARMUP", "true").strip().lower() in ("1", "true", "yes", "on")
+        try:
+            self._warmup_max_keys = max(1, int(os.environ.get("BRAIN_WARMUP_MAX_KEYS", "50")))
+        except Exception:
+            self._warmup_max_keys = 50
+        try:
+            self._warmup_concurrency = max(1, int(os.environ.get("BRAIN_WARMUP_CONCURRENCY", "1")))
+        except Exception:
+            self._warmup_concurrency = 1
+        try:
+            self._warmup_lead_seconds = int(os.environ.get("BRAIN_WARMUP_LEAD_SECONDS", "3600"))
+        except Exception:
+            self._warmup_lead_seconds = 3600
+        self._warmup_interval = 60
+        self._warmup_half_life = 7 * 86400
+        # Keys read fewer than ~2 times recently are not worth refetching ahead of time
+        self._warmup_min_score = 1.5
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._warmup_stats = {'runs': 0, 'refreshed': 0, 'failed': 0}
     
     def log(self, message: str, level: str = "INFO"):
         """Log messages to stderr to avoid MCP protocol interference."""
         print(f"[{level}] {message}", file=sys.stderr)
     
+    def _build_http_client(self) -> httpx.AsyncClient:
+        """Create the async HTTP client with a keep-alive pool sized to the concurrency ceiling.
+
+        HTTP/2 is opt-in via BRAIN_HTTP2=true and needs the optional 'h2' package.
+        """
+        http2 = os.environ.get("BRAIN_HTTP2", "false").strip().lower() in ("1", "true", "yes", "on")
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                self.log("BRAIN_HTTP2 is enabled but 'h2' is not installed, falling back to HTTP/1.1", "WARNING")
+                http2 = False
+
+        limits = httpx.Limits(
+            max_connections=self._max_concurrency,
+            max_keepalive_connections=self._max_concurrency,
+            keepalive_expiry=60,
+        )
+        return httpx.AsyncClient(
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'},
+            timeout=self._default_timeout_seconds,
+            limits=limits,
+            http2=http2,
+            follow_redirects=True,
+        )
+
     def _to_absolute_url(self, url: str) -> str:
         if not url:
             return url
@@ -158,29 +1581,356 @@ class BrainApiClient:
         hash_str = hashlib.md5(param_str.encode()).hexdigest()
         return f"{prefix}:{hash_str}"
     
+    def _cache_tag(self, resource: str) -> str:
+        """Tag for one resource type of the logged-in account, e.g. 'alphas'."""
+        email = (self.auth_credentials or {}).get('email') or 'anonymous'
+        account = hashlib.md5(email.lower().encode()).hexdigest()[:12]
+        return f"{account}:{resource}"
+
+    def _cache_generation(self, resource: str) -> str:
+        tag = self._cache_tag(resource)
+        if self.redis_client:
+            try:
+                return str(int(self.redis_client.get(f"gen:{tag}") or 0))
+            except Exception as e:
+                self.log(f"Cache generation read error: {str(e)}, using local generation", "WARNING")
+        return f"{self._local_generation_epoch}.{self._cache_generations.get(tag, 0)}"
+
+    def _tagged_cache_key(self, prefix: str, params: dict, resource: str) -> str:
+        """Cache key that changes whenever invalidate_cache_tag(resource) is called."""
+        return self._generate_cache_key(prefix, {
+            **params,
+            '_tag': self._cache_tag(resource),
+            '_generation': self._cache_generation(resource),
+        })
+
+    def invalidate_cache_tag(self, resource: str):
+        """Bump the generation of resource so every cache key derived from it misses.
+
+        Old entries are not deleted; they become unreachable and expire with their TTL.
+        """
+        tag = self._cache_tag(resource)
+        self._cache_generations[tag] = self._cache_generations.get(tag, 0) + 1
+        if self.redis_client:
+            try:
+                self.redis_client.incr(f"gen:{tag}")
+            except Exception as e:
+                self.log(f"Cache generation bump error: {str(e)}", "WARNING")
+        self.log(f"Invalidated cached {resource} listings", "INFO")
+
+    def _count_cache(self, tier: str, hit: bool, cache_key: str):
+        self._cache_stats[tier]['hits' if hit else 'misses'] += 1
+        CACHE_LOOKUPS.inc(prefix=cache_key.split(':', 1)[0], tier=tier, result='hit' if hit else 'miss')
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per cache tier plus in-process cache usage."""
+        return {
+            **{tier: dict(counts) for tier, counts in self._cache_stats.items()},
+            'memory_usage': self._memory_cache.usage(),
+            'redis_enabled': self.redis_client is not None,
+            'disk_enabled': self._disk_cache is not None,
+            'warmup': self.get_warmup_stats(),
+        }
+
     def _get_cached_data(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Get data from Redis cache."""
-        if not self.redis_client:
-            return None
+        """Get data from the cache tiers: in-process LRU, then Redis, then disk (when Redis is unavailable).
+
+        The returned object may be shared with other callers; copy before mutating.
+        """
+        return self._get_cached_entry(cache_key)[0]
+
+    @traced("cache.get", "cache")
+    def _get_cached_entry(self, cache_key: str) -> Tuple[Optional[Any], Optional[float]]:
+        """Like _get_cached_data but also returns the entry's remaining TTL in seconds."""
+        data, ttl = self._memory_cache.get_with_ttl(cache_key)
+        self._count_cache('memory', data is not None, cache_key)
+        if data is not None:
+            return data, ttl
+
+        raw = None
+        ttl = None
+        use_disk = self.redis_client is None
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline()
+                pipe.get(cache_key)
+                pipe.ttl(cache_key)
+                raw, ttl = pipe.execute()
+                self._count_cache('redis', bool(raw), cache_key)
+                if raw:
+                    self.log(f"Cache hit for key: {cache_key}", "INFO")
+            except Exception as e:
+                self.log(f"Cache read error: {str(e)}, falling back to disk cache", "WARNING")
+                raw = None
+                use_disk = True
+
+        if not raw and use_disk and self._disk_cache:
+            entry = self._disk_cache.get(cache_key)
+            self._count_cache('disk', entry is not None, cache_key)
+            if entry:
+                raw, ttl = entry
+                self.log(f"Disk cache hit for key: {cache_key}", "INFO")
+
+        if not raw:
+            return None, None
         try:
-            cached = self.redis_client.get(cache_key)
-            if cached:
-                self.log(f"Cache hit for key: {cache_key}", "INFO")
-                return json.loads(cached)
+            data = json.loads(raw)
         except Exception as e:
-            self.log(f"Cache read error: {str(e)}", "WARNING")
-        return None
+            self.log(f"Cache decode error for {cache_key}: {str(e)}", "WARNING")
+            return None, None
+        if isinstance(ttl, (int, float)) and ttl > 0:
+            self._memory_cache.set(cache_key, data, ttl)
+            return data, float(ttl)
+        return data, None
     
-    def _set_cached_data(self, cache_key: str, data: Dict[str, Any], ttl: int = 86400):
-        """Set data in Redis cache with TTL (default 1 day = 86400 seconds)."""
-        if not self.redis_client:
-            return
+    @traced("cache.set", "cache")
+    def _set_cached_data(self, cache_key: str, data: Dict[str, Any], ttl: int = 86400, stale_ttl: int = 0):
+        """Set data in all cache tiers with TTL (default 1 day = 86400 seconds).
+
+        stale_ttl keeps the entry readable for that much longer, see _get_or_refresh_cached.
+        """
         try:
-            self.redis_client.setex(cache_key, ttl, json.dumps(data))
-            self.log(f"Cached data with key: {cache_key}, TTL: {ttl}s", "INFO")
+            raw = json.dumps(data)
         except Exception as e:
             self.log(f"Cache write error: {str(e)}", "WARNING")
+            return
+        ttl = int(ttl + stale_ttl)
+        # The memory tier keeps its own parsed copy: callers go on to mutate and return `data`
+        self._memory_cache.set(cache_key, json.loads(raw), ttl)
+
+        use_disk = self.redis_client is None
+        if self.redis_client:
+            try:
+                self.redis_client.setex(cache_key, ttl, raw)
+                self.log(f"Cached data with key: {cache_key}, TTL: {ttl}s", "INFO")
+            except Exception as e:
+                self.log(f"Cache write error: {str(e)}, falling back to disk cache", "WARNING")
+                use_disk = True
+
+        if use_disk and self._disk_cache:
+            try:
+                self._disk_cache.set(cache_key, raw, ttl)
+                self.log(f"Cached data on disk with key: {cache_key}, TTL: {ttl}s", "INFO")
+            except Exception as e:
+                self.log(f"Disk cache write error: {str(e)}", "WARNING")
     
+    async def _get_or_refresh_cached(self, cache_key: str, fetch, ttl: int = 86400) -> Tuple[Any, bool]:
+        """Return (data, from_cache) for cache_key with per-key stampede protection.
+
+        Entries are kept for ttl + BRAIN_CACHE_STALE_SECONDS. Past ttl the stale value is still
+        served immediately while a single background task refreshes it; if that refresh fails
+        the stale value keeps being served. On a miss, concurrent callers for the same key
+        share one fetch, and other processes wait on the same key's Redis lock.
+        """
+        self._record_warmup_access(cache_key, fetch, ttl)
+        data, remaining = self._get_cached_entry(cache_key)
+        if data is not None:
+            if remaining is not None and remaining <= self._cache_stale_seconds:
+                self._schedule_cache_refresh(cache_key, fetch, ttl)
+            return data, True
+
+        task = self._cache_fill_tasks.get(cache_key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._fill_cache_key(cache_key, fetch, ttl, wait_for_peer=True))
+            self._track_cache_fill(cache_key, task)
+        return await asyncio.shield(task), False
+
+    def _record_warmup_access(self, cache_key: str, fetch, ttl: int):
+        """Count an access to cache_key (decayed with a 7 day half-life) and remember how to refetch it."""
+        now = time.time()
+        entry = self._warmup_keys.get(cache_key)
+        if entry is None:
+            if len(self._warmup_keys) >= 4 * self._warmup_max_keys:
+                coldest = min(self._warmup_keys, key=lambda key: self._warmup_score(self._warmup_keys[key], now))
+                del self._warmup_keys[coldest]
+            entry = {'score': 0.0, 'last_access': now}
+            self._warmup_keys[cache_key] = entry
+        entry['score'] = self._warmup_score(entry, now) + 1.0
+        entry['last_access'] = now
+        entry['fetch'] = fetch
+        entry['ttl'] = ttl
+
+    def _warmup_score(self, entry: Dict[str, Any], now: float) -> float:
+        return entry['score'] * 0.5 ** ((now - entry['last_access']) / self._warmup_half_life)
+
+    def _peek_cache_ttl(self, cache_key: str) -> Optional[float]:
+        """Remaining TTL of a cache entry without reading its value or counting a hit/miss."""
+        _, remaining = self._memory_cache.get_with_ttl(cache_key)
+        if remaining is not None:
+            return remaining
+        if self.redis_client:
+            try:
+                remaining = self.redis_client.ttl(cache_key)
+                return float(remaining) if remaining and remaining > 0 else None
+            except Exception:
+                pass
+        if self._disk_cache:
+            entry = self._disk_cache.get(cache_key)
+            return entry[1] if entry else None
+        return None
+
+    def start_warmup_scheduler(self) -> None:
+        """Start the background loop that refreshes the most-used cache keys before they expire."""
+        if not self._warmup_enabled:
+            return
+        if self._warmup_task is not None and not self._warmup_task.done():
+            return
+        self._warmup_task = asyncio.create_task(detached(self._warmup_loop()))
+
+    async def _warmup_loop(self):
+        while True:
+            await asyncio.sleep(self._warmup_interval)
+            try:
+                await self.run_warmup()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.log(f"Cache warm-up failed: {str(e)}", "WARNING")
+
+    async def run_warmup(self) -> Dict[str, Any]:
+        """Refresh the BRAIN_WARMUP_MAX_KEYS most-used keys that are missing or within
+        BRAIN_WARMUP_LEAD_SECONDS of going stale, BRAIN_WARMUP_CONCURRENCY at a time.
+
+        Refreshes share the per-key fill tasks and Redis locks with interactive callers, so a
+        key is never fetched twice at once.
+        """
+        now = time.time()
+        hottest = sorted(self._warmup_keys.items(), key=lambda kv: self._warmup_score(kv[1], now), reverse=True)
+        due = []
+        for cache_key, entry in hottest[:self._warmup_max_keys]:
+            if self._warmup_score(entry, now) < self._warmup_min_score:
+                break
+            task = self._cache_fill_tasks.get(cache_key)
+            if task is not None and not task.done():
+                continue
+            remaining = self._peek_cache_ttl(cache_key)
+            # Entries live ttl + stale seconds; refresh while still fresh so nobody waits or sees stale data
+            if remaining is None or remaining - self._cache_stale_seconds <= self._warmup_lead_seconds:
+                due.append((cache_key, entry))
+        self._warmup_stats['runs'] += 1
+        if not due:
+            return {'refreshed': 0}
+
+        await self.ensure_authenticated()
+        budget = asyncio.Semaphore(self._warmup_concurrency)
+
+        async def refresh(cache_key: str, entry: Dict[str, Any]) -> bool:
+            async with budget:
+                task = self._cache_fill_tasks.get(cache_key)
+                if task is None or task.done():
+                    task = asyncio.create_task(
+                        self._fill_cache_key(cache_key, entry['fetch'], entry['ttl'], wait_for_peer=False)
+                    )
+                    self._track_cache_fill(cache_key, task)
+                try:
+                    await asyncio.shield(task)
+                    return True
+                except Exception:
+                    return False
+
+        results = await asyncio.gather(*(refresh(cache_key, entry) for cache_key, entry in due))
+        refreshed = sum(1 for ok in results if ok)
+        self._warmup_stats['refreshed'] += refreshed
+        self._warmup_stats['failed'] += len(results) - refreshed
+        self.log(f"Cache warm-up refreshed {refreshed}/{len(results)} hot keys", "INFO")
+        return {'refreshed': refreshed, 'failed': len(results) - refreshed}
+
+    def get_warmup_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        hottest = sorted(self._warmup_keys.items(), key=lambda kv: self._warmup_score(kv[1], now), reverse=True)
+        return {
+            'enabled': self._warmup_enabled,
+            'tracked_keys': len(self._warmup_keys),
+            'hot_keys': [
+                {'key': cache_key, 'score': round(self._warmup_score(entry, now), 2)}
+                for cache_key, entry in hottest[:10]
+            ],
+            **self._warmup_stats,
+        }
+
+    def _track_cache_fill(self, cache_key: str, task: asyncio.Task):
+        self._cache_fill_tasks[cache_key] = task
+
+        def _done(t: asyncio.Task):
+            if self._cache_fill_tasks.get(cache_key) is t:
+                del self._cache_fill_tasks[cache_key]
+            if not t.cancelled() and t.exception() is not None:
+                self.log(f"Cache fill for {cache_key} failed: {str(t.exception())}", "WARNING")
+
+        task.add_done_callback(_done)
+
+    def _schedule_cache_refresh(self, cache_key: str, fetch, ttl: int):
+        task = self._cache_fill_tasks.get(cache_key)
+        if task is not None and not task.done():
+            return
+        self.log(f"Serving stale cache for {cache_key}, refreshing in background", "INFO")
+        self._track_cache_fill(cache_key, asyncio.create_task(self._fill_cache_key(cache_key, fetch, ttl, wait_for_peer=False)))
+
+    async def _fill_cache_key(self, cache_key: str, fetch, ttl: int, wait_for_peer: bool) -> Any:
+        """Fetch and cache one key while holding its Redis lock (lock:<cache_key>)."""
+        lock_key = f"lock:{cache_key}"
+        lock_token = f"{os.getpid()}:{id(asyncio.current_task())}"
+        lock_acquired = False
+        if self.redis_client:
+            try:
+                lock_acquired = bool(self.redis_client.set(lock_key, lock_token, ex=300, nx=True))
+            except Exception as e:
+                self.log(f"Redis lock for {cache_key} failed: {str(e)}, proceeding without lock", "WARNING")
+                lock_acquired = None
+            if lock_acquired is False:
+                if not wait_for_peer:
+                    # Another process is already refreshing this key
+                    return None
+                # Another process is filling this key: wait for its result instead of fetching twice
+                deadline = time.time() + 300
+                while time.time() < deadline:
+                    await traced_sleep(1, '_fill_cache_key')
+                    data = self._get_cached_data(cache_key)
+                    if data is not None:
+                        return data
+                    try:
+                        if not self.redis_client.exists(lock_key):
+                            break
+                    except Exception:
+                        break
+                self.log(f"Peer did not fill {cache_key}, fetching it directly", "WARNING")
+
+        try:
+            data = await fetch()
+            self._set_cached_data(cache_key, data, ttl=ttl, stale_ttl=self._cache_stale_seconds)
+            return data
+        finally:
+            if lock_acquired:
+                try:
+                    if self.redis_client.get(lock_key) == lock_token:
+                        self.redis_client.delete(lock_key)
+                except Exception as e:
+                    self.log(f"Failed to release Redis lock {lock_key}: {str(e)}", "WARNING")
+
+    @traced("search_index.get", "cache")
+    async def _get_search_index(self, cache_key: str, catalog: Dict[str, Any], text_fn,
+                                rank_fields_fn=None) -> CatalogSearchIndex:
+        """Return the search index for a cached catalog, building it once per cache fill.
+
+        The fill is recognised by the catalog's fetched_at stamp, so a copy re-read from
+        Redis or disk reuses the index built for the original.
+        """
+        items = catalog.get('results', [])
+        fill = catalog.get('fetched_at')
+        cached = self._search_indexes.get(cache_key)
+        if cached is not None:
+            indexed_fill, index = cached
+            if index.items is items or (fill is not None and indexed_fill == fill):
+                self._search_indexes.move_to_end(cache_key)
+                return index
+        started = time.time()
+        index = await asyncio.to_thread(CatalogSearchIndex, items, text_fn, rank_fields_fn)
+        self.log(f"Built search index for {cache_key} ({len(items)} items) in {time.time() - started:.2f}s", "INFO")
+        self._search_indexes[cache_key] = (fill, index)
+        while len(self._search_indexes) > 32:
+            self._search_indexes.popitem(last=False)
+        return index
+
     async def _rate_limit_forum_op(self, op_name: str) -> Optional[Dict[str, Any]]:
         if self.redis_client:
             try:
@@ -212,50 +1962,200 @@ class BrainApiClient:
             self._forum_rate_limit_until = now + 60
             return None
     
-    async def _request(self, method: str, url: str, **kwargs) -> requests.Response:
-        """Run blocking requests I/O in a worker thread to avoid blocking the asyncio event loop."""
+    async def _request(self, method: str, url: str, progress: Optional[ToolProgress] = None, **kwargs) -> httpx.Response:
+        """Send a request through the shared async connection pool.
+
+        Concurrency follows the adaptive request window; network failures are mapped
+        to the built-in TimeoutError / ConnectionError so callers stay transport-agnostic.
+        Identical concurrent GETs (same URL and params) share a single upstream call.
+        GETs matching RETRY_POLICIES are retried per their policy (waits are reported to
+        progress, if given).
+        """
         absolute_url = self._to_absolute_url(url)
+        params = kwargs.get("params")
+        if isinstance(params, dict):
+            # Drop None values (requests used to do this implicitly, httpx would send "key=")
+            kwargs["params"] = {k: v for k, v in params.items() if v is not None}
+
+        with span(f"{method.upper()} {metrics_endpoint(absolute_url)}", "http"):
+            if method.upper() == 'GET' and not any(kwargs.get(k) for k in ('json', 'data', 'headers')):
+                send = lambda: self._coalesced_get(absolute_url, **kwargs)
+            else:
+                send = lambda: self._send_request(method, absolute_url, **kwargs)
+            policy = retry_policy_for(method, absolute_url)
+            if policy is None:
+                return await send()
+            return await self._retry_request(policy, send, absolute_url, progress)
+
+    async def _retry_request(self, policy: RetryPolicy, send: Callable[[], Awaitable[httpx.Response]],
+                             absolute_url: str, progress: Optional[ToolProgress] = None) -> httpx.Response:
+        """Run send() until policy accepts the response, its budget runs out or the circuit opens."""
+        endpoint = metrics_endpoint(absolute_url)
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            response = None
+            error: Optional[Exception] = None
+            try:
+                response = await send()
+            except CircuitOpenError:
+                raise
+            except (ConnectionError, TimeoutError) as e:
+                error = e
+                reason = 'error'
+            if response is not None:
+                reason = policy.retry_reason(response)
+                if reason is None:
+                    return response
+            retry_after = self._parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+            delay = policy.backoff(attempt, retry_after)
+            if attempt >= policy.max_attempts or time.monotonic() - started + delay > policy.max_elapsed:
+                self.log(f"Giving up on GET {endpoint} after {attempt} attempts in {time.monotonic() - started:.0f}s ({reason})", "WARNING")
+                if error is not None:
+                    raise error
+                return response
+            self._count_retry(policy.name, reason)
+            self.log(f"GET {endpoint}: {reason} (attempt {attempt}/{policy.max_attempts}), retrying in {delay:.1f}s", "WARNING")
+            await self._sleep_with_progress(delay, policy.name, progress, f"{reason.replace('_', ' ')}, attempt {attempt}")
+
+    async def _coalesced_get(self, absolute_url: str, **kwargs) -> httpx.Response:
+        """Join an identical in-flight GET if there is one, otherwise start it.
+
+        Every waiter receives the same immutable response and parses its own copy via
+        response.json(), so callers can mutate their result without affecting each other.
+        """
+        key = ('GET', absolute_url, json.dumps(sorted((kwargs.get('params') or {}).items()), default=str))
+        entry = self._inflight_gets.get(key)
+        if entry is None:
+            task = asyncio.create_task(self._send_request('GET', absolute_url, **kwargs))
+            entry = {'task': task, 'waiters': 0}
+            self._inflight_gets[key] = entry
+            task.add_done_callback(lambda t, key=key, entry=entry: self._on_inflight_get_done(key, entry, t))
+        entry['waiters'] += 1
+        if entry['waiters'] > 1:
+            # Joined another caller's request; the upstream call is traced by whoever started it
+            with span("http.coalesced_wait", "http"):
+                return await asyncio.shield(entry['task'])
+        # Shield so one cancelled waiter does not cancel the request for the others
+        return await asyncio.shield(entry['task'])
+
+    def _on_inflight_get_done(self, key: Tuple[str, str, str], entry: Dict[str, Any], task: asyncio.Task) -> None:
+        if self._inflight_gets.get(key) is entry:
+            del self._inflight_gets[key]
+        if entry['waiters'] > 1:
+            self._coalesced_request_count += entry['waiters'] - 1
+            self.log(f"Coalesced {entry['waiters']} identical GET requests for {key[1]}", "INFO")
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter was cancelled
+            task.exception()
+
+    @staticmethod
+    def _observe_upstream(method: str, endpoint: str, status: str, started: float):
+        elapsed = time.perf_counter() - started
+        UPSTREAM_REQUESTS.inc(method=method, endpoint=endpoint, status=status)
+        UPSTREAM_DURATION.observe(elapsed, method=method, endpoint=endpoint, status=status)
+
+    @staticmethod
+    def _count_retry(operation: str, reason: str):
+        RETRIES.inc(operation=operation, reason=reason)
+
+    async def _sleep_with_progress(self, seconds: float, operation: str, progress: Optional[ToolProgress], status: str):
+        """Retry wait that first tells an MCP client (if any) what is being waited for."""
+        if progress is not None:
+            await progress.update(None, f"{operation.replace('_', ' ')} {status}", seconds)
+        await traced_sleep(seconds, operation)
+
+    @staticmethod
+    def _concurrency_signal(response: httpx.Response) -> str:
+        """Classify a response for the concurrency window.
+
+        Retry-After only counts as overload on error responses: simulation progress polls
+        carry it on every 200 as their normal polling interval.
+        """
+        if response.status_code == 429 or (response.status_code >= 500 and response.headers.get('Retry-After')):
+            return 'overload'
+        if response.status_code >= 500:
+            return 'error'
+        return 'ok'
+
+    def semaphore_occupancy(self) -> Dict[Tuple[str, ...], float]:
+        """Permits in use per semaphore, for the /metrics gauges."""
+        return {
+            ('request',): self._request_limiter.in_flight,
+            ('simulation_slots',): self._simulation_slots.in_use,
+        }
+
+    async def _send_request(self, method: str, absolute_url: str, **kwargs) -> httpx.Response:
+        """Perform one HTTP request under the adaptive concurrency window and map transport errors."""
         timeout = kwargs.pop("timeout", self._default_timeout_seconds)
-        # Add extra buffer for asyncio timeout to catch stuck threads
+        # Add extra buffer for asyncio timeout to catch stuck connections
         asyncio_timeout = timeout + 10
-        
-        async with self._request_semaphore:
-            async with self._session_lock:
-                try:
-                    # Wrap asyncio.to_thread with wait_for to prevent infinite hangs
-                    return await asyncio.wait_for(
-                        asyncio.to_thread(
-                            self.session.request,
-                            method,
-                            absolute_url,
-                            timeout=timeout,
-                            **kwargs,
-                        ),
-                        timeout=asyncio_timeout
-                    )
-                except asyncio.TimeoutError:
-                    self.log(f"Request asyncio timeout for {method} {absolute_url} after {asyncio_timeout}s", "ERROR")
-                    raise TimeoutError(f"Request timed out after {asyncio_timeout}s")
-                except asyncio.CancelledError:
-                    self.log(f"Request cancelled for {method} {absolute_url}", "WARNING")
-                    raise
-                except requests.Timeout as e:
-                    self.log(f"Request timeout for {method} {absolute_url}: {str(e)}", "ERROR")
-                    raise TimeoutError(f"Request timed out after {timeout}s") from e
-                except requests.ConnectionError as e:
-                    self.log(f"Connection error for {method} {absolute_url}: {str(e)}", "ERROR")
-                    raise ConnectionError(f"Failed to connect to {absolute_url}") from e
-                except requests.HTTPError as e:
-                    self.log(f"HTTP error for {method} {absolute_url}: {str(e)}", "ERROR")
-                    raise
-                except Exception as e:
-                    # Catch other unexpected errors (e.g., RemoteDisconnected wrapped in other exceptions)
-                    error_str = str(e)
-                    if "RemoteDisconnected" in error_str or "Connection aborted" in error_str:
-                        self.log(f"Remote disconnected for {method} {absolute_url}: {error_str}", "ERROR")
-                        raise ConnectionError(f"Remote server disconnected: {absolute_url}") from e
-                    raise
+
+        endpoint = metrics_endpoint(absolute_url)
+        # Fail fast while BRAIN is down instead of queueing for a permit
+        self._circuit_breaker.before_request()
+        with span("request_semaphore.wait", "queue"):
+            try:
+                await self._request_limiter.acquire()
+            except asyncio.CancelledError:
+                self._circuit_breaker.record(None)
+                raise
+        # How this request should move the concurrency window; stays 'dropped' if cancelled
+        signal = 'dropped'
+        response = None
+        started = time.perf_counter()
+        try:
+            try:
+                # Wrap the request with wait_for to prevent infinite hangs
+                response = await asyncio.wait_for(
+                    self.session.request(
+                        method,
+                        absolute_url,
+                        timeout=timeout,
+                        **kwargs,
+                    ),
+                    timeout=asyncio_timeout
+                )
+            except asyncio.TimeoutError:
+                signal = 'overload'
+                self._observe_upstream(method, endpoint, 'timeout', started)
+                self.log(f"Request asyncio timeout for {method} {absolute_url} after {asyncio_timeout}s", "ERROR")
+                raise TimeoutError(f"Request timed out after {asyncio_timeout}s")
+            except asyncio.CancelledError:
+                self.log(f"Request cancelled for {method} {absolute_url}", "WARNING")
+                raise
+            except httpx.TimeoutException as e:
+                signal = 'overload'
+                self._observe_upstream(method, endpoint, 'timeout', started)
+                self.log(f"Request timeout for {method} {absolute_url}: {str(e)}", "ERROR")
+                raise TimeoutError(f"Request timed out after {timeout}s") from e
+            except httpx.TransportError as e:
+                # Covers connect errors, remote disconnects and protocol errors
+                signal = 'error'
+                self._observe_upstream(method, endpoint, 'connection_error', started)
+                self.log(f"Connection error for {method} {absolute_url}: {str(e)}", "ERROR")
+                raise ConnectionError(f"Failed to connect to {absolute_url}") from e
+            self._observe_upstream(method, endpoint, str(response.status_code), started)
+            signal = self._concurrency_signal(response)
+        finally:
+            # Any answer below 500 (429 included) means BRAIN is up
+            reachable = None if signal == 'dropped' else response is not None and response.status_code < 500
+            circuit_change = self._circuit_breaker.record(reachable)
+            if circuit_change == CircuitBreaker.OPEN:
+                self.log(f"BRAIN API failing ({self._circuit_breaker.failures} consecutive failures), failing requests fast for {self._circuit_breaker.reset_timeout:.0f}s", "ERROR")
+            elif circuit_change == CircuitBreaker.CLOSED:
+                self.log("BRAIN API reachable again, circuit breaker closed", "INFO")
+            if self._request_limiter.release(signal, time.perf_counter() - started):
+                self.log(f"Upstream overloaded ({signal} from {method} {endpoint}), concurrency window cut to {self._request_limiter.window}", "WARNING")
+
+        if response.status_code == 401 and self._token_expires_at is not None:
+            # Token was revoked server-side; force a real check on the next ensure_authenticated
+            self.log("Received 401, discarding locally tracked token expiry", "WARNING")
+            self._token_expires_at = None
+        return response
     
+    @traced("auth.login", "auth")
     async def authenticate(self, email: str, password: str) -> Dict[str, Any]:
         """Authenticate with WorldQuant BRAIN platform with biometric support."""
         self.log("🔐 Starting Authentication process...", "INFO")
@@ -266,9 +2166,8 @@ class BrainApiClient:
                 # Store credentials for potential re-authentication
                 self.auth_credentials = {'email': email, 'password': password}
                 
-                # Clear any existing session data (quick operation, no lock needed for this)
-                self.session.cookies.clear()
-                self.session.auth = None
+                # The cookie jar is not cleared: other in-flight requests keep using the
+                # current token until the 201 response replaces the 't' cookie.
                 
                 # Create Basic Authentication header (base64 encoded credentials)
                 import base64
@@ -280,11 +2179,10 @@ class BrainApiClient:
                     'Authorization': f'Basic {encoded_credentials}'
                 }
                 
-                # Use a direct thread call with timeout, no nested locks
+                # Use a direct client call with timeout, no nested locks
                 try:
                     response = await asyncio.wait_for(
-                        asyncio.to_thread(
-                            self.session.request,
+                        self.session.request(
                             'POST',
                             'https://api.worldquantbrain.com/authentication',
                             headers=headers,
@@ -299,6 +2197,13 @@ class BrainApiClient:
                 # Check for successful authentication (status code 201)
                 if response.status_code == 201:
                     self.log("Authentication successful", "SUCCESS")
+                    self._record_token_expiry(response)
+                    # The catalog snapshot needs a session; keep it fresh from the first login on
+                    self.start_catalog_snapshot_scheduler()
+                    self.start_warmup_scheduler()
+                    self._simulation_slots.set_capacity(
+                        self._simulation_slots_by_account.get(email.lower(), self._default_simulation_slots))
+                    self._start_job_resume()
                     
                     # Check if JWT token was automatically stored by session
                     jwt_token = self.session.cookies.get('t')
@@ -325,7 +2230,7 @@ class BrainApiClient:
                         
                         # Handle biometric authentication
                         from urllib.parse import urljoin
-                        biometric_url = urljoin(response.url, location)
+                        biometric_url = urljoin(str(response.url), location)
                         
                         # Release auth_lock before calling biometric auth to avoid deadlock
                         # Biometric auth will acquire its own locks as needed
@@ -338,7 +2243,7 @@ class BrainApiClient:
         except asyncio.TimeoutError:
             self.log(f"❌ Authentication timed out", "ERROR")
             raise TimeoutError("Authentication request timed out")
-        except requests.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             self.log(f"❌ HTTP error during authentication: {e}", "ERROR")
             raise
         except Exception as e:
@@ -381,6 +2286,7 @@ class BrainApiClient:
                 else:
                     self.log("使用默认Playwright浏览器", "INFO")
                     browser = await p.chromium.launch(headless=True, args=browser_args)
+                track_browser(browser, "biometric_auth")
                     
                 page = await browser.new_page()
 
@@ -402,7 +2308,7 @@ class BrainApiClient:
                 attempt = 0
 
                 while attempt < max_attempts:
-                    await asyncio.sleep(5)  # Check every 5 seconds
+                    await traced_sleep(5, '_handle_biometric_auth')  # Check every 5 seconds
                     attempt += 1
 
                     # Check if authentication completed
@@ -411,6 +2317,7 @@ class BrainApiClient:
 
                     if check_response.status_code == 201:
                         self.log("Biometric authentication successful!", "SUCCESS")
+                        self._record_token_expiry(check_response)
 
                         await browser.close()
                         
@@ -436,6 +2343,7 @@ class BrainApiClient:
             self.log(f"❌ Biometric authentication failed: {str(e)}", "ERROR")
             raise
     
+    @traced("auth.check", "auth")
     async def is_authenticated(self) -> bool:
         """Check if currently authenticated using JWT token."""
         try:
@@ -448,9 +2356,11 @@ class BrainApiClient:
             # Test authentication with a simple API call
             response = await self._request('GET', f"{self.base_url}/authentication")
             if response.status_code == 200:
+                self._record_token_expiry(response)
                 return True
             elif response.status_code == 401:
                 self.log("❌ JWT token expired or invalid (401)", "INFO")
+                self._token_expires_at = None
                 return False
             else:
                 self.log(f"⚠️ Unexpected status code during auth check: {response.status_code}", "WARNING")
@@ -462,21 +2372,104 @@ class BrainApiClient:
             self.log(f"❌ Unexpected error checking authentication: {str(e)}", "ERROR")
             return False
     
+    def _record_token_expiry(self, response: Optional[httpx.Response] = None) -> None:
+        """Remember when the current JWT expires, from the /authentication body or the 't' cookie."""
+        expires_at = None
+        if response is not None:
+            try:
+                body = response.json()
+                token = body.get('token') if isinstance(body, dict) else None
+                if isinstance(token, dict) and token.get('expiry') is not None:
+                    expires_at = time.time() + float(token['expiry'])
+            except Exception:
+                pass
+        if expires_at is None:
+            try:
+                expires_at = self._decode_jwt_expiry(self.session.cookies.get('t'))
+            except Exception:
+                expires_at = None
+        self._token_expires_at = expires_at
+        if expires_at is not None:
+            self.log(f"JWT valid for {int(expires_at - time.time())}s", "INFO")
+
+    @staticmethod
+    def _decode_jwt_expiry(token: Optional[str]) -> Optional[float]:
+        """Read the 'exp' claim from a JWT without verifying it (only used as a local hint)."""
+        if not token or token.count('.') != 2:
+            return None
+        try:
+            payload = token.split('.')[1]
+            payload += '=' * (-len(payload) % 4)
+            claims = json.loads(base64.urlsafe_b64decode(payload))
+            exp = claims.get('exp') if isinstance(claims, dict) else None
+            return float(exp) if exp else None
+        except Exception:
+            return None
+
+    def _token_seconds_remaining(self) -> Optional[float]:
+        """Seconds until the tracked JWT expires, or None when unknown."""
+        if self._token_expires_at is None:
+            return None
+        return self._token_expires_at - time.time()
+
+    async def _login_with_stored_credentials(self) -> Dict[str, Any]:
+        """Log in again with the credentials in memory, loading them from config if needed."""
+        if not self.auth_credentials:
+            self.log("No credentials in memory, loading from config...", "INFO")
+            config = load_config()
+            creds = config.get("credentials", {})
+            email = creds.get("email")
+            password = creds.get("password")
+            if not email or not password:
+                raise Exception("Authentication credentials not found in config. Please authenticate first.")
+            self.auth_credentials = {'email': email, 'password': password}
+
+        self.log("🔄 Re-authenticating...", "INFO")
+        return await self.authenticate(self.auth_credentials['email'], self.auth_credentials['password'])
+
+    async def _reauthenticate(self) -> Dict[str, Any]:
+        """Single-flight re-login: concurrent callers all wait on the same login task."""
+        task = self._reauth_task
+        if task is None or task.done():
+            task = asyncio.create_task(self._login_with_stored_credentials())
+            self._reauth_task = task
+        # Shield so a cancelled caller does not abort the login other callers are waiting on
+        return await asyncio.shield(task)
+
+    def _start_background_refresh(self) -> None:
+        """Refresh the token ahead of expiry without blocking the current caller."""
+        if self._reauth_task is not None and not self._reauth_task.done():
+            return
+        self.log("JWT close to expiry, refreshing in background", "INFO")
+        task = asyncio.create_task(self._login_with_stored_credentials())
+        task.add_done_callback(self._on_background_refresh_done)
+        self._reauth_task = task
+
+    def _on_background_refresh_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self.log(f"Background token refresh failed: {str(exc)}", "WARNING")
+
+    @traced("auth.ensure", "auth")
     async def ensure_authenticated(self):
-        """Ensure authentication is valid, re-authenticate if needed."""
-        if not await self.is_authenticated():
-            if not self.auth_credentials:
-                self.log("No credentials in memory, loading from config...", "INFO")
-                config = load_config()
-                creds = config.get("credentials", {})
-                email = creds.get("email")
-                password = creds.get("password")
-                if not email or not password:
-                    raise Exception("Authentication credentials not found in config. Please authenticate first.")
-                self.auth_credentials = {'email': email, 'password': password}
+        """Ensure authentication is valid, re-authenticate if needed.
 
-            self.log("🔄 Re-authenticating...", "INFO")
-            await self.authenticate(self.auth_credentials['email'], self.auth_credentials['password'])
+        While the locally tracked token expiry is comfortably in the future no request is made.
+        Close to expiry a background re-login is started; once expired (or unknown and rejected
+        by /authentication) callers wait on a single shared re-login.
+        """
+        remaining = self._token_seconds_remaining()
+        if remaining is not None and remaining > self._token_expiry_skew:
+            if remaining < self._token_refresh_margin:
+                self._start_background_refresh()
+            return
+
+        if remaining is None and await self.is_authenticated():
+            return
+
+        await self._reauthenticate()
     
     async def get_authentication_status(self) -> Optional[Dict[str, Any]]:
         """Get current authentication status and user info."""
@@ -488,128 +2481,515 @@ class BrainApiClient:
             self.log(f"Failed to get auth status: {str(e)}", "ERROR")
             return None
     
-    async def create_simulation(self, simulation_data: SimulationData) -> Dict[str, str]:
-        """Create a new simulation on BRAIN platform."""
-        await self._create_simulation_semaphore.acquire()
+    @staticmethod
+    def _build_simulation_payload(simulation_data: SimulationData) -> Dict[str, Any]:
+        """POST /simulations body for one simulation."""
+        # Prepare settings based on simulation type
+        settings_dict = simulation_data.settings.model_dump()
+        
+        # Remove fields based on simulation type
+        if simulation_data.type == "REGULAR":
+            # Remove SUPER-specific fields for REGULAR
+            settings_dict.pop('selectionHandling', None)
+            settings_dict.pop('selectionLimit', None)
+            settings_dict.pop('componentActivation', None)
+        
+        # Filter out None values from settings
+        settings_dict = {k: v for k, v in settings_dict.items() if v is not None}
+        
+        # Prepare simulation payload
+        payload = {
+            'type': simulation_data.type,
+            'settings': settings_dict
+        }
+        
+        # Add type-specific fields
+        if simulation_data.type == "REGULAR":
+            if simulation_data.regular:
+                payload['regular'] = simulation_data.regular
+        elif simulation_data.type == "SUPER":
+            if simulation_data.combo:
+                payload['combo'] = simulation_data.combo
+            if simulation_data.selection:
+                payload['selection'] = simulation_data.selection
+        
+        # Filter out None values from entire payload
+        payload = {k: v for k, v in payload.items() if v is not None}
+        return payload
+
+    @staticmethod
+    def _simulation_result_key(payload: Dict[str, Any]) -> str:
+        """Content address of one simulation payload (type, settings, expressions).
+
+        Not namespaced by account: the same expression and settings give the same result
+        for everyone sharing the cache.
+        """
+        normalized = {
+            key: ' '.join(value.split()) if key in ('regular', 'combo', 'selection') and isinstance(value, str) else value
+            for key, value in payload.items()
+        }
+        digest = hashlib.sha256(json.dumps(normalized, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+        return f"simresult:{digest}"
+
+    def get_cached_simulation_result(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Stored {alpha_id, details, simulated_at} of an identical earlier simulation, if any."""
+        if self._simulation_cache_seconds <= 0:
+            return None
+        return self._get_cached_data(self._simulation_result_key(payload))
+
+    def _store_simulation_result(self, payload: Dict[str, Any], alpha_id: str, details: Dict[str, Any]):
+        if self._simulation_cache_seconds <= 0:
+            return
+        self._set_cached_data(
+            self._simulation_result_key(payload),
+            {'alpha_id': alpha_id, 'details': details, 'simulated_at': datetime.now().isoformat()},
+            self._simulation_cache_seconds,
+        )
+
+    async def _submit_simulation(self, payload: Any) -> str:
+        """POST a simulation (or a list of them) and return its absolute Location URL.
+
+        Only the POST holds a submission slot; callers separately hold a running-simulation
+        slot of self._simulation_slots until the simulation has finished.
+        """
+        async with self._create_simulation_semaphore:
+            response = await self._request('POST', f"{self.base_url}/simulations", json=payload)
+        response.raise_for_status()
+        location = response.headers.get('Location', '')
+        if not location:
+            raise Exception("No location header in simulation response")
+        return self._to_absolute_url(location)
+
+    async def create_simulation(self, simulation_data: SimulationData, force: bool = False,
+                                progress: Optional[ToolProgress] = None) -> Dict[str, str]:
+        """Create a new simulation on BRAIN platform.
+
+        A running-simulation slot (interactive priority) is held from submission until BRAIN
+        reports the simulation finished, a submission slot only around the POST; the shared
+        simulation poller does the polling. An identical payload simulated within
+        BRAIN_SIMULATION_CACHE_HOURS returns the stored alpha instead, unless force is set.
+        """
         try:
+            payload = self._build_simulation_payload(simulation_data)
+            if not force:
+                cached = self.get_cached_simulation_result(payload)
+                if cached is not None:
+                    self.log(f"Identical simulation already ran ({cached['alpha_id']}), returning cached result", "INFO")
+                    return {**cached['details'], 'cached': True, 'simulated_at': cached['simulated_at']}
+
             await self.ensure_authenticated()
         
             self.log("🚀 Creating simulation...", "INFO")
             
-            # Prepare settings based on simulation type
-            settings_dict = simulation_data.settings.model_dump()
-            
-            # Remove fields based on simulation type
-            if simulation_data.type == "REGULAR":
-                # Remove SUPER-specific fields for REGULAR
-                settings_dict.pop('selectionHandling', None)
-                settings_dict.pop('selectionLimit', None)
-                settings_dict.pop('componentActivation', None)
-            
-            # Filter out None values from settings
-            settings_dict = {k: v for k, v in settings_dict.items() if v is not None}
-            
-            # Prepare simulation payload
-            payload = {
-                'type': simulation_data.type,
-                'settings': settings_dict
-            }
-            
-            # Add type-specific fields
-            if simulation_data.type == "REGULAR":
-                if simulation_data.regular:
-                    payload['regular'] = simulation_data.regular
-            elif simulation_data.type == "SUPER":
-                if simulation_data.combo:
-                    payload['combo'] = simulation_data.combo
-                if simulation_data.selection:
-                    payload['selection'] = simulation_data.selection
-            
-            # Filter out None values from entire payload
-            payload = {k: v for k, v in payload.items() if v is not None}
-            
-            response = await self._request('POST', f"{self.base_url}/simulations", json=payload)
-            response.raise_for_status()
-            
-            location = response.headers.get('Location', '')
-            location_url = self._to_absolute_url(location)
-            simulation_id = location_url.split('/')[-1] if location_url else None
-            
-            self.log(f"Simulation created with ID: {simulation_id}", "SUCCESS")
+            timeout_seconds = 1800  # 30 minutes
 
-            start_time = time.time()
-            timeout_seconds = 1800  # 10 minutes
-            max_poll_retries = 5  # Max retries for transient connection errors during polling
-            poll_retry_delay = 3  # Initial delay between poll retries
+            client = current_mcp_client.get()
+            with span("simulation_slot.wait", "queue"):
+                await self._simulation_slots.acquire(
+                    'interactive', client, on_wait=progress.on_slot_wait if progress is not None else None)
+            try:
+                location_url = await self._submit_simulation(payload)
+                simulation_id = location_url.split('/')[-1]
 
-            simulation_progress = None
-            while True:
-                # Check for timeout
-                if time.time() - start_time > timeout_seconds:
-                    raise TimeoutError(f"Simulation {simulation_id} timed out after {timeout_seconds} seconds")
+                self.log(f"Simulation created with ID: {simulation_id}", "SUCCESS")
 
-                # Poll with retry logic for transient network errors
-                poll_error = None
-                for poll_attempt in range(max_poll_retries):
-                    try:
-                        simulation_progress = await self._request('GET', location_url)
-                        poll_error = None
-                        break  # Success, exit retry loop
-                    except (ConnectionError, TimeoutError) as e:
-                        poll_error = e
-                        if poll_attempt < max_poll_retries - 1:
-                            retry_wait = poll_retry_delay * (1.5 ** poll_attempt)
-                            self.log(f"⚠️ Polling connection error for {simulation_id} (attempt {poll_attempt + 1}/{max_poll_retries}), retrying in {retry_wait:.1f}s: {str(e)}", "WARNING")
-                            await asyncio.sleep(retry_wait)
-                        else:
-                            self.log(f"❌ Polling failed after {max_poll_retries} attempts for {simulation_id}: {str(e)}", "ERROR")
-                
-                if poll_error:
-                    raise poll_error
-                
-                # Check if we need to wait
-                retry_after = simulation_progress.headers.get("Retry-After")
-                
-                if not retry_after or float(retry_after) == 0:
-                    break
-                
-                wait_time = float(retry_after)
-                # Use asyncio.sleep instead of time.sleep to avoid blocking
-                await asyncio.sleep(wait_time)
+                with span("simulation.wait", "poll", simulation_id=simulation_id):
+                    progress_data = await self._simulation_poller.watch(
+                        location_url, timeout=timeout_seconds,
+                        on_poll=progress.on_simulation_poll if progress is not None else None)
+            finally:
+                self._simulation_slots.release(client)
 
             self.log("Alpha done simulating, getting alpha details", "INFO")
             
-            progress_data = simulation_progress.json()
             if "alpha" not in progress_data:
                 # Handle error case where alpha ID is missing
                 error_message = progress_data.get("message", "Unknown error")
                 raise Exception(f"Simulation failed or returned no alpha ID. Details: {error_message}")
                 
             alpha_id = progress_data["alpha"]
+            self.invalidate_cache_tag('alphas')
             
-            # Fetch alpha details with retry logic
-            alpha_response = None
-            for alpha_attempt in range(max_poll_retries):
-                try:
-                    alpha_response = await self._request('GET', f"https://api.worldquantbrain.com/alphas/{alpha_id}")
-                    break
-                except (ConnectionError, TimeoutError) as e:
-                    if alpha_attempt < max_poll_retries - 1:
-                        retry_wait = poll_retry_delay * (1.5 ** alpha_attempt)
-                        self.log(f"⚠️ Failed to fetch alpha details (attempt {alpha_attempt + 1}/{max_poll_retries}), retrying in {retry_wait:.1f}s: {str(e)}", "WARNING")
-                        await asyncio.sleep(retry_wait)
-                    else:
-                        self.log(f"❌ Failed to fetch alpha details after {max_poll_retries} attempts: {str(e)}", "ERROR")
-                        raise
+            # Fetch alpha details (retried by the 'alpha_details' policy)
+            alpha_response = await self._request('GET', f"{self.base_url}/alphas/{alpha_id}")
             
-            return alpha_response.json()
+            with span("json.parse", "parse"):
+                details = alpha_response.json()
+            if alpha_response.status_code == 200:
+                self._store_simulation_result(payload, alpha_id, details)
+            return details
             
         except Exception as e:
             self.log(f"❌ Failed to create simulation: {str(e)}", "ERROR")
             raise
+    
+    # --- Batch simulations ---
+
+    MULTISIMULATION_SIZE = 8
+
+    async def run_simulation_batch(
+        self,
+        payloads: List[Dict[str, Any]],
+        max_retries: int = 1,
+        max_in_flight: Optional[int] = None,
+        on_result: Optional[Callable[[Dict[str, Any], int, int], Awaitable[None]]] = None,
+        force: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Run any number of REGULAR simulation payloads packed into 8-wide multisimulations.
+
+        Up to max_in_flight (BRAIN_BATCH_MAX_IN_FLIGHT) multisimulations run at once, each
+        holding a batch-priority simulation slot; a submission refused with 429 waits for
+        Retry-After and is resubmitted. Children that fail are retried up to max_retries
+        times: the failed children of one multisimulation are resubmitted together as one. Results are
+        returned (and passed to on_result) in the order they complete; each carries the
+        payload index, expression, alpha_id and IS summary or error. Payloads found in the
+        simulation result cache are returned first without resubmitting, unless force is set.
+        """
+        await self.ensure_authenticated()
+        client = current_mcp_client.get()
+        max_in_flight = max_in_flight or self._batch_max_in_flight
+        size = self.MULTISIMULATION_SIZE
+        queue: "asyncio.Queue[List[Tuple[int, int]]]" = asyncio.Queue()
+        results: List[Dict[str, Any]] = []
+        cached: Dict[int, Dict[str, Any]] = {}
+        if not force:
+            for i, payload in enumerate(payloads):
+                hit = self.get_cached_simulation_result(payload)
+                if hit is not None:
+                    cached[i] = hit
+        pending = [i for i in range(len(payloads)) if i not in cached]
+        for start in range(0, len(pending), size):
+            # (payload index, attempt) pairs
+            queue.put_nowait([(i, 0) for i in pending[start:start + size]])
+
+        async def emit(index: int, attempt: int, outcome: Dict[str, Any]):
+            result = {
+                'index': index,
+                'expression': payloads[index].get('regular'),
+                'attempts': attempt + 1,
+                **outcome,
+            }
+            results.append(result)
+            if on_result is not None:
+                try:
+                    await on_result(result, len(results), len(payloads))
+                except Exception as e:
+                    # A failing progress callback must not fail (and re-settle) the batch
+                    self.log(f"Batch result callback failed: {str(e)}", "WARNING")
+
+        for index, hit in cached.items():
+            await emit(index, -1, {
+                'alpha_id': hit['alpha_id'],
+                'is': hit['details'].get('is'),
+                'cached': True,
+                'simulated_at': hit['simulated_at'],
+            })
+
+        settled: set = set()
+
+        async def settle(chunk: List[Tuple[int, int]], outcomes: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+            """Emit final outcomes and return the items to retry; each (index, attempt) is settled once."""
+            retry = []
+            for (index, attempt), outcome in zip(chunk, outcomes):
+                if (index, attempt) in settled:
+                    continue
+                settled.add((index, attempt))
+                if outcome.get('alpha_id') or attempt >= max_retries:
+                    await emit(index, attempt, outcome)
+                else:
+                    self._count_retry('simulation_batch', 'child_failed')
+                    retry.append((index, attempt + 1))
+            return retry
+
+        def requeue(retry: List[Tuple[int, int]]):
+            # Failed children of one chunk are retried together, as one multisimulation
+            if retry:
+                queue.put_nowait(retry)
+
+        async def run_chunk(chunk: List[Tuple[int, int]]):
+            body = [payloads[index] for index, _ in chunk]
+            while True:
+                try:
+                    # A multisimulation needs at least two children; a lone payload runs as a single simulation
+                    location_url = await self._submit_simulation(body if len(body) > 1 else body[0])
+                    break
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code != 429:
+                        if len(chunk) > 1:
+                            # One bad expression rejects the whole request: retry them one by one
+                            for index, attempt in chunk:
+                                queue.put_nowait([(index, attempt)])
+                            return
+                        # Rejected expression: retrying would fail the same way
+                        index, attempt = chunk[0]
+                        await emit(index, attempt, {'error': f"Submission failed: {str(e)}"})
+                        return
+                    wait = self._parse_retry_after(e.response.headers.get('Retry-After')) or 10
+                    self._count_retry('simulation_batch', 'rate_limited')
+                    self.log(f"Simulation limit reached, resubmitting batch chunk in {wait:.1f}s", "WARNING")
+                    await traced_sleep(wait, 'run_simulation_batch')
+                except CircuitOpenError as e:
+                    await traced_sleep(e.retry_in + random.uniform(0, 1), 'run_simulation_batch')
+                except Exception as e:
+                    requeue(await settle(chunk, [{'error': f"Submission failed: {str(e)}"}] * len(chunk)))
+                    return
+            if len(chunk) == 1:
+                outcome = await self._finish_child(location_url, payload=body[0])
+                requeue(await settle(chunk, [outcome]))
+                return
+            try:
+                child_urls = await self._multisimulation_child_urls(location_url)
+            except Exception as e:
+                requeue(await settle(chunk, [{'location': location_url, 'error': str(e)}] * len(chunk)))
+                return
+
+            retry: List[Tuple[int, int]] = []
+
+            async def finish(item: Tuple[int, int], child_url: str):
+                # Successes are emitted as each child finishes; failures wait for their siblings
+                retry.extend(await settle([item], [await self._finish_child(child_url, payload=payloads[item[0]])]))
+
+            await asyncio.gather(*(finish(item, url) for item, url in zip(chunk, child_urls)))
+            if len(child_urls) < len(chunk):
+                retry.extend(await settle(chunk[len(child_urls):], [{'error': "Multisimulation returned fewer children than submitted"}] * (len(chunk) - len(child_urls))))
+            requeue(retry)
+
+        async def worker():
+            while True:
+                chunk = await queue.get()
+                try:
+                    with span("simulation_slot.wait", "queue"):
+                        await self._simulation_slots.acquire('batch', client)
+                    try:
+                        await run_chunk(chunk)
+                    finally:
+                        self._simulation_slots.release(client)
+                except Exception as e:
+                    self.log(f"Batch chunk failed: {str(e)}", "ERROR")
+                    requeue(await settle(chunk, [{'error': str(e)}] * len(chunk)))
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(max_in_flight)]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if results:
+                self.invalidate_cache_tag('alphas')
+        return results
+
+    # --- Asynchronous simulation jobs ---
+
+    _JOB_TERMINAL_STATUSES = ('completed', 'failed')
+
+    def _new_job(self, kind: str, **fields: Any) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            'id': f"job_{int(now)}_{os.urandom(4).hex()}",
+            'kind': kind,
+            'status': 'queued',
+            'client': current_mcp_client.get(),
+            'created_at': now,
+            'updated_at': now,
+            **fields,
+        }
+
+    def _save_job(self, job: Dict[str, Any], **changes: Any) -> Dict[str, Any]:
+        job.update(changes)
+        job['updated_at'] = time.time()
+        self._job_store.save(self._cache_tag('jobs'), job)
+        return job
+
+    async def submit_simulation_job(self, simulation_data: SimulationData) -> Dict[str, Any]:
+        """Queue one simulation as a job and return its record without waiting for the result."""
+        await self.ensure_authenticated()
+        payload = self._build_simulation_payload(simulation_data)
+        job = self._new_job(
+            'simulation',
+            expression=payload.get('regular') or payload.get('combo'),
+            selection=payload.get('selection'),
+            settings=payload.get('settings'),
+            payload=payload,
+        )
+        return self._start_job(job)
+
+    async def submit_multi_simulation_job(self, payload: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Queue a multisimulation (list of REGULAR simulations) as one job."""
+        await self.ensure_authenticated()
+        job = self._new_job(
+            'multi_simulation',
+            expressions=[item.get('regular') for item in payload],
+            settings=payload[0].get('settings') if payload else None,
+            payload=payload,
+        )
+        return self._start_job(job)
+
+    def _start_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        self._save_job(job)
+        self._spawn_job_task(job)
+        return job
+
+    def _spawn_job_task(self, job: Dict[str, Any]):
+        task = self._job_tasks.get(job['id'])
+        if task is not None and not task.done():
+            return
+        task = asyncio.create_task(detached(self._run_job(job)))
+        self._job_tasks[job['id']] = task
+        task.add_done_callback(lambda _t, job_id=job['id']: self._job_tasks.pop(job_id, None))
+
+    async def _run_job(self, job: Dict[str, Any]):
+        """Submit a queued job once it gets a (batch priority) simulation slot, wait for it
+        through the shared poller and record its outcome."""
+        client = job.get('client') or 'local'
+        # A job resumed after a restart is already running upstream: it takes its slot back at once
+        await self._simulation_slots.acquire('batch', client, force=bool(job.get('location')))
+        try:
+            if not job.get('location'):
+                self._save_job(job, status='submitting')
+                try:
+                    location_url = await self._submit_simulation(job['payload'])
+                except Exception as e:
+                    self._save_job(job, status='failed', error=f"Submission failed: {str(e)}")
+                    return
+                self._save_job(job, status='running', location=location_url)
+                self.log(f"Simulation job {job['id']} submitted: {location_url}", "SUCCESS")
+            if job['kind'] == 'multi_simulation':
+                child_urls = await self._multisimulation_child_urls(job['location'])
+                children = await asyncio.gather(*(self._finish_child(url) for url in child_urls))
+                alpha_ids = [child['alpha_id'] for child in children if child.get('alpha_id')]
+                self._save_job(
+                    job,
+                    status='completed' if alpha_ids else 'failed',
+                    children=children,
+                    alpha_ids=alpha_ids,
+                    error=None if alpha_ids else "No child simulation produced an alpha",
+                )
+            else:
+                result = await self._finish_child(job['location'])
+                if result.get('alpha_id'):
+                    self._save_job(job, status='completed', alpha_id=result['alpha_id'], result=result.get('is'))
+                else:
+                    self._save_job(job, status='failed', error=result.get('error'))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.log(f"Simulation job {job['id']} failed: {str(e)}", "WARNING")
+            self._save_job(job, status='failed', error=str(e))
         finally:
-            self._create_simulation_semaphore.release()
-    
+            self._simulation_slots.release(client)
+            if job['status'] == 'completed':
+                self.invalidate_cache_tag('alphas')
+
+    async def _multisimulation_child_urls(self, location_url: str, timeout: float = 1800,
+                                          on_poll=None) -> List[str]:
+        """Child simulation URLs of a multisimulation, as soon as the parent lists them."""
+        parent = await self._simulation_poller.watch(
+            location_url, timeout=timeout, ready=lambda progress: bool(progress.get('children')), on_poll=on_poll)
+        child_urls = [
+            child if str(child).startswith('http') else f"{self.base_url}/simulations/{child}"
+            for child in parent.get('children', [])
+        ]
+        if not child_urls:
+            raise Exception(parent.get('message') or "Multisimulation finished without children")
+        return child_urls
+
+    async def _finish_child(self, location_url: str, full_details: bool = False,
+                            payload: Optional[Dict[str, Any]] = None, on_poll=None) -> Dict[str, Any]:
+        """Final state of one simulation: its alpha id and IS summary (or full alpha details
+        with full_details), or the error message. With payload, the result is stored in the
+        simulation result cache. on_poll is passed to SimulationPoller.watch."""
+        try:
+            progress = await self._simulation_poller.watch(location_url, on_poll=on_poll)
+        except Exception as e:
+            return {'location': location_url, 'error': str(e)}
+        alpha_id = progress.get('alpha')
+        if not alpha_id:
+            return {'location': location_url, 'error': progress.get('message') or "No alpha ID found in completed simulation"}
+        summary: Dict[str, Any] = {'location': location_url, 'alpha_id': alpha_id}
+        try:
+            details = await self.get_alpha_details(alpha_id)
+            if payload is not None:
+                self._store_simulation_result(payload, alpha_id, details)
+            if full_details:
+                summary['details'] = details
+            else:
+                summary['is'] = details.get('is')
+        except Exception as e:
+            summary['details_error'] = f"Failed to get alpha details: {str(e)}"
+        return summary
+
+    async def resume_jobs(self) -> int:
+        """Resume this account's queued and running jobs (e.g. after a restart).
+
+        A job that was being submitted when the server stopped may or may not exist upstream,
+        so it is marked failed rather than submitted twice.
+        """
+        resumed = 0
+        for job_id in self._job_store.job_ids(self._cache_tag('jobs')):
+            job = self._job_store.load(job_id)
+            if job is None or job['status'] in self._JOB_TERMINAL_STATUSES:
+                continue
+            if job.get('location') or (job['status'] == 'queued' and job.get('payload')):
+                self._spawn_job_task(job)
+                resumed += 1
+            else:
+                self._save_job(job, status='failed', error="Server stopped while the simulation was being submitted")
+        if resumed:
+            self.log(f"Resumed polling for {resumed} simulation jobs", "INFO")
+        return resumed
+
+    def _start_job_resume(self):
+        if self._jobs_resumed:
+            return
+        self._jobs_resumed = True
+        task = asyncio.create_task(detached(self.resume_jobs()))
+        self._job_tasks['_resume'] = task
+        task.add_done_callback(lambda _t: self._job_tasks.pop('_resume', None))
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._job_store.load(job_id)
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        jobs = []
+        for job_id in self._job_store.job_ids(self._cache_tag('jobs')):
+            job = self._job_store.load(job_id)
+            if job is None or (status and job['status'] != status):
+                continue
+            jobs.append(job)
+            if len(jobs) >= limit:
+                break
+        return jobs
+
+    async def wait_for_jobs(self, job_ids: List[str], timeout: float = 600,
+                            return_when: str = "ALL_COMPLETED") -> Dict[str, Any]:
+        """Wait until all (or, with FIRST_COMPLETED, any) of job_ids finish or timeout passes."""
+        deadline = time.time() + timeout
+        while True:
+            jobs = {job_id: self.get_job(job_id) for job_id in job_ids}
+            finished = [job_id for job_id, job in jobs.items()
+                        if job is None or job['status'] in self._JOB_TERMINAL_STATUSES]
+            done = len(finished) == len(job_ids) if return_when == "ALL_COMPLETED" else bool(finished)
+            remaining = deadline - time.time()
+            if done or remaining <= 0:
+                return {
+                    'jobs': [jobs[job_id] or {'id': job_id, 'status': 'unknown'} for job_id in job_ids],
+                    'finished': len(finished),
+                    'pending': len(job_ids) - len(finished),
+                    'timed_out': not done,
+                }
+            local = [self._job_tasks[job_id] for job_id in job_ids
+                     if job_id not in finished and job_id in self._job_tasks]
+            if local and len(local) == len(job_ids) - len(finished):
+                # Every pending job is polled by this process: wake up as soon as one finishes
+                await asyncio.wait([asyncio.shield(task) for task in local], timeout=remaining,
+                                   return_when=asyncio.FIRST_COMPLETED)
+            else:
+                # Jobs owned by another process: re-read the shared store
+                await traced_sleep(min(5.0, remaining), 'wait_for_jobs')
+
     async def get_alpha_details(self, alpha_id: str) -> Dict[str, Any]:
         """Get detailed information about an alpha."""
         await self.ensure_authenticated()
@@ -622,9 +3002,548 @@ class BrainApiClient:
             self.log(f"Failed to get alpha details: {str(e)}", "ERROR")
             raise
     
+    # --- Pagination helpers ---
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given either as seconds or as an HTTP date."""
+        if value is None or value == "":
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            retry_at = parsedate_to_datetime(str(value))
+            return max(0.0, retry_at.timestamp() - time.time())
+        except Exception:
+            return None
+
+    async def _wait_for_pagination_slot(self):
+        """Space page requests by the current adaptive delay (zero while BRAIN is not throttling)."""
+        while True:
+            now = time.monotonic()
+            wait = self._pagination_not_before - now
+            if wait <= 0:
+                self._pagination_not_before = now + self._pagination_delay
+                return
+            await traced_sleep(wait, '_wait_for_pagination_slot')
+
+    def _adjust_pagination_delay(self, throttled: bool, retry_after: Optional[float] = None):
+        if throttled:
+            backoff = max(retry_after or 0.0, self._pagination_delay * 2, 1.0)
+            self._pagination_delay = min(backoff, 30.0)
+            self._pagination_not_before = max(self._pagination_not_before, time.monotonic() + self._pagination_delay)
+            self.log(f"Pagination throttled by BRAIN, spacing pages by {self._pagination_delay:.1f}s", "WARNING")
+        elif self._pagination_delay > 0:
+            # Recover quickly once BRAIN stops pushing back
+            self._pagination_delay = self._pagination_delay / 2 if self._pagination_delay > 0.1 else 0.0
+
+    async def _get_page(self, url: str, params: Dict[str, Any], max_attempts: int = 6) -> Dict[str, Any]:
+        """GET one page of a paginated endpoint, backing off only on 429 / Retry-After."""
+        for attempt in range(max_attempts):
+            await self._wait_for_pagination_slot()
+            response = await self._request('GET', url, params=params)
+            retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+            if response.status_code == 429 and attempt < max_attempts - 1:
+                self._count_retry('get_page', 'rate_limited')
+                self._adjust_pagination_delay(True, retry_after)
+                continue
+            response.raise_for_status()
+            self._adjust_pagination_delay(retry_after is not None and retry_after > 0, retry_after)
+            with span("json.parse", "parse"):
+                return response.json()
+        # Unreachable while the last attempt always returns or raises; never hand back an empty page
+        raise Exception(f"Failed to fetch {url} after {max_attempts} attempts")
+
+    async def _fetch_all_pages(self, url: str, params: Dict[str, Any], limit: int = 50,
+                               on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> List[Dict[str, Any]]:
+        """Fetch every page of a paginated endpoint, preserving page order.
+
+        The first page gives the total count; the remaining offsets are then fetched
+        concurrently, at most BRAIN_PAGINATION_CONCURRENCY at a time. on_page gets each
+        page's results in page order, as soon as that page and all before it have arrived.
+        """
+        first_page = await self._get_page(url, {**params, 'limit': limit, 'offset': 0})
+        all_results = list(first_page.get('results', []))
+        if on_page is not None:
+            on_page(all_results)
+        total_count = first_page.get('count', 0) or 0
+        if len(all_results) < limit or len(all_results) >= total_count:
+            return all_results
+
+        window = asyncio.Semaphore(self._pagination_concurrency)
+
+        async def fetch(offset: int) -> List[Dict[str, Any]]:
+            async with window:
+                page = await self._get_page(url, {**params, 'limit': limit, 'offset': offset})
+                return page.get('results', [])
+
+        tasks = [asyncio.create_task(fetch(offset)) for offset in range(limit, total_count, limit)]
+        try:
+            for task in tasks:
+                page_results = await task
+                all_results.extend(page_results)
+                if on_page is not None:
+                    on_page(page_results)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return all_results
+
+    async def _get_page_cached(self, url: str, params: Dict[str, Any], limit: int, offset: int,
+                               cache_prefix: Optional[str] = None, cache_ttl: int = 86400) -> Dict[str, Any]:
+        """Get one page, reading and writing a per-page cache entry when cache_prefix is given."""
+        page_params = {**params, 'limit': limit, 'offset': offset}
+        cache_key = self._generate_cache_key(f"{cache_prefix}_page", page_params) if cache_prefix else None
+        if cache_key:
+            cached_page = self._get_cached_data(cache_key)
+            if cached_page is not None:
+                return cached_page
+        page = await self._get_page(url, page_params)
+        if cache_key:
+            self._set_cached_data(cache_key, page, ttl=cache_ttl)
+        return page
+
+    async def iter_pages(self, url: str, params: Dict[str, Any], page_size: int = 50, start_offset: int = 0,
+                         max_items: Optional[int] = None, cache_prefix: Optional[str] = None,
+                         cache_ttl: int = 86400) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the pages of a paginated endpoint in order, as they arrive.
+
+        The next page is requested while the caller processes the current one. Stopping early
+        (break inside `async with aclosing(...)`) cancels that prefetch, so no further pages
+        are fetched. With cache_prefix every page is cached as it lands.
+        """
+        offset = start_offset
+        fetched = 0
+        total_count = None
+
+        def schedule(page_offset: int) -> asyncio.Task:
+            limit = page_size if max_items is None else max(1, min(page_size, max_items - fetched))
+            return asyncio.create_task(self._get_page_cached(url, params, limit, page_offset, cache_prefix, cache_ttl))
+
+        next_page = schedule(offset)
+        try:
+            while next_page is not None:
+                page = await next_page
+                next_page = None
+                results = page.get('results', []) if isinstance(page, dict) else []
+                fetched += len(results)
+                if total_count is None and isinstance(page, dict):
+                    total_count = page.get('count')
+
+                exhausted = (
+                    not results
+                    or (total_count is not None and start_offset + fetched >= total_count)
+                    or (max_items is not None and fetched >= max_items)
+                )
+                if not exhausted:
+                    offset += len(results)
+                    next_page = schedule(offset)
+                yield page
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    async def iter_items(self, url: str, params: Dict[str, Any], page_size: int = 50, start_offset: int = 0,
+                         max_items: Optional[int] = None, cache_prefix: Optional[str] = None,
+                         cache_ttl: int = 86400) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the individual results of a paginated endpoint; see iter_pages."""
+        yielded = 0
+        pages = self.iter_pages(url, params, page_size=page_size, start_offset=start_offset,
+                                max_items=max_items, cache_prefix=cache_prefix, cache_ttl=cache_ttl)
+        async with aclosing(pages):
+            async for page in pages:
+                for item in page.get('results', []):
+                    if max_items is not None and yielded >= max_items:
+                        return
+                    yield item
+                    yielded += 1
+
+    @staticmethod
+    def _build_catalog_response(results: List[Dict[str, Any]], note: str) -> Dict[str, Any]:
+        """Shape a full datasets/datafields catalog the way it is cached and returned."""
+        return {
+            'results': results,
+            'count': len(results),
+            'extraNote': note,
+            'from_cache': False,
+            'fetched_at': time.time(),
+        }
+
+    def _fresh_snapshot_version(self) -> Optional[str]:
+        """Newest complete snapshot version, unless it missed three scheduled rebuilds."""
+        if self._catalog_snapshot is None:
+            return None
+        latest = self._catalog_snapshot.latest_version()
+        if latest is None:
+            return None
+        version, completed_at = latest
+        if time.time() - completed_at > 3 * self._catalog_snapshot_interval:
+            return None
+        return version
+
+    @traced("snapshot.read", "cache")
+    async def _load_snapshot_catalog(self, cache_key: str, note: str,
+                                     snapshot_source: Optional[Tuple[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Read a catalog from the offline snapshot, or None when the snapshot cannot serve it."""
+        try:
+            version = await asyncio.to_thread(self._fresh_snapshot_version)
+            if version is None:
+                return None
+            data = await asyncio.to_thread(self._catalog_snapshot.get, cache_key, version)
+            results = data.get('results', []) if data is not None else None
+            if results is None and snapshot_source is not None:
+                source_key, item_filter = snapshot_source
+                source = await asyncio.to_thread(self._catalog_snapshot.get, source_key, version)
+                if source is not None:
+                    results = [item for item in source.get('results', []) if item_filter(item)]
+        except Exception as e:
+            self.log(f"Catalog snapshot read failed for {cache_key}: {str(e)}", "WARNING")
+            return None
+        if results is None:
+            return None
+        return {**self._build_catalog_response(results, note), 'snapshot_version': version}
+
+    def _catalog_snapshot_targets(self, options: Dict[str, Any]) -> List[Tuple[str, str, str, Dict[str, Any], Dict[str, Any]]]:
+        """(kind, cache_key, url, request params, cache params) for every catalog in a snapshot.
+
+        The keys match the default get_datasets/get_datafields calls for each
+        instrument type/region/delay/universe combination.
+        """
+        targets = []
+        for option in options.get('instrument_options', []):
+            for universe in option.get('Universe', []):
+                dataset_params = {
+                    'category': None,
+                    'region': option['Region'],
+                    'delay': option['Delay'],
+                    'universe': universe,
+                    'theme': 'false',
+                }
+                targets.append((
+                    'datasets', self._generate_cache_key('datasets', dataset_params),
+                    f"{self.base_url}/data-sets", dataset_params, dataset_params,
+                ))
+                datafield_cache_params = {
+                    'instrumentType': option['InstrumentType'],
+                    'region': option['Region'],
+                    'delay': option['Delay'],
+                    'universe': universe,
+                    'theme': 'false',
+                    'dataset_id': None,
+                    'data_type': '',
+                }
+                datafield_params = {
+                    'instrumentType': option['InstrumentType'],
+                    'region': option['Region'],
+                    'delay': option['Delay'],
+                    'universe': universe,
+                }
+                targets.append((
+                    'datafields', self._generate_cache_key('datafields', datafield_cache_params),
+                    f"{self.base_url}/data-fields", datafield_params, datafield_cache_params,
+                ))
+        return targets
+
+    async def build_catalog_snapshot(self, force: bool = False) -> Dict[str, Any]:
+        """Download every datasets/datafields catalog into today's snapshot version.
+
+        Skipped when today's version is complete or the newest one is younger than
+        BRAIN_CATALOG_SNAPSHOT_INTERVAL_HOURS, unless force=True. Catalogs are
+        fetched BRAIN_CATALOG_SNAPSHOT_CONCURRENCY at a time into a staging version that
+        replaces today's version only once every catalog has been stored; a failed
+        build leaves the published snapshot as it was.
+        """
+        if self._catalog_snapshot is None:
+            return {'status': 'disabled'}
+        if self._catalog_snapshot_status.get('running'):
+            return {'status': 'running', 'build': dict(self._catalog_snapshot_status)}
+        store = self._catalog_snapshot
+        version = datetime.utcnow().strftime('%Y-%m-%d')
+        # Claim the build before the first await so the scheduler and a manual refresh cannot both start one
+        previous_status = self._catalog_snapshot_status
+        started = time.time()
+        self._catalog_snapshot_status = {'running': True, 'version': version, 'started_at': started}
+        staging = None
+        try:
+            latest = await asyncio.to_thread(store.latest_version)
+            if not force and latest and (latest[0] == version or time.time() - latest[1] < self._catalog_snapshot_interval):
+                self._catalog_snapshot_status = previous_status
+                return {'status': 'up_to_date', 'version': latest[0]}
+
+            await self.ensure_authenticated()
+            options = await self.get_platform_setting_options()
+            targets = self._catalog_snapshot_targets(options)
+            self._catalog_snapshot_status.update({'total': len(targets), 'done': 0, 'failed': 0})
+            staging = await asyncio.to_thread(store.begin, version)
+            window = asyncio.Semaphore(self._catalog_snapshot_concurrency)
+            failures: List[Dict[str, Any]] = []
+
+            async def snapshot_one(kind: str, cache_key: str, url: str, params: Dict[str, Any], cache_params: Dict[str, Any]):
+                async with window:
+                    try:
+                        results = await self._fetch_all_pages(url, params, limit=50)
+                        await asyncio.to_thread(store.put, staging, cache_key, kind, cache_params, {'results': results})
+                        self._catalog_snapshot_status['done'] += 1
+                    except Exception as e:
+                        self._catalog_snapshot_status['failed'] += 1
+                        failures.append({'kind': kind, 'params': cache_params, 'error': str(e)})
+
+            await asyncio.gather(*(snapshot_one(*target) for target in targets))
+            if failures:
+                self.log(f"Catalog snapshot {version}: {len(failures)} of {len(targets)} catalogs failed, not published", "WARNING")
+                return {'status': 'failed', 'version': version, 'catalogs': len(targets), 'failures': failures[:20]}
+            await asyncio.to_thread(store.finish, version)
+            staging = None
+            elapsed = time.time() - started
+            self.log(f"Catalog snapshot {version} complete: {len(targets)} catalogs in {elapsed:.0f}s", "INFO")
+            return {'status': 'complete', 'version': version, 'catalogs': len(targets), 'seconds': round(elapsed, 1)}
+        finally:
+            if staging is not None:
+                try:
+                    store.discard(version)
+                except Exception as e:
+                    self.log(f"Could not discard staged catalog snapshot {version}: {str(e)}", "WARNING")
+            if self._catalog_snapshot_status.get('running'):
+                self._catalog_snapshot_status = {**self._catalog_snapshot_status, 'running': False, 'finished_at': time.time()}
+
+    def start_catalog_snapshot_scheduler(self) -> None:
+        """Start the background loop that rebuilds the snapshot every BRAIN_CATALOG_SNAPSHOT_INTERVAL_HOURS."""
+        if self._catalog_snapshot is None:
+            return
+        if self._catalog_snapshot_task is not None and not self._catalog_snapshot_task.done():
+            return
+        self._catalog_snapshot_task = asyncio.create_task(detached(self._catalog_snapshot_loop()))
+
+    async def run_catalog_snapshot(self, force: bool = False) -> Dict[str, Any]:
+        """build_catalog_snapshot for background use: failures are logged, not raised."""
+        try:
+            return await self.build_catalog_snapshot(force=force)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.log(f"Catalog snapshot failed: {str(e)}", "WARNING")
+            return {'status': 'failed', 'error': str(e)}
+
+    def start_catalog_snapshot(self, force: bool = False) -> None:
+        """Run one snapshot build in the background (no-op while one is running)."""
+        if self._catalog_snapshot_build_task is not None and not self._catalog_snapshot_build_task.done():
+            return
+        self._catalog_snapshot_build_task = asyncio.create_task(detached(self.run_catalog_snapshot(force=force)))
+
+    async def _catalog_snapshot_loop(self):
+        while True:
+            await self.run_catalog_snapshot()
+            # Re-check hourly so a failed or skipped build is retried without waiting a full interval
+            await asyncio.sleep(min(self._catalog_snapshot_interval, 3600))
+
+    def get_catalog_snapshot_info(self) -> Dict[str, Any]:
+        """Snapshot versions on disk plus the progress of the current/last build."""
+        if self._catalog_snapshot is None:
+            return {'enabled': False}
+        return {
+            'enabled': True,
+            'path': str(self._catalog_snapshot.path),
+            'serving_version': self._fresh_snapshot_version(),
+            'versions': self._catalog_snapshot.info(),
+            'build': dict(self._catalog_snapshot_status),
+        }
+
+    async def _query_catalog(self, cache_key: str, url: str, params: Dict[str, Any], note: str,
+                             text_fn, rank_fields_fn, search: Optional[str] = None,
+                             phrase_search: bool = False, rank: bool = False, offset: int = 0,
+                             limit: Optional[int] = None, max_results: Optional[int] = None,
+                             fields: Optional[List[str]] = None,
+                             snapshot_source: Optional[Tuple[str, Any]] = None,
+                             rank_tier_fn=None) -> Dict[str, Any]:
+        """List or search a cached datasets/datafields catalog and page through the results.
+
+        - filter mode: substring matching (keywords AND-ed, or the whole phrase), catalog order
+        - rank=True: field-weighted BM25 (name/id over description), best first, each result
+          carrying 'search_score'; limit defaults to 20. rank_tier_fn(item, search) optionally
+          ranks by match tier first
+        offset/limit page through the filtered or ranked results and fields projects each
+        returned result (only the returned page is copied, never the cached catalog);
+        total_matches counts every match unless max_results caps them. On a cold cache a
+        filter-mode search that needs only the first max_results (or offset + limit) matches
+        returns them as soon as the catalog fill has streamed in enough pages; see
+        _stream_catalog_matches. Catalogs are read from the offline snapshot when it has a
+        fresh copy (snapshot_source optionally names a broader snapshot catalog and a filter
+        to derive this one from it).
+        """
+        offset = max(0, int(offset or 0))
+        fields = normalize_fields(fields)
+        if rank and search and limit is None:
+            limit = 20
+        # A cold filter-mode search only has to stream in enough matches for the requested page
+        stream_matches = max_results
+        if search and not rank and stream_matches is None and limit is not None:
+            stream_matches = offset + limit
+
+        if search:
+            keywords = [kw.strip().lower() for kw in search.split() if kw.strip()]
+
+        def matches_search(item: Dict[str, Any]) -> bool:
+            text = text_fn(item)
+            if phrase_search:
+                return search.lower() in text
+            return all(keyword in text for keyword in keywords)
+
+        if search and stream_matches and not rank and (cache_key in self._catalog_streams or self._peek_cache_ttl(cache_key) is None):
+            matches = await self._stream_catalog_matches(
+                cache_key, url, params, note, text_fn, rank_fields_fn,
+                snapshot_source, matches_search, stream_matches,
+            )
+            if matches is not None:
+                partial = {
+                    'partial_scan': True,
+                    'extraNote': f"Stopped after the first {stream_matches} matches; raise the limit to see more.",
+                }
+                return self._page_catalog_results(partial, matches, offset, limit, False, fields)
+            # The fill completed first: the whole catalog is cached, search it through its index
+
+        async def fetch_catalog() -> Dict[str, Any]:
+            catalog = await self._load_snapshot_catalog(cache_key, note, snapshot_source)
+            if catalog is None:
+                # First page for the count, then the rest concurrently
+                all_results = await self._fetch_all_pages(url, params, limit=50)
+                catalog = self._build_catalog_response(all_results, note)
+            # Build the search index once per cache fill
+            await self._get_search_index(cache_key, catalog, text_fn, rank_fields_fn)
+            return catalog
+
+        # Per-key stampede protection with stale-while-revalidate (1 day TTL)
+        catalog, from_cache = await self._get_or_refresh_cached(cache_key, fetch_catalog, ttl=86400)
+
+        # Searching never mutates the cached catalog: responses are new dicts
+        if not search:
+            return self._page_catalog_results(catalog, catalog.get('results', []), offset, limit, from_cache, fields)
+        index = await self._get_search_index(cache_key, catalog, text_fn, rank_fields_fn)
+        if rank:
+            page, total = await asyncio.to_thread(index.rank, search, offset, limit, rank_tier_fn)
+            if fields:
+                page = [{**project_fields(item, fields), 'search_score': item['search_score']} for item in page]
+            return {
+                **catalog,
+                'results': page,
+                'count': len(page),
+                'total_matches': total,
+                'offset': offset,
+                'limit': limit,
+                'ranked': True,
+                'from_cache': from_cache,
+            }
+        results = index.search_phrase(search) if phrase_search else index.search(search)
+        if max_results:
+            results = results[:max_results]
+        return self._page_catalog_results(catalog, results, offset, limit, from_cache, fields)
+
+    async def _stream_catalog_matches(self, cache_key: str, url: str, params: Dict[str, Any], note: str,
+                                      text_fn, rank_fields_fn, snapshot_source,
+                                      matches_search, max_results: int) -> Optional[List[Dict[str, Any]]]:
+        """First max_results matches of a cold catalog, found while its cache fill is still running.
+
+        The key's single-flight fill (_fill_cache_key) fetches pages concurrently and publishes
+        them in page order as they complete; concurrent narrow searches scan the same stream. The
+        fill always runs to the end in the background and caches the whole catalog. Returns None
+        when the fill finished before enough matches turned up, or when a non-streaming fill of
+        the key is already running (the caller then searches the cached catalog).
+        """
+        stream = self._catalog_streams.get(cache_key)
+        task = self._cache_fill_tasks.get(cache_key)
+        if stream is None:
+            if task is not None and not task.done():
+                return None
+            stream = {'items': [], 'changed': asyncio.Event()}
+
+            def publish(items: List[Dict[str, Any]]):
+                stream['items'].extend(items)
+                changed, stream['changed'] = stream['changed'], asyncio.Event()
+                changed.set()
+
+            async def stream_catalog() -> Dict[str, Any]:
+                catalog = await self._load_snapshot_catalog(cache_key, note, snapshot_source)
+                if catalog is None:
+                    all_results = await self._fetch_all_pages(url, params, limit=50, on_page=publish)
+                    catalog = self._build_catalog_response(all_results, note)
+                await self._get_search_index(cache_key, catalog, text_fn, rank_fields_fn)
+                return catalog
+
+            task = asyncio.create_task(self._fill_cache_key(cache_key, stream_catalog, 86400, wait_for_peer=True))
+            self._track_cache_fill(cache_key, task)
+            self._catalog_streams[cache_key] = stream
+
+            def _done(_t: asyncio.Task):
+                if self._catalog_streams.get(cache_key) is stream:
+                    del self._catalog_streams[cache_key]
+                stream['changed'].set()
+
+            task.add_done_callback(_done)
+        elif task is None:
+            return None
+
+        items = stream['items']
+        matches: List[Dict[str, Any]] = []
+        scanned = 0
+        while True:
+            changed = stream['changed']
+            while scanned < len(items):
+                item = items[scanned]
+                scanned += 1
+                if matches_search(item):
+                    matches.append(item)
+                    if len(matches) >= max_results:
+                        return matches
+            if task.done():
+                break
+            waiter = asyncio.ensure_future(changed.wait())
+            try:
+                await asyncio.wait([task, waiter], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiter.cancel()
+        # Surface a failed fill to the caller
+        await asyncio.shield(task)
+        return None
+
+    @staticmethod
+    def _page_catalog_results(base: Dict[str, Any], results: List[Dict[str, Any]], offset: int,
+                              limit: Optional[int], from_cache: bool,
+                              fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Apply offset/limit and field projection to catalog results; paging metadata is only added when paging."""
+        if not offset and limit is None:
+            if fields:
+                results = [project_fields(item, fields) for item in results]
+            return {**base, 'results': results, 'count': len(results), 'from_cache': from_cache}
+        page = results[offset:offset + limit] if limit is not None else results[offset:]
+        if fields:
+            page = [project_fields(item, fields) for item in page]
+        return {
+            **base,
+            'results': page,
+            'count': len(page),
+            'total_matches': len(results),
+            'offset': offset,
+            'limit': limit,
+            'from_cache': from_cache,
+        }
+
     async def get_datasets(self, category: Optional[str] = None, region: str = "USA",
-                          delay: int = 1, universe: str = "TOP3000", theme: str = "false", search: Optional[str] = None) -> Dict[str, Any]:
-        """Get available datasets with Redis caching (1 day TTL) and fetch all data at once."""
+                          delay: int = 1, universe: str = "TOP3000", theme: str = "false", search: Optional[str] = None,
+                          max_results: Optional[int] = None, rank: bool = False, offset: int = 0,
+                          limit: Optional[int] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get available datasets with Redis caching (1 day TTL) and fetch all data at once.
+
+        search matches the phrase against each dataset's id, name, description, category,
+        subcategory and themes (a lower-cased text column built once per cache fill).
+        With rank=True the top matches are returned best first with a 'search_score':
+        exact id/name matches, then prefix, then partial id/name, then category matches,
+        BM25 (name/id weighted over description) within each group. offset/limit page
+        through the results and fields (e.g. ["id", "name", "category.name"]) keeps only
+        those keys of each result.
+        With both search and max_results, a cache miss returns as soon as max_results matches
+        have been streamed in; the single cache fill finishes in the background.
+        """
         await self.ensure_authenticated()
         
         try:
@@ -637,79 +3556,12 @@ class BrainApiClient:
                 'theme': theme
             }
             cache_key = self._generate_cache_key('datasets', cache_params)
-            
-            # Try to get from cache
-            cached_data = self._get_cached_data(cache_key)
-            if cached_data:
-                # Apply search filter if needed
-                if search:
-                    filtered_results = [
-                        item for item in cached_data.get('results', [])
-                        if search.lower() in json.dumps(item).lower()
-                    ]
-                    return {
-                        **cached_data,
-                        'results': filtered_results,
-                        'count': len(filtered_results),
-                        'from_cache': True
-                    }
-                return {**cached_data, 'from_cache': True}
-            
-            # Fetch all data from API (pagination loop)
-            all_results = []
-            offset = 0
-            limit = 50
-            total_count = None
-            
-            while True:
-                params = {
-                    'category': category,
-                    'region': region,
-                    'delay': delay,
-                    'universe': universe,
-                    'theme': theme,
-                    'limit': limit,
-                    'offset': offset
-                }
-                
-                response = await self._request('GET', f"{self.base_url}/data-sets", params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                results = data.get('results', [])
-                all_results.extend(results)
-                
-                if total_count is None:
-                    total_count = data.get('count', 0)
-                
-                # Break if we've fetched all data
-                if len(results) < limit or len(all_results) >= total_count:
-                    break
-                
-                offset += limit
-            
-            # Prepare complete response
-            complete_data = {
-                'results': all_results,
-                'count': len(all_results),
-                'extraNote': "if your returned result is 0, you may want to check your parameter by using get_platform_setting_options tool to got correct parameter",
-                'from_cache': False
-            }
-            
-            # Cache the complete data (1 day TTL)
-            self._set_cached_data(cache_key, complete_data, ttl=86400)
-            
-            # Apply search filter if needed
-            if search:
-                filtered_results = [
-                    item for item in all_results
-                    if search.lower() in json.dumps(item).lower()
-                ]
-                complete_data['results'] = filtered_results
-                complete_data['count'] = len(filtered_results)
-            
-            return complete_data
-            
+            return await self._query_catalog(
+                cache_key, f"{self.base_url}/data-sets", cache_params, self._DATASETS_NOTE,
+                dataset_search_text, dataset_rank_fields, search=search, phrase_search=True, rank=rank,
+                offset=offset, limit=limit, max_results=max_results, fields=fields,
+                rank_tier_fn=dataset_match_rank,
+            )
         except Exception as e:
             self.log(f"Failed to get datasets: {str(e)}", "ERROR")
             raise
@@ -717,90 +3569,33 @@ class BrainApiClient:
     async def get_datafields(self, instrument_type: str = "EQUITY", region: str = "USA",
                             delay: int = 1, universe: str = "TOP3000", theme: str = "false",
                             dataset_id: Optional[str] = None, data_type: str = "",
-                            search: Optional[str] = None) -> Dict[str, Any]:
+                            search: Optional[str] = None, max_results: Optional[int] = None,
+                            rank: bool = False, offset: int = 0, limit: Optional[int] = None,
+                            fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """Get available data fields with Redis caching (1 day TTL) and fetch all data at once.
         
+        With both search and max_results, a cache miss returns as soon as max_results matches
+        have been streamed in instead of waiting for the whole catalog; the single cache fill
+        finishes in the background.
+        
         Search supports fuzzy matching across multiple fields:
         - Searches in: name, description, dataset.name, dataset.vendor, id
         - Multiple keywords (space-separated) use AND logic
         - Case-insensitive matching
         
+        With rank=True the top matches are returned best first with a 'search_score'
+        (BM25 with prefix/substring term matching, name/id weighted over description);
+        keywords are then OR-ed, items matching more of them score higher.
+        offset/limit page through the results and fields (e.g. ["id", "type", "coverage"])
+        keeps only those keys of each result; dotted names select nested keys ("dataset.id").
+        
         Examples:
         - search="price" -> matches any field containing "price"
         - search="stock volume" -> matches fields containing both "stock" AND "volume"
         """
         await self.ensure_authenticated()
         
-        # Redis-based distributed lock for concurrency control (limit to 1)
-        lock_key = "lock:get_datafields"
-        lock_acquired = False
-        lock_timeout = 300  # Lock expires after 5 minutes to prevent deadlock
-        max_wait_time = 600  # Maximum wait time for acquiring lock (10 minutes)
-        wait_interval = 2  # Check every 2 seconds
-        
-        if self.redis_client:
-            start_wait = time.time()
-            while time.time() - start_wait < max_wait_time:
-                try:
-                    # Try to acquire lock with NX (only set if not exists) and EX (expiration)
-                    lock_acquired = self.redis_client.set(lock_key, "locked", ex=lock_timeout, nx=True)
-                    if lock_acquired:
-                        self.log(f"Acquired Redis lock for get_datafields", "INFO")
-                        break
-                    else:
-                        # Lock is held by another process, wait and retry
-                        ttl = self.redis_client.ttl(lock_key)
-                        self.log(f"Waiting for get_datafields lock (TTL: {ttl}s)...", "INFO")
-                        await asyncio.sleep(wait_interval)
-                except Exception as e:
-                    self.log(f"Redis lock acquisition failed: {str(e)}, proceeding without lock", "WARNING")
-                    break
-            
-            if not lock_acquired and self.redis_client:
-                self.log(f"Could not acquire get_datafields lock after {max_wait_time}s, proceeding anyway", "WARNING")
-        
         try:
-            def fuzzy_search_filter(item: Dict[str, Any], search_term: str) -> bool:
-                """Enhanced fuzzy search across key fields with multi-keyword support."""
-                if not search_term:
-                    return True
-                
-                # Split search term into keywords (space-separated) for AND logic
-                keywords = [kw.strip().lower() for kw in search_term.split() if kw.strip()]
-                if not keywords:
-                    return True
-                
-                # Extract searchable fields
-                searchable_text_parts = []
-                
-                # Add field name
-                if item.get('name'):
-                    searchable_text_parts.append(str(item['name']))
-                
-                # Add field description
-                if item.get('description'):
-                    searchable_text_parts.append(str(item['description']))
-                
-                # Add field ID
-                if item.get('id'):
-                    searchable_text_parts.append(str(item['id']))
-                
-                # Add dataset information
-                dataset = item.get('dataset', {})
-                if isinstance(dataset, dict):
-                    if dataset.get('name'):
-                        searchable_text_parts.append(str(dataset['name']))
-                    if dataset.get('vendor'):
-                        searchable_text_parts.append(str(dataset['vendor']))
-                    if dataset.get('id'):
-                        searchable_text_parts.append(str(dataset['id']))
-                
-                # Combine all searchable text
-                combined_text = ' '.join(searchable_text_parts).lower()
-                
-                # Check if ALL keywords match (AND logic)
-                return all(keyword in combined_text for keyword in keywords)
-            
             # Generate cache key from parameters (excluding search for cache key)
             cache_params = {
                 'instrumentType': instrument_type,
@@ -813,158 +3608,63 @@ class BrainApiClient:
             }
             cache_key = self._generate_cache_key('datafields', cache_params)
             
-            # Try to get from cache
-            cached_data = self._get_cached_data(cache_key)
-            if cached_data:
-                # Apply fuzzy search filter if needed
-                if search:
-                    filtered_results = [
-                        item for item in cached_data.get('results', [])
-                        if fuzzy_search_filter(item, search)
-                    ]
-                    return {
-                        **cached_data,
-                        'results': filtered_results,
-                        'count': len(filtered_results),
-                        'from_cache': True
-                    }
-                return {**cached_data, 'from_cache': True}
-            
-            # Fetch all data from API (pagination loop)
-            all_results = []
-            offset = 0
-            limit = 50
-            total_count = None
-            
-            while True:
-                params = {
-                    'instrumentType': instrument_type,
-                    'region': region,
-                    'delay': delay,
-                    'universe': universe,
-                    'limit': limit,
-                    'offset': offset
-                }
-                
-                if data_type != 'ALL' and data_type:
-                    params['type'] = data_type
-                
-                if dataset_id:
-                    params['dataset.id'] = dataset_id
-                
-                response = await self._request('GET', f"{self.base_url}/data-fields", params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                results = data.get('results', [])
-                # 等待2秒
-                await asyncio.sleep(2)
-                all_results.extend(results)
-                
-                if total_count is None:
-                    total_count = data.get('count', 0)
-                
-                # Break if we've fetched all data
-                if len(results) < limit or len(all_results) >= total_count:
-                    break
-                
-                offset += limit
-            
-            # Prepare complete response
-            complete_data = {
-                'results': all_results,
-                'count': len(all_results),
-                'extraNote': "if your returned result is 0, you may want to check your parameter by using get_platform_setting_options tool to got correct parameter. Search supports fuzzy matching with multiple keywords (space-separated, AND logic).",
-                'from_cache': False
+            params = {
+                'instrumentType': instrument_type,
+                'region': region,
+                'delay': delay,
+                'universe': universe,
             }
             
-            # Cache the complete data (1 day TTL)
-            self._set_cached_data(cache_key, complete_data, ttl=86400)
+            if data_type != 'ALL' and data_type:
+                params['type'] = data_type
             
-            # Apply fuzzy search filter if needed
-            if search:
-                filtered_results = [
-                    item for item in all_results
-                    if fuzzy_search_filter(item, search)
-                ]
-                complete_data['results'] = filtered_results
-                complete_data['count'] = len(filtered_results)
+            if dataset_id:
+                params['dataset.id'] = dataset_id
             
-            return complete_data
+            # The snapshot stores whole region/delay/universe catalogs; narrower ones are filtered from them
+            snapshot_source = None
+            if dataset_id or data_type:
+                source_key = self._generate_cache_key('datafields', {**cache_params, 'dataset_id': None, 'data_type': ''})
+
+                def in_selection(item: Dict[str, Any]) -> bool:
+                    dataset = item.get('dataset')
+                    if dataset_id and not (isinstance(dataset, dict) and dataset.get('id') == dataset_id):
+                        return False
+                    return not data_type or data_type == 'ALL' or item.get('type') == data_type
+
+                snapshot_source = (source_key, in_selection)
             
+            return await self._query_catalog(
+                cache_key, f"{self.base_url}/data-fields", params, self._DATAFIELDS_NOTE,
+                datafield_search_text, datafield_rank_fields, search=search, rank=rank,
+                offset=offset, limit=limit, max_results=max_results, fields=fields,
+                snapshot_source=snapshot_source,
+            )
         except Exception as e:
             self.log(f"Failed to get datafields: {str(e)}", "ERROR")
             raise
-        finally:
-            # Release Redis lock if acquired
-            if lock_acquired and self.redis_client:
-                try:
-                    self.redis_client.delete(lock_key)
-                    self.log(f"Released Redis lock for get_datafields", "INFO")
-                except Exception as e:
-                    self.log(f"Failed to release Redis lock: {str(e)}", "WARNING")
     
+    def _recordset_json(self, response: httpx.Response, what: str, alpha_id: str) -> Dict[str, Any]:
+        """JSON of a recordset/correlation response once its retry policy is done; {} while
+        BRAIN still has not computed it."""
+        response.raise_for_status()
+        if not (response.text or "").strip():
+            self.log(f"Empty {what} response for {alpha_id}", "WARNING")
+            return {}
+        try:
+            return response.json() or {}
+        except ValueError as parse_err:
+            self.log(f"{what} JSON parse failed for {alpha_id}: {parse_err}", "WARNING")
+            return {}
+
     async def get_alpha_pnl(self, alpha_id: str) -> Dict[str, Any]:
-        """Get PnL data for an alpha with retry logic."""
+        """Get PnL data for an alpha (retried while empty by the 'alpha_recordset' policy)."""
         await self.ensure_authenticated()
-        
-        max_retries = 5
-        retry_delay = 2  # seconds
-        
-        for attempt in range(max_retries):
-            try:
-                self.log(f"Attempting to get PnL for alpha {alpha_id} (attempt {attempt + 1}/{max_retries})", "INFO")
-                
-                response = await self._request('GET', f"{self.base_url}/alphas/{alpha_id}/recordsets/pnl")
-                response.raise_for_status()
-                
-                text = (response.text or "").strip()
-                if not text:
-                    if attempt < max_retries - 1:
-                        self.log(f"Empty PnL response for {alpha_id}, retrying in {retry_delay} seconds...", "WARNING")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay *= 1.5
-                        continue
-                    else:
-                        self.log(f"Empty PnL response after {max_retries} attempts for {alpha_id}", "WARNING")
-                        return {}
-                
-                try:
-                    pnl_data = response.json()
-                    if pnl_data:
-                        self.log(f"Successfully retrieved PnL data for alpha {alpha_id}", "SUCCESS")
-                        return pnl_data
-                    else:
-                        if attempt < max_retries - 1:
-                            self.log(f"Empty PnL JSON for {alpha_id}, retrying in {retry_delay} seconds...", "WARNING")
-                            await asyncio.sleep(retry_delay)
-                            retry_delay *= 1.5
-                            continue
-                        else:
-                            self.log(f"Empty PnL JSON after {max_retries} attempts for {alpha_id}", "WARNING")
-                            return {}
-                            
-                except json.JSONDecodeError as parse_err:
-                    if attempt < max_retries - 1:
-                        self.log(f"PnL JSON parse failed for {alpha_id} (attempt {attempt + 1}), retrying in {retry_delay} seconds...", "WARNING")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay *= 1.5
-                        continue
-                    else:
-                        self.log(f"PnL JSON parse failed for {alpha_id} after {max_retries} attempts: {parse_err}", "WARNING")
-                        return {}
-                        
-            except requests.RequestException as e:
-                if attempt < max_retries - 1:
-                    self.log(f"Failed to get alpha PnL for {alpha_id} (attempt {attempt + 1}), retrying in {retry_delay} seconds: {str(e)}", "WARNING")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 1.5
-                    continue
-                else:
-                    self.log(f"Failed to get alpha PnL for {alpha_id} after {max_retries} attempts: {str(e)}", "ERROR")
-                    raise
-        
-        return {}
+        response = await self._request('GET', f"{self.base_url}/alphas/{alpha_id}/recordsets/pnl")
+        pnl_data = self._recordset_json(response, "PnL", alpha_id)
+        if pnl_data:
+            self.log(f"Successfully retrieved PnL data for alpha {alpha_id}", "SUCCESS")
+        return pnl_data
     
     async def get_user_alphas(
         self,
@@ -978,7 +3678,11 @@ class BrainApiClient:
         order: Optional[str] = None,
         hidden: Optional[bool] = None,
     ) -> Dict[str, Any]:
-        """Get user's alphas with advanced filtering and Redis caching (1 day TTL)."""
+        """Get user's alphas with advanced filtering and Redis caching (1 day TTL).
+
+        Listings are tagged 'alphas': creating, submitting or editing alphas through this
+        client invalidates them, so cached pages never miss those changes.
+        """
         await self.ensure_authenticated()
         
         try:
@@ -1002,17 +3706,28 @@ class BrainApiClient:
                 params["hidden"] = str(hidden).lower()
             
             # Generate cache key from all parameters
-            cache_key = self._generate_cache_key('user_alphas', params)
+            cache_key = self._tagged_cache_key('user_alphas', params, 'alphas')
             
             # Try to get from cache
             cached_data = self._get_cached_data(cache_key)
             if cached_data:
                 return {**cached_data, 'from_cache': True}
             
-            # Fetch from API
-            response = await self._request('GET', f"{self.base_url}/users/self/alphas", params=params)
-            response.raise_for_status()
-            data = response.json()
+            # Fetch from API (BRAIN caps page size, so larger limits are streamed page by page)
+            if limit <= self._LISTING_PAGE_SIZE:
+                response = await self._request('GET', f"{self.base_url}/users/self/alphas", params=params)
+                response.raise_for_status()
+                data = response.json()
+            else:
+                page_params = {k: v for k, v in params.items() if k not in ('limit', 'offset')}
+                data = {'count': None, 'results': []}
+                pages = self.iter_pages(f"{self.base_url}/users/self/alphas", page_params,
+                                        page_size=self._LISTING_PAGE_SIZE, start_offset=offset, max_items=limit)
+                async with aclosing(pages):
+                    async for page in pages:
+                        if data['count'] is None:
+                            data['count'] = page.get('count')
+                        data['results'].extend(page.get('results', []))
             
             # Add metadata
             data['from_cache'] = False
@@ -1033,6 +3748,7 @@ class BrainApiClient:
         try:
             response = await self._request('POST', f"{self.base_url}/alphas/{alpha_id}/submit")
             response.raise_for_status()
+            self.invalidate_cache_tag('alphas')
             return True
         except Exception as e:
             self.log(f"Failed to submit alpha: {str(e)}", "ERROR")
@@ -1222,9 +3938,16 @@ class BrainApiClient:
         await self.ensure_authenticated()
         
         try:
-            response = await self._request('GET', f"{self.base_url}/operators")
-            response.raise_for_status()
-            return response.json()
+            async def fetch_operators() -> Any:
+                response = await self._request('GET', f"{self.base_url}/operators")
+                response.raise_for_status()
+                return response.json()
+
+            # The operator list rarely changes: cache it for 1 day
+            operators, _ = await self._get_or_refresh_cached(
+                self._generate_cache_key('operators', {}), fetch_operators, ttl=86400
+            )
+            return operators
         except Exception as e:
             self.log(f"Failed to get operators: {str(e)}", "ERROR")
             raise
@@ -1346,9 +4069,20 @@ class BrainApiClient:
             params = {"limit": limit, "offset": offset}
             params = {k: v for k, v in params.items() if v is not None}
             
-            response = await self._request('GET', f"{self.base_url}/users/self/messages", params=params)
-            response.raise_for_status()
-            messages_data = response.json()
+            if limit is None or limit <= self._LISTING_PAGE_SIZE:
+                response = await self._request('GET', f"{self.base_url}/users/self/messages", params=params)
+                response.raise_for_status()
+                messages_data = response.json()
+            else:
+                # Larger limits are fetched page by page
+                messages_data = {'count': None, 'results': []}
+                pages = self.iter_pages(f"{self.base_url}/users/self/messages", {},
+                                        page_size=self._LISTING_PAGE_SIZE, start_offset=offset, max_items=limit)
+                async with aclosing(pages):
+                    async for page in pages:
+                        if messages_data['count'] is None:
+                            messages_data['count'] = page.get('count')
+                        messages_data['results'].extend(page.get('results', []))
             
             # Process descriptions and attachments
             for msg in messages_data.get("results", []):
@@ -1405,185 +4139,31 @@ class BrainApiClient:
                     'article_id': article_id,
                     'include_comments': include_comments,
                 }
-            return await forum_client.read_full_forum_post(email, password, article_id, include_comments)
-        except Exception as e:
-            self.log(f"Failed to read forum post: {str(e)}", "ERROR")
-            raise
-    
-    async def get_alpha_yearly_stats(self, alpha_id: str) -> Dict[str, Any]:
-        """Get yearly statistics for an alpha."""
-        await self.ensure_authenticated()
-        
-        max_retries = 5
-        retry_delay = 2
-        
-        for attempt in range(max_retries):
-            try:
-                self.log(f"Attempting to get yearly stats for alpha {alpha_id} (attempt {attempt + 1}/{max_retries})", "INFO")
-                
-                response = await self._request('GET', f"{self.base_url}/alphas/{alpha_id}/recordsets/yearly-stats")
-                response.raise_for_status()
-                
-                text = (response.text or "").strip()
-                if not text:
-                    if attempt < max_retries - 1:
-                        self.log(f"Empty yearly stats response for {alpha_id}, retrying...", "WARNING")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay *= 1.5
-                        continue
-                    else:
-                        return {}
-                
-                try:
-                    stats_data = response.json()
-                    if stats_data:
-                        return stats_data
-                    else:
-                        if attempt < max_retries - 1:
-                            self.log(f"Empty yearly stats JSON for {alpha_id}, retrying...", "WARNING")
-                            await asyncio.sleep(retry_delay)
-                            retry_delay *= 1.5
-                            continue
-                        else:
-                            return {}
-                            
-                except json.JSONDecodeError as parse_err:
-                    if attempt < max_retries - 1:
-                        self.log(f"Yearly stats JSON parse failed for {alpha_id}, retrying...", "WARNING")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay *= 1.5
-                        continue
-                    else:
-                        raise
-                        
-            except requests.RequestException as e:
-                if attempt < max_retries - 1:
-                    self.log(f"Failed to get yearly stats for {alpha_id}, retrying: {e}", "WARNING")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 1.5
-                    continue
-                else:
-                    raise
-        
-        return {}
-        
-    async def get_production_correlation(self, alpha_id: str) -> Dict[str, Any]:
-        """Get production correlation data for an alpha."""
-        await self.ensure_authenticated()
-        
-        max_retries = 50
-        retry_delay = 5
-        
-        for attempt in range(max_retries):
-            try:
-                self.log(f"Attempting to get production correlation for alpha {alpha_id} (attempt {attempt + 1}/{max_retries})", "INFO")
-                
-                response = await self._request('GET', f"{self.base_url}/alphas/{alpha_id}/correlations/prod")
-                response.raise_for_status()
-                
-                # Check if response has content
-                text = (response.text or "").strip()
-                if not text:
-                    if attempt < max_retries - 1:
-                        self.log(f"Empty production correlation response for {alpha_id}, retrying in {retry_delay} seconds...", "WARNING")
-                        await asyncio.sleep(retry_delay)
-                        continue
-                    else:
-                        self.log(f"Empty production correlation response after {max_retries} attempts for {alpha_id}", "WARNING")
-                        return {}
-                
-                try:
-                    corr_data = response.json()
-                    if corr_data:
-                        return corr_data
-                    else:
-                        if attempt < max_retries - 1:
-                            self.log(f"Empty production correlation JSON for {alpha_id}, retrying...", "WARNING")
-                            await asyncio.sleep(retry_delay)
-                            retry_delay *= 1.5
-                            continue
-                        else:
-                            return {}
-                            
-                except json.JSONDecodeError:
-                    if attempt < max_retries - 1:
-                        self.log(f"Production correlation JSON parse failed for {alpha_id}, retrying...", "WARNING")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay *= 1.5
-                        continue
-                    else:
-                        raise
-                        
-            except requests.RequestException as e:
-                if attempt < max_retries - 1:
-                    self.log(f"Failed to get production correlation for {alpha_id}, retrying: {e}", "WARNING")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 1.5
-                    continue
-                else:
-                    raise
+            return await forum_client.read_full_forum_post(email, password, article_id, include_comments)
+        except Exception as e:
+            self.log(f"Failed to read forum post: {str(e)}", "ERROR")
+            raise
+    
+    async def get_alpha_yearly_stats(self, alpha_id: str) -> Dict[str, Any]:
+        """Get yearly statistics for an alpha."""
+        await self.ensure_authenticated()
+        response = await self._request('GET', f"{self.base_url}/alphas/{alpha_id}/recordsets/yearly-stats")
+        return self._recordset_json(response, "yearly stats", alpha_id)
         
-        return {}
+    async def get_production_correlation(self, alpha_id: str, progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Get production correlation data for an alpha (waited for by the 'alpha_correlation' policy)."""
+        await self.ensure_authenticated()
+        response = await self._request('GET', f"{self.base_url}/alphas/{alpha_id}/correlations/prod", progress=progress)
+        return self._recordset_json(response, "production correlation", alpha_id)
 
-    async def get_self_correlation(self, alpha_id: str) -> Dict[str, Any]:
-        """Get self correlation data for an alpha."""
+    async def get_self_correlation(self, alpha_id: str, progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
+        """Get self correlation data for an alpha (waited for by the 'alpha_correlation' policy)."""
         await self.ensure_authenticated()
-        
-        max_retries = 50
-        retry_delay = 5
-        
-        for attempt in range(max_retries):
-            try:
-                self.log(f"Attempting to get self correlation for alpha {alpha_id} (attempt {attempt + 1}/{max_retries})", "INFO")
-                
-                response = await self._request('GET', f"{self.base_url}/alphas/{alpha_id}/correlations/self")
-                response.raise_for_status()
-                
-                # Check if response has content
-                text = (response.text or "").strip()
-                if not text:
-                    if attempt < max_retries - 1:
-                        self.log(f"Empty self correlation response for {alpha_id}, retrying in {retry_delay} seconds...", "WARNING")
-                        await asyncio.sleep(retry_delay)
-                        continue
-                    else:
-                        self.log(f"Empty self correlation response after {max_retries} attempts for {alpha_id}", "WARNING")
-                        return {}
-                
-                try:
-                    corr_data = response.json()
-                    if corr_data:
-                        return corr_data
-                    else:
-                        if attempt < max_retries - 1:
-                            self.log(f"Empty self correlation JSON for {alpha_id}, retrying...", "WARNING")
-                            await asyncio.sleep(retry_delay)
-                            retry_delay *= 1.5
-                            continue
-                        else:
-                            return {}
-                            
-                except json.JSONDecodeError:
-                    if attempt < max_retries - 1:
-                        self.log(f"Self correlation JSON parse failed for {alpha_id}, retrying...", "WARNING")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay *= 1.5
-                        continue
-                    else:
-                        raise
-                        
-            except requests.RequestException as e:
-                if attempt < max_retries - 1:
-                    self.log(f"Failed to get self correlation for {alpha_id}, retrying: {e}", "WARNING")
-                    await asyncio.sleep(retry_delay)
-                    retry_delay *= 1.5
-                    continue
-                else:
-                    raise
-        
-        return {}
+        response = await self._request('GET', f"{self.base_url}/alphas/{alpha_id}/correlations/self", progress=progress)
+        return self._recordset_json(response, "self correlation", alpha_id)
 
-    async def check_correlation(self, alpha_id: str, correlation_type: str = "production", threshold: float = 0.7) -> Dict[str, Any]:
+    async def check_correlation(self, alpha_id: str, correlation_type: str = "production", threshold: float = 0.7,
+                                progress: Optional[ToolProgress] = None) -> Dict[str, Any]:
         """ Only where all IS metrics PASS to Check alpha correlation, Check alpha correlation against production alphas, self alphas, or both."""
         await self.ensure_authenticated()
         
@@ -1622,7 +4202,7 @@ class BrainApiClient:
             
             for check_type in check_types:
                 if check_type == "production":
-                    correlation_data = await self.get_production_correlation(alpha_id)
+                    correlation_data = await self.get_production_correlation(alpha_id, progress)
                     
                     if (
                         correlation_data
@@ -1652,7 +4232,7 @@ class BrainApiClient:
                         results['all_passed'] = passes_check
                         return results
                 elif check_type == "self":
-                    correlation_data = await self.get_self_correlation(alpha_id)
+                    correlation_data = await self.get_self_correlation(alpha_id, progress)
                 else:
                     continue
                 
@@ -1727,6 +4307,7 @@ class BrainApiClient:
             
             response = await self._request('PATCH', f"{self.base_url}/alphas/{alpha_id}", json=payload)
             response.raise_for_status()
+            self.invalidate_cache_tag('alphas')
             return response.json()
         except Exception as e:
             self.log(f"Failed to set alpha properties: {str(e)}", "ERROR")
@@ -1856,75 +4437,71 @@ class BrainApiClient:
             # Generate cache key (no parameters needed as this endpoint returns fixed platform settings)
             cache_key = self._generate_cache_key('platform_settings', {})
             
-            # Try to get from cache
-            cached_data = self._get_cached_data(cache_key)
-            if cached_data:
-                return {**cached_data, 'from_cache': True}
-            
-            # Use OPTIONS method on simulations endpoint to get configuration options
-            response = await self._request('OPTIONS', f"{self.base_url}/simulations")
-            response.raise_for_status()
-            
-            # Parse the settings structure from the response
-            settings_data = response.json()
-            settings_options = settings_data['actions']['POST']['settings']['children']
-            
-            # Extract instrument configuration options
-            instrument_type_data = {}
-            region_data = {}
-            universe_data = {}
-            delay_data = {}
-            neutralization_data = {}
+            async def fetch_settings() -> Dict[str, Any]:
+                # Use OPTIONS method on simulations endpoint to get configuration options
+                response = await self._request('OPTIONS', f"{self.base_url}/simulations")
+                response.raise_for_status()
             
-            # Parse each setting type
-            for key, setting in settings_options.items():
-                if setting['type'] == 'choice':
-                    if setting['label'] == 'Instrument type':
-                        instrument_type_data = setting['choices']
-                    elif setting['label'] == 'Region':
-                        region_data = setting['choices']['instrumentType']
-                    elif setting['label'] == 'Universe':
-                        universe_data = setting['choices']['instrumentType']
-                    elif setting['label'] == 'Delay':
-                        delay_data = setting['choices']['instrumentType']
-                    elif setting['label'] == 'Neutralization':
-                        neutralization_data = setting['choices']['instrumentType']
+                # Parse the settings structure from the response
+                settings_data = response.json()
+                settings_options = settings_data['actions']['POST']['settings']['children']
             
-            # Build comprehensive instrument options
-            data_list = []
+                # Extract instrument configuration options
+                instrument_type_data = {}
+                region_data = {}
+                universe_data = {}
+                delay_data = {}
+                neutralization_data = {}
             
-            for instrument_type in instrument_type_data:
-                for region in region_data[instrument_type['value']]:
-                    for delay in delay_data[instrument_type['value']]['region'][region['value']]:
-                        row = {
-                            'InstrumentType': instrument_type['value'],
-                            'Region': region['value'],
-                            'Delay': delay['value']
-                        }
-                        row['Universe'] = [
-                            item['value'] for item in universe_data[instrument_type['value']]['region'][region['value']]
-                        ]
-                        row['Neutralization'] = [
-                            item['value'] for item in neutralization_data[instrument_type['value']]['region'][region['value']]
-                        ]
-                        data_list.append(row)
+                # Parse each setting type
+                for key, setting in settings_options.items():
+                    if setting['type'] == 'choice':
+                        if setting['label'] == 'Instrument type':
+                            instrument_type_data = setting['choices']
+                        elif setting['label'] == 'Region':
+                            region_data = setting['choices']['instrumentType']
+                        elif setting['label'] == 'Universe':
+                            universe_data = setting['choices']['instrumentType']
+                        elif setting['label'] == 'Delay':
+                            delay_data = setting['choices']['instrumentType']
+                        elif setting['label'] == 'Neutralization':
+                            neutralization_data = setting['choices']['instrumentType']
             
-            # Return structured data
-            result = {
-                'instrument_options': data_list,
-                'total_combinations': len(data_list),
-                'instrument_types': [item['value'] for item in instrument_type_data],
-                'regions_by_type': {
-                    item['value']: [r['value'] for r in region_data[item['value']]]
-                    for item in instrument_type_data
-                },
-                'from_cache': False
-            }
+                # Build comprehensive instrument options
+                data_list = []
             
-            # Cache the data (1 day TTL)
-            self._set_cached_data(cache_key, result, ttl=86400)
+                for instrument_type in instrument_type_data:
+                    for region in region_data[instrument_type['value']]:
+                        for delay in delay_data[instrument_type['value']]['region'][region['value']]:
+                            row = {
+                                'InstrumentType': instrument_type['value'],
+                                'Region': region['value'],
+                                'Delay': delay['value']
+                            }
+                            row['Universe'] = [
+                                item['value'] for item in universe_data[instrument_type['value']]['region'][region['value']]
+                            ]
+                            row['Neutralization'] = [
+                                item['value'] for item in neutralization_data[instrument_type['value']]['region'][region['value']]
+                            ]
+                            data_list.append(row)
             
-            return result
+                # Return structured data
+                result = {
+                    'instrument_options': data_list,
+                    'total_combinations': len(data_list),
+                    'instrument_types': [item['value'] for item in instrument_type_data],
+                    'regions_by_type': {
+                        item['value']: [r['value'] for r in region_data[item['value']]]
+                        for item in instrument_type_data
+                    },
+                    'from_cache': False
+                }
+                return result
+
+            # Cached for 1 day and kept warm by the warm-up scheduler
+            result, from_cache = await self._get_or_refresh_cached(cache_key, fetch_settings, ttl=86400)
+            return {**result, 'from_cache': from_cache}
             
         except Exception as e:
             self.log(f"Failed to get instrument options: {str(e)}", "ERROR")
@@ -2090,9 +4667,65 @@ mcp = FastMCP(
     streamable_http_path=_MCP_STREAMABLE_HTTP_PATH,
 )
 
+
+def instrumented_tool(*args, **kwargs):
+    """Register an MCP tool via mcp.tool() that records call counts and latency per tool for /metrics and traces each call.
+
+    The undecorated function is returned, so tools calling each other directly are not counted twice.
+    """
+    register = mcp.tool(*args, **kwargs)
+
+    def decorator(fn):
+        tool_name = kwargs.get('name') or fn.__name__
+
+        @functools.wraps(fn)
+        async def timed_tool(*call_args, **call_kwargs):
+            started = time.perf_counter()
+            outcome = 'exception'
+            client_token = current_mcp_client.set(_mcp_client_key())
+            try:
+                with trace_call(tool_name):
+                    result = await fn(*call_args, **call_kwargs)
+                outcome = 'error' if isinstance(result, dict) and 'error' in result else 'ok'
+                return result
+            finally:
+                current_mcp_client.reset(client_token)
+                TOOL_CALLS.inc(tool=tool_name, outcome=outcome)
+                TOOL_DURATION.observe(time.perf_counter() - started, tool=tool_name)
+
+        register(timed_tool)
+        return fn
+
+    return decorator
+
+
+# Random id per live MCP session; id() of a session can be reused once it is collected
+_mcp_session_ids: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+
+def _mcp_client_key() -> str:
+    """Identify the MCP client of the current request for fair simulation scheduling.
+
+    The client_id from the request metadata when the client sends one, otherwise the
+    client's name plus a per-session id, so two sessions of the same client are told apart.
+    """
+    try:
+        request_context = mcp.get_context().request_context
+    except Exception:
+        return 'local'
+    client_id = getattr(request_context.meta, 'client_id', None) if request_context.meta else None
+    if client_id:
+        return str(client_id)
+    session = request_context.session
+    client_params = getattr(session, 'client_params', None)
+    name = client_params.clientInfo.name if client_params and client_params.clientInfo else 'client'
+    session_id = _mcp_session_ids.get(session)
+    if session_id is None:
+        session_id = _mcp_session_ids[session] = uuid.uuid4().hex
+    return f"{name}#{session_id}"
+
 # Add health check endpoint for container monitoring
-from mcp.server.fastmcp import Context
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, PlainTextResponse
 
 @mcp.custom_route('/health', methods=['GET'])
 async def health_check(context: Context):
@@ -2101,10 +4734,52 @@ async def health_check(context: Context):
         "status": "healthy",
         "service": "brain-platform-mcp",
         "timestamp": datetime.utcnow().isoformat(),
-        "redis_connected": brain_client.redis_client is not None
+        "redis_connected": brain_client.redis_client is not None,
+        "cache": brain_client.get_cache_stats(),
+        "catalog_snapshot": brain_client.get_catalog_snapshot_info(),
+        "concurrency": brain_client._request_limiter.stats(),
+        "circuit_breaker": brain_client._circuit_breaker.stats()
     })
 
-@mcp.tool()
+metrics_registry.gauge(
+    "brain_semaphore_in_use", "Permits currently held per client semaphore.", ("semaphore",),
+    callback=lambda: brain_client.semaphore_occupancy(),
+)
+metrics_registry.gauge(
+    "brain_semaphore_capacity", "Permits available per client semaphore.", ("semaphore",),
+    callback=lambda: {
+        ('request',): brain_client._request_limiter.window,
+        ('simulation_slots',): brain_client._simulation_slots.capacity,
+    },
+)
+metrics_registry.gauge(
+    "brain_concurrency_limit", "Current adaptive concurrency window for upstream requests.", ("limiter",),
+    callback=lambda: {('request',): brain_client._request_limiter.limit},
+)
+metrics_registry.gauge(
+    "brain_circuit_breaker_open", "1 while the BRAIN API circuit breaker is open or half-open.",
+    callback=lambda: {(): 0 if brain_client._circuit_breaker.state == CircuitBreaker.CLOSED else 1},
+)
+metrics_registry.gauge(
+    "brain_simulation_slot_queue", "Simulations waiting for a simulation slot, per priority class.", ("priority",),
+    callback=lambda: {
+        (priority,): sum(brain_client._simulation_slots.snapshot()['waiting'][priority].values())
+        for priority in SimulationSlotScheduler.PRIORITIES
+    },
+)
+
+metrics_registry.gauge(
+    "brain_simulations_waiting", "Simulation locations tracked by the central progress poller.",
+    callback=lambda: {(): brain_client._simulation_poller.in_flight()},
+)
+
+
+@mcp.custom_route('/metrics', methods=['GET'])
+async def prometheus_metrics(request):
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+@instrumented_tool()
 async def authenticate() -> Dict[str, Any]:
     """
     Authenticate with WorldQuant BRAIN platform.
@@ -2137,7 +4812,7 @@ async def authenticate() -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def manage_config(action: str = "get", settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Manage configuration settings - get or update configuration.
@@ -2166,7 +4841,50 @@ async def manage_config(action: str = "get", settings: Optional[Dict[str, Any]]
 
 # --- Simulation Tools ---
 
-@mcp.tool()
+def build_simulation_data(
+    type: str, region: str, universe: str, delay: int, decay: int, neutralization: str,
+    truncation: float, test_period: str, nan_handling: str, regular: Optional[str],
+    combo: Optional[str], selection: Optional[str], pasteurization: str, max_trade: str,
+    selection_handling: str, selection_limit: int, component_activation: str,
+) -> SimulationData:
+    """SimulationData from the create_simulation tool arguments."""
+    settings = SimulationSettings(
+        instrumentType="EQUITY",
+        region=region,
+        universe=universe,
+        delay=delay,
+        decay=decay,
+        neutralization=neutralization,
+        truncation=truncation,
+        testPeriod=test_period,
+        unitHandling="VERIFY",
+        nanHandling=nan_handling,
+        language="FASTEXPR",
+        visualization=False,
+        pasteurization=pasteurization,
+        maxTrade=max_trade if region != "ASI" else "ON",  # ASI区maxTrade必须设置为ON
+        selectionHandling=selection_handling,
+        selectionLimit=selection_limit,
+        componentActivation=component_activation,
+    )
+    return SimulationData(
+        type=type,
+        settings=settings,
+        regular=regular,
+        combo=combo,
+        selection=selection
+    )
+
+
+def simulation_error(e: Exception) -> Dict[str, Any]:
+    error_msg = str(e)
+    if error_msg and "does not support event inputs" in error_msg:
+        extra_info = "If fields is vector type  should use vec_* operator with event input"
+        return {"error": f"An unexpected error occurred: {error_msg}. {extra_info}"}
+    return {"error": f"An unexpected error occurred: {error_msg}"}
+
+
+@instrumented_tool()
 async def create_simulation(
     type: str = "REGULAR",
     region: str = "USA",
@@ -2185,6 +4903,8 @@ async def create_simulation(
     selection_handling: str = "POSITIVE",
     selection_limit: int = 1000,
     component_activation: str = "IS",
+    force: bool = False,
+    ctx: Optional[Context] = None,
 ) -> Dict[str, Any]:
     """
     Create a new simulation on BRAIN platform.
@@ -2204,55 +4924,27 @@ async def create_simulation(
         regular: Regular simulation code (for REGULAR type)
         combo: Combo code (for SUPER type)
         selection: Selection code (for SUPER type)
+        force: Simulate again even if an identical simulation was cached recently
     
     Returns:
-        Simulation creation result with ID and location
+        Simulation creation result with ID and location ("cached": true when served from the result cache)
     """
-    unit_handling = "VERIFY"
-    instrument_type = "EQUITY"
-    visualization = False
-    language = "FASTEXPR"
     try:
-        settings = SimulationSettings(
-            instrumentType=instrument_type,
-            region=region,
-            universe=universe,
-            delay=delay,
-            decay=decay,
-            neutralization=neutralization,
-            truncation=truncation,
-            testPeriod=test_period,
-            unitHandling=unit_handling,
-            nanHandling=nan_handling,
-            language=language,
-            visualization=visualization,
-            pasteurization=pasteurization,
-            maxTrade=max_trade if region != "ASI" else "ON",  # ASI区maxTrade必须设置为ON
-            selectionHandling=selection_handling,
-            selectionLimit=selection_limit,
-            componentActivation=component_activation,
-        )
-        
-        sim_data = SimulationData(
-            type=type,
-            settings=settings,
-            regular=regular,
-            combo=combo,
-            selection=selection
+        sim_data = build_simulation_data(
+            type, region, universe, delay, decay, neutralization, truncation, test_period,
+            nan_handling, regular, combo, selection, pasteurization, max_trade,
+            selection_handling, selection_limit, component_activation,
         )
-        
-        return await brain_client.create_simulation(sim_data)
+        progress = ToolProgress(ctx, "Simulation")
+        result = await brain_client.create_simulation(sim_data, force=force, progress=progress)
+        await progress.done(f"alpha {result.get('id')}")
+        return result
     except Exception as e:
-        extra_info = ""
-        error_msg = str(e)
-        if error_msg and "does not support event inputs" in error_msg:
-            extra_info = "If fields is vector type  should use vec_* operator with event input"
-            return {"error": f"An unexpected error occurred: {str(e)}. {extra_info}"}
-        return {"error": f"An unexpected error occurred: {str(e)}"}
+        return simulation_error(e)
 
 # --- Alpha and Data Retrieval Tools ---
 
-@mcp.tool()
+@instrumented_tool()
 async def get_alpha_details(alpha_id: str) -> Dict[str, Any]:
     """
     Get detailed information about an alpha.
@@ -2268,7 +4960,7 @@ async def get_alpha_details(alpha_id: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_datasets(
     category: Optional[str] = None,
     region: str = "USA",
@@ -2276,6 +4968,10 @@ async def get_datasets(
     universe: str = "TOP3000",
     theme: str = "false",
     search: Optional[str] = None,
+    rank: bool = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """
     Get available datasets for research.
@@ -2288,16 +4984,22 @@ async def get_datasets(
         delay: Data delay (0 or 1)
         universe: Universe of stocks (e.g., "TOP3000")
         theme: Theme filter
+        search: Phrase matched against dataset id, name, description, category and subcategory
+        rank: Return the best search matches first, with a search_score (top 20 unless limit is set)
+        offset: Number of results to skip (for paging)
+        limit: Maximum number of results to return
+        fields: Only return these keys of each dataset, e.g. ["id", "name", "coverage"] (dotted for nested: "category.name")
     
     Returns:
         Available datasets
     """
     try:
-        return await brain_client.get_datasets(category, region, delay, universe, theme, search)
+        return await brain_client.get_datasets(category, region, delay, universe, theme, search,
+                                               rank=rank, offset=offset, limit=limit, fields=fields)
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_datafields(
     region: str,
     dataset_id: Optional[str],
@@ -2305,6 +5007,10 @@ async def get_datafields(
     delay: int = 1,
     data_type: str = "",
     search: Optional[str] = None,
+    rank: bool = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    fields: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """
     Get available data fields for alpha construction.
@@ -2318,6 +5024,10 @@ async def get_datafields(
         dataset_id: Specific dataset ID to filter by
         data_type: Type of data (e.g., "MATRIX",'VECTOR','GROUP')
         search: Search term to filter fields
+        rank: Return the best search matches first, with a search_score (top 20 unless limit is set)
+        offset: Number of results to skip (for paging)
+        limit: Maximum number of results to return
+        fields: Only return these keys of each field, e.g. ["id", "type", "coverage"] (dotted for nested: "dataset.id")
     
     Returns:
         Available data fields
@@ -2325,11 +5035,12 @@ async def get_datafields(
     instrument_type = "EQUITY"
     theme = "false"
     try:
-        return await brain_client.get_datafields(instrument_type, region, delay, universe, theme, dataset_id, data_type, search)
+        return await brain_client.get_datafields(instrument_type, region, delay, universe, theme, dataset_id, data_type, search,
+                                                 rank=rank, offset=offset, limit=limit, fields=fields)
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_alpha_pnl(alpha_id: str) -> Dict[str, Any]:
     """
     Get PnL (Profit and Loss) data for an alpha.
@@ -2345,7 +5056,7 @@ async def get_alpha_pnl(alpha_id: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_user_alphas(
     stage: str = "IS",
     limit: int = 30,
@@ -2406,7 +5117,7 @@ async def get_user_alphas(
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def submit_alpha(alpha_id: str) -> Dict[str, Any]:
     """
     Submit an alpha for production.
@@ -2425,7 +5136,7 @@ async def submit_alpha(alpha_id: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def value_factor_trendScore(start_date: str, end_date: str) -> Dict[str, Any]:
     """Compute and return the diversity score for REGULAR alphas in a submission-date window.
     This function calculate the diversity of the users' submission, by checking the diversity, we can have a good understanding on the valuefactor's trend.
@@ -2445,7 +5156,7 @@ async def value_factor_trendScore(start_date: str, end_date: str) -> Dict[str, A
 
 # --- Community and Events Tools ---
 
-@mcp.tool()
+@instrumented_tool()
 async def get_events() -> Dict[str, Any]:
     """
     Get available events and competitions.
@@ -2458,7 +5169,7 @@ async def get_events() -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_leaderboard(user_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Get leaderboard data.
@@ -2477,7 +5188,7 @@ async def get_leaderboard(user_id: Optional[str] = None) -> Dict[str, Any]:
 
 # --- Forum Tools ---
 
-@mcp.tool()
+@instrumented_tool()
 async def get_operators() -> Dict[str, Any]:
     """
     Get available operators for alpha creation.
@@ -2493,7 +5204,7 @@ async def get_operators() -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def run_selection(
     selection: str,
     instrument_type: str = "EQUITY",
@@ -2523,7 +5234,7 @@ async def run_selection(
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_user_profile(user_id: str = "self") -> Dict[str, Any]:
     """
     Get user profile information.
@@ -2539,7 +5250,7 @@ async def get_user_profile(user_id: str = "self") -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_documentations() -> Dict[str, Any]:
     """
     Get available documentations and learning materials.
@@ -2554,7 +5265,7 @@ async def get_documentations() -> Dict[str, Any]:
 
 # --- Message and Forum Tools ---
 
-@mcp.tool()
+@instrumented_tool()
 async def get_messages(limit: Optional[int] = None, offset: int = 0) -> Dict[str, Any]:
     """
     Get messages for the current user with optional pagination.
@@ -2571,7 +5282,7 @@ async def get_messages(limit: Optional[int] = None, offset: int = 0) -> Dict[str
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_glossary_terms(email: str = "", password: str = "") -> List[Dict[str, str]]:
     """
     Get glossary terms from WorldQuant BRAIN forum.
@@ -2598,7 +5309,7 @@ async def get_glossary_terms(email: str = "", password: str = "") -> List[Dict[s
         logger.error(f"Error in get_glossary_terms tool: {e}")
         return [{"error": str(e)}]
 
-@mcp.tool()
+@instrumented_tool()
 async def search_forum_posts(search_query: str, email: str = "", password: str = "", 
                              max_results: int = 50) -> Dict[str, Any]:
     """
@@ -2627,7 +5338,7 @@ async def search_forum_posts(search_query: str, email: str = "", password: str =
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def read_forum_post(article_id: str, email: str = "", password: str = "", 
                           include_comments: bool = True) -> Dict[str, Any]:
     """
@@ -2655,7 +5366,7 @@ async def read_forum_post(article_id: str, email: str = "", password: str = "",
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_alpha_yearly_stats(alpha_id: str) -> Dict[str, Any]:
     """Get yearly statistics for an alpha."""
     try:
@@ -2663,17 +5374,20 @@ async def get_alpha_yearly_stats(alpha_id: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
-async def check_correlation(alpha_id: str) -> Dict[str, Any]:
+@instrumented_tool()
+async def check_correlation(alpha_id: str, ctx: Optional[Context] = None) -> Dict[str, Any]:
     """Check alpha correlation against production alphas, self alphas, or both."""
     correlation_type = "both"
     threshold = 0.7
     try:
-        return await brain_client.check_correlation(alpha_id, correlation_type, threshold)
+        progress = ToolProgress(ctx, f"Correlation check for {alpha_id}")
+        result = await brain_client.check_correlation(alpha_id, correlation_type, threshold, progress)
+        await progress.done()
+        return result
     except Exception as e:
         return {"error": str(e)}
 
-@mcp.tool()
+@instrumented_tool()
 async def set_alpha_properties(alpha_id: str, name: Optional[str] = None, 
                                color: Optional[str] = None, tags: Optional[List[str]] = None,
                                selection_desc: str = "None", combo_desc: str = "None") -> Dict[str, Any]:
@@ -2683,7 +5397,7 @@ async def set_alpha_properties(alpha_id: str, name: Optional[str] = None,
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_record_sets(alpha_id: str) -> Dict[str, Any]:
     """List available record sets for an alpha."""
     try:
@@ -2691,7 +5405,7 @@ async def get_record_sets(alpha_id: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_record_set_data(alpha_id: str, record_set_name: str) -> Dict[str, Any]:
     """Get data from a specific record set."""
     try:
@@ -2699,7 +5413,7 @@ async def get_record_set_data(alpha_id: str, record_set_name: str) -> Dict[str,
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_user_activities(user_id: str, grouping: Optional[str] = None) -> Dict[str, Any]:
     """Get user activity diversity data."""
     try:
@@ -2707,7 +5421,7 @@ async def get_user_activities(user_id: str, grouping: Optional[str] = None) -> D
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_pyramid_multipliers() -> Dict[str, Any]:
     """Get current pyramid multipliers showing BRAIN's encouragement levels."""
     try:
@@ -2715,7 +5429,7 @@ async def get_pyramid_multipliers() -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_pyramid_alphas(start_date: Optional[str] = None,
                                end_date: Optional[str] = None) -> Dict[str, Any]:
     """Get user's current alpha distribution across pyramid categories."""
@@ -2724,7 +5438,7 @@ async def get_pyramid_alphas(start_date: Optional[str] = None,
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
         
-@mcp.tool()
+@instrumented_tool()
 async def get_user_competitions(user_id: Optional[str] = None) -> Dict[str, Any]:
     """Get list of competitions that the user is participating in."""
     try:
@@ -2732,7 +5446,7 @@ async def get_user_competitions(user_id: Optional[str] = None) -> Dict[str, Any]
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_competition_details(competition_id: str) -> Dict[str, Any]:
     """Get detailed information about a specific competition."""
     try:
@@ -2740,7 +5454,7 @@ async def get_competition_details(competition_id: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_competition_agreement(competition_id: str) -> Dict[str, Any]:
     """Get the rules, terms, and agreement for a specific competition."""
     try:
@@ -2748,7 +5462,7 @@ async def get_competition_agreement(competition_id: str) -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
 async def get_platform_setting_options() -> Dict[str, Any]:
     """Discover valid simulation setting options (instrument types, regions, delays, universes, neutralization).
 
@@ -2764,7 +5478,30 @@ async def get_platform_setting_options() -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
-@mcp.tool()
+@instrumented_tool()
+async def refresh_catalog_snapshot(force: bool = False, wait: bool = False) -> Dict[str, Any]:
+    """Rebuild the offline datasets/datafields snapshot for every region/delay/universe combination.
+
+    get_datasets and get_datafields read from this snapshot, so they answer locally even right
+    after a restart or a cache flush. It is rebuilt daily in the background after authentication.
+
+    Args:
+        force: Rebuild even if the current snapshot is still fresh
+        wait: Wait for the rebuild to finish instead of running it in the background
+
+    Returns:
+        Snapshot status (versions on disk and build progress), or the build result when waiting
+    """
+    try:
+        if wait:
+            return await brain_client.build_catalog_snapshot(force=force)
+        brain_client.start_catalog_snapshot(force=force)
+        await asyncio.sleep(0)
+        return brain_client.get_catalog_snapshot_info()
+    except Exception as e:
+        return {"error": f"An unexpected error occurred: {str(e)}"}
+
+@instrumented_tool()
 async def performance_comparison(alpha_id: str, team_id: Optional[str] = None, 
                                  competition: Optional[str] = None) -> Dict[str, Any]:
     """Get performance comparison data for an alpha."""
@@ -2775,7 +5512,7 @@ async def performance_comparison(alpha_id: str, team_id: Optional[str] = None,
         
 # --- Dataframe Tool ---
 
-@mcp.tool()
+@instrumented_tool()
 async def expand_nested_data(data: List[Dict[str, Any]], preserve_original: bool = True) -> List[Dict[str, Any]]:
     """Flatten complex nested data structures into tabular format."""
     try:
@@ -2785,7 +5522,7 @@ async def expand_nested_data(data: List[Dict[str, Any]], preserve_original: bool
         
 # --- Documentation Tool ---
 
-@mcp.tool()
+@instrumented_tool()
 async def get_documentation_page(page_id: str) -> Dict[str, Any]:
     """Retrieve detailed content of a specific documentation page/article."""
     try:
@@ -2795,7 +5532,32 @@ async def get_documentation_page(page_id: str) -> Dict[str, Any]:
 
 # --- Advanced Simulation Tools ---
 
-@mcp.tool()
+def build_multisimulation_payload(
+    alpha_expressions: List[str], instrument_type: str, region: str, universe: str, delay: int,
+    decay: int, neutralization: str, truncation: float, test_period: str, unit_handling: str,
+    nan_handling: str, language: str, visualization: bool, pasteurization: str, max_trade: str,
+) -> List[Dict[str, Any]]:
+    """Multisimulation request body: one REGULAR simulation per expression, shared settings."""
+    settings = {
+        'instrumentType': instrument_type,
+        'region': region,
+        'universe': universe,
+        'delay': delay,
+        'decay': decay,
+        'neutralization': neutralization,
+        'truncation': truncation,
+        'pasteurization': pasteurization,
+        'unitHandling': unit_handling,
+        'nanHandling': nan_handling,
+        'language': language,
+        'visualization': visualization,
+        'testPeriod': test_period,
+        'maxTrade': max_trade if region != "ASI" else "ON"  # ASI区maxTrade必须设置为ON
+    }
+    return [{'type': 'REGULAR', 'settings': dict(settings), 'regular': alpha_expr} for alpha_expr in alpha_expressions]
+
+
+@instrumented_tool()
 async def create_multi_simulation(
     alpha_expressions: List[str],
     instrument_type: str = "EQUITY",
@@ -2811,7 +5573,9 @@ async def create_multi_simulation(
     language: str = "FASTEXPR",
     visualization: bool = False,
     pasteurization: str = "ON",
-    max_trade: str = "OFF"
+    max_trade: str = "OFF",
+    force: bool = False,
+    ctx: Optional[Context] = None
 ) -> Dict[str, Any]:
     """
     🚀 Create multiple regular alpha simulations on BRAIN platform in a single request.
@@ -2838,9 +5602,12 @@ async def create_multi_simulation(
         visualization: Enable visualization (default: False)
         pasteurization: Pasteurization setting (default: "ON")
         max_trade: Max trade setting (default: "OFF")
+        force: Simulate every expression even if an identical simulation was cached recently
     
     Returns:
-        Dictionary containing multisimulation results and individual alpha details
+        Dictionary containing multisimulation results and individual alpha details.
+        Expressions served from the simulation result cache are marked "cached": true
+        and are not resubmitted.
     """
     try:
         # Validate input
@@ -2850,149 +5617,124 @@ async def create_multi_simulation(
             return {"error": "Maximum 8 alpha expressions allowed per request"}
         
         # Create multisimulation data
-        multisimulation_data = []
-        for alpha_expr in alpha_expressions:
-            simulation_item = {
-                'type': 'REGULAR',
-                'settings': {
-                    'instrumentType': instrument_type,
-                    'region': region,
-                    'universe': universe,
-                    'delay': delay,
-                    'decay': decay,
-                    'neutralization': neutralization,
-                    'truncation': truncation,
-                    'pasteurization': pasteurization,
-                    'unitHandling': unit_handling,
-                    'nanHandling': nan_handling,
-                    'language': language,
-                    'visualization': visualization,
-                    'testPeriod': test_period,
-                    'maxTrade': max_trade if region != "ASI" else "ON"  # ASI区maxTrade必须设置为ON
-                },
-                'regular': alpha_expr
-            }
-            multisimulation_data.append(simulation_item)
-        
-        # Send multisimulation request
-        response = brain_client.session.post(f"{brain_client.base_url}/simulations", json=multisimulation_data)
-        
-        if response.status_code != 201:
-            return {"error": f"Failed to create multisimulation. Status: {response.status_code}"}
+        multisimulation_data = build_multisimulation_payload(
+            alpha_expressions, instrument_type, region, universe, delay, decay, neutralization,
+            truncation, test_period, unit_handling, nan_handling, language, visualization,
+            pasteurization, max_trade,
+        )
         
-        # Get multisimulation location
-        location = response.headers.get('Location', '')
-        if not location:
-            return {"error": "No location header in multisimulation response"}
+        # Identical expressions simulated recently are answered from the result cache
+        cached = [None if force else brain_client.get_cached_simulation_result(item) for item in multisimulation_data]
+        missing = [i for i, hit in enumerate(cached) if hit is None]
+        cached_results = {
+            i: {'alpha_id': hit['alpha_id'], 'details': hit['details'], 'cached': True, 'simulated_at': hit['simulated_at']}
+            for i, hit in enumerate(cached) if hit is not None
+        }
+        if not missing:
+            return {
+                'success': True,
+                'message': f'All {len(alpha_expressions)} expressions were served from the simulation result cache',
+                'total_requested': len(alpha_expressions),
+                'total_created': 0,
+                'alpha_results': [cached_results[i] for i in range(len(alpha_expressions))],
+            }
+        body = [multisimulation_data[i] for i in missing]
         
-        # Wait for children to appear and get results
-        return await _wait_for_multisimulation_completion(location, len(alpha_expressions))
+        # The whole multisimulation occupies one simulation slot until its children finish
+        await brain_client.ensure_authenticated()
+        progress = ToolProgress(ctx, "Multisimulation")
+        async with brain_client._simulation_slots.slot('interactive', on_wait=progress.on_slot_wait):
+            # Send multisimulation request (a single remaining expression runs as a plain simulation)
+            try:
+                location = await brain_client._submit_simulation(body if len(body) > 1 else body[0])
+            except httpx.HTTPStatusError as e:
+                return {"error": f"Failed to create multisimulation. Status: {e.response.status_code}"}
+
+            # Wait for children to appear and get results
+            try:
+                result = await _wait_for_multisimulation_completion(location, len(body), payloads=body, progress=progress)
+                await progress.done()
+            finally:
+                # New alphas exist once children complete (even partially): drop cached listings
+                brain_client.invalidate_cache_tag('alphas')
+        if cached_results and 'alpha_results' in result:
+            merged: List[Optional[Dict[str, Any]]] = [cached_results.get(i) for i in range(len(alpha_expressions))]
+            for i, child in zip(missing, result['alpha_results']):
+                merged[i] = child
+            result['alpha_results'] = merged
+            result['total_requested'] = len(alpha_expressions)
+            result['cached_results'] = len(cached_results)
+        return result
         
     except Exception as e:
         return {"error": f"Error creating multisimulation: {str(e)}"}
 
-async def _wait_for_multisimulation_completion(location: str, expected_children: int) -> Dict[str, Any]:
-    """Wait for multisimulation to complete and return results"""
+@traced("multisimulation.wait", "poll")
+async def _wait_for_multisimulation_completion(
+    location: str,
+    expected_children: int,
+    on_result: Optional[Callable[[Dict[str, Any], int, int], Awaitable[None]]] = None,
+    payloads: Optional[List[Dict[str, Any]]] = None,
+    progress: Optional[ToolProgress] = None,
+) -> Dict[str, Any]:
+    """Wait for multisimulation to complete and return results.
+
+    Children are polled concurrently by the shared simulation poller (each at its own
+    Retry-After) and their alpha details fetched as soon as each one finishes; on_result is
+    awaited with (result, finished_count, total) for every child as it completes. With
+    payloads (in child order) finished children are stored in the simulation result cache.
+    A location with a single expected child is treated as a plain simulation. progress
+    receives a notification on every poll, averaged over the children.
+    """
     try:
         # Simple progress indicator for users
         print(f"Waiting for multisimulation to complete... (this may take several minutes)", file=sys.stderr)
         print(f"Expected {expected_children} alpha simulations", file=sys.stderr)
         print("", file=sys.stderr)
-        # Wait for children to appear - much more tolerant for 8+ minute multisimulations
-        children = []
-        max_wait_attempts = 200  # Increased significantly for 8+ minute multisimulations
-        wait_attempt = 0
-        
-        while wait_attempt < max_wait_attempts and len(children) == 0:
-            wait_attempt += 1
-            
-            try:
-                multisim_response = await brain_client._request('GET', location)
-                if multisim_response.status_code == 200:
-                    multisim_data = multisim_response.json()
-                    children = multisim_data.get('children', [])
-                    
-                    if children:
-                        break
-                    else:
-                        # Wait before next attempt - use longer intervals for multisimulations
-                        retry_after = multisim_response.headers.get("Retry-After", 5)
-                        wait_time = float(retry_after)
-                        await asyncio.sleep(wait_time)
-            except Exception as e:
-                await asyncio.sleep(5)
-        
-        if not children:
-            return {"error": f"Children did not appear within {max_wait_attempts} attempts (multisimulation may still be processing)"}
-        
-        # Process each child to get alpha results
-        alpha_results = []
-        for i, child_id in enumerate(children):
-            try:
-                # The children are full URLs, not just IDs
-                child_url = child_id if child_id.startswith('http') else f"{brain_client.base_url}/simulations/{child_id}"
-                
-                # Wait for this alpha to complete - more tolerant timing
-                finished = False
-                max_alpha_attempts = 100  # Increased for longer alpha processing
-                alpha_attempt = 0
-                
-                while not finished and alpha_attempt < max_alpha_attempts:
-                    alpha_attempt += 1
-                    
-                    try:
-                        alpha_progress = await brain_client._request('GET', child_url)
-                        if alpha_progress.status_code == 200:
-                            alpha_data = alpha_progress.json()
-                            retry_after = alpha_progress.headers.get("Retry-After", 0)
-                            
-                            if retry_after == 0:
-                                finished = True
-                                break
-                            else:
-                                wait_time = float(retry_after)
-                                await asyncio.sleep(wait_time)
-                        else:
-                            await asyncio.sleep(5)
-                    except Exception as e:
-                        await asyncio.sleep(5)
-                
-                if finished:
-                    # Get alpha details from the completed simulation
-                    alpha_id = alpha_data.get("alpha")
-                    if alpha_id:
-                        # Now get the actual alpha details from the alpha endpoint
-                        alpha_details = await brain_client._request('GET', f"{brain_client.base_url}/alphas/{alpha_id}")
-                        if alpha_details.status_code == 200:
-                            alpha_detail_data = alpha_details.json()
-                            alpha_results.append({
-                                'alpha_id': alpha_id,
-                                'location': child_url,
-                                'details': alpha_detail_data
-                            })
-                        else:
-                            alpha_results.append({
-                                'alpha_id': alpha_id,
-                                'location': child_url,
-                                'error': f'Failed to get alpha details: {alpha_details.status_code}'
-                            })
-                    else:
-                        alpha_results.append({
-                            'location': child_url,
-                            'error': 'No alpha ID found in completed simulation'
-                        })
-                else:
-                    alpha_results.append({
-                        'location': f"child_{i+1}",
-                        'error': f'Alpha simulation did not complete within {max_alpha_attempts} attempts'
-                    })
-                    
-            except Exception as e:
-                alpha_results.append({
-                    'location': f"child_{i+1}",
-                    'error': str(e)
-                })
-        
+        async def parent_polled(data: Dict[str, Any], retry_after: Optional[float]):
+            await progress.update(simulation_percent(data), "waiting for child simulations", retry_after)
+
+        try:
+            if expected_children == 1:
+                child_urls = [brain_client._to_absolute_url(location)]
+            else:
+                child_urls = await brain_client._multisimulation_child_urls(
+                    location, on_poll=parent_polled if progress is not None else None)
+        except TimeoutError:
+            return {"error": "Children did not appear in time (multisimulation may still be processing)"}
+
+        alpha_results: List[Optional[Dict[str, Any]]] = [None] * len(child_urls)
+        finished = 0
+        child_percent = [0.0] * len(child_urls)
+
+        async def report(retry_after: Optional[float] = None):
+            if progress is not None:
+                await progress.update(sum(child_percent) / len(child_urls),
+                                      f"{finished}/{len(child_urls)} alphas finished", retry_after)
+
+        async def finish_child(index: int, child_url: str):
+            nonlocal finished
+
+            async def child_polled(data: Dict[str, Any], retry_after: Optional[float]):
+                child_percent[index] = simulation_percent(data) or child_percent[index]
+                await report(retry_after)
+
+            payload = payloads[index] if payloads and index < len(payloads) else None
+            result = await brain_client._finish_child(
+                child_url, full_details=True, payload=payload,
+                on_poll=child_polled if progress is not None else None)
+            child_percent[index] = 100.0
+            if 'details_error' in result:
+                result['error'] = result.pop('details_error')
+            alpha_results[index] = result
+            finished += 1
+            print(f"Alpha {finished}/{len(child_urls)} finished: {result.get('alpha_id') or result.get('error')}", file=sys.stderr)
+            await report()
+            if on_result is not None:
+                await on_result(result, finished, len(child_urls))
+
+        await asyncio.gather(*(finish_child(i, url) for i, url in enumerate(child_urls)))
+
         # Return comprehensive results
         print(f"Multisimulation completed! Retrieved {len(alpha_results)} alpha results", file=sys.stderr)
         return {
@@ -3007,9 +5749,232 @@ async def _wait_for_multisimulation_completion(location: str, expected_children:
         
     except Exception as e:
         return {"error": f"Error waiting for multisimulation completion: {str(e)}"}
+
+@instrumented_tool()
+async def create_simulation_batch(
+    alpha_expressions: List[str],
+    instrument_type: str = "EQUITY",
+    region: str = "USA",
+    universe: str = "TOP3000",
+    delay: int = 1,
+    decay: int = 4,
+    neutralization: str = "INDUSTRY",
+    truncation: float = 0.0,
+    test_period: str = "P0Y0M",
+    unit_handling: str = "VERIFY",
+    nan_handling: str = "OFF",
+    language: str = "FASTEXPR",
+    visualization: bool = False,
+    pasteurization: str = "ON",
+    max_trade: str = "OFF",
+    max_retries: int = 1,
+    force: bool = False,
+    ctx: Optional[Context] = None,
+) -> Dict[str, Any]:
+    """
+    Simulate any number of regular alpha expressions with the same settings.
+
+    Expressions are packed into multisimulations of 8 and as many multisimulations run at
+    once as the account allows (BRAIN_BATCH_MAX_IN_FLIGHT). Children that fail are retried
+    up to max_retries times. Use this instead of chunking expressions by hand.
+
+    Args:
+        alpha_expressions: Alpha expressions to simulate (any number)
+        max_retries: Times a failed simulation is retried (default: 1)
+        force: Simulate every expression even if an identical simulation was cached recently
+        Other arguments: same as create_multi_simulation
+
+    Returns:
+        results in the order the simulations completed (index into alpha_expressions,
+        expression, alpha_id and IS summary, or error), plus succeeded/failed counts
+    """
+    try:
+        if not alpha_expressions:
+            return {"error": "At least 1 alpha expression is required"}
+        payload = build_multisimulation_payload(
+            alpha_expressions, instrument_type, region, universe, delay, decay, neutralization,
+            truncation, test_period, unit_handling, nan_handling, language, visualization,
+            pasteurization, max_trade,
+        )
+        progress = ToolProgress(ctx, "Simulation batch")
+
+        async def on_result(result: Dict[str, Any], finished: int, total: int):
+            await progress.update(100.0 * finished / total, f"{finished}/{total} simulations finished")
+
+        results = await brain_client.run_simulation_batch(payload, max_retries=max_retries, force=force, on_result=on_result)
+        await progress.done()
+        succeeded = sum(1 for result in results if result.get('alpha_id'))
+        return {
+            'total_requested': len(alpha_expressions),
+            'succeeded': succeeded,
+            'failed': len(results) - succeeded,
+            'results': results,
+        }
+    except Exception as e:
+        return {"error": f"Error running simulation batch: {str(e)}"}
+
+# --- Simulation Job Tools ---
+
+@instrumented_tool()
+async def submit_simulation_job(
+    type: str = "REGULAR",
+    region: str = "USA",
+    universe: str = "TOP3000",
+    delay: int = 1,
+    decay: int = 4,
+    neutralization: str = "SUBINDUSTRY",
+    truncation: float = 0.08,
+    test_period: str = "P0Y0M",
+    nan_handling: str = "ON",
+    regular: Optional[str] = None,
+    combo: Optional[str] = None,
+    selection: Optional[str] = None,
+    pasteurization: str = "ON",
+    max_trade: str = "OFF",
+    selection_handling: str = "POSITIVE",
+    selection_limit: int = 1000,
+    component_activation: str = "IS",
+) -> Dict[str, Any]:
+    """
+    Submit a simulation and return immediately with a job ID instead of waiting for the result.
+
+    Takes the same arguments as create_simulation. The server submits the simulation as soon as
+    a simulation slot is free and polls it in the background (resuming after a restart); use
+    get_job_status or wait_for_jobs for the result.
+    Submit several jobs first and then wait for all of them to run simulations in parallel.
+
+    Returns:
+        The job record: id and status ("queued" until a simulation slot is free)
+    """
+    try:
+        sim_data = build_simulation_data(
+            type, region, universe, delay, decay, neutralization, truncation, test_period,
+            nan_handling, regular, combo, selection, pasteurization, max_trade,
+            selection_handling, selection_limit, component_activation,
+        )
+        return await brain_client.submit_simulation_job(sim_data)
+    except Exception as e:
+        return simulation_error(e)
+
+@instrumented_tool()
+async def submit_multi_simulation_job(
+    alpha_expressions: List[str],
+    instrument_type: str = "EQUITY",
+    region: str = "USA",
+    universe: str = "TOP3000",
+    delay: int = 1,
+    decay: int = 4,
+    neutralization: str = "INDUSTRY",
+    truncation: float = 0.0,
+    test_period: str = "P0Y0M",
+    unit_handling: str = "VERIFY",
+    nan_handling: str = "OFF",
+    language: str = "FASTEXPR",
+    visualization: bool = False,
+    pasteurization: str = "ON",
+    max_trade: str = "OFF"
+) -> Dict[str, Any]:
+    """
+    Submit a multisimulation (2-8 expressions) and return immediately with a job ID.
+
+    Takes the same arguments as create_multi_simulation. When the job completes its record
+    lists every child simulation with its alpha ID and IS summary.
+
+    Returns:
+        The job record: id and status ("queued" until a simulation slot is free)
+    """
+    try:
+        if len(alpha_expressions) < 2:
+            return {"error": "At least 2 alpha expressions are required"}
+        if len(alpha_expressions) > 8:
+            return {"error": "Maximum 8 alpha expressions allowed per request"}
+        payload = build_multisimulation_payload(
+            alpha_expressions, instrument_type, region, universe, delay, decay, neutralization,
+            truncation, test_period, unit_handling, nan_handling, language, visualization,
+            pasteurization, max_trade,
+        )
+        return await brain_client.submit_multi_simulation_job(payload)
+    except Exception as e:
+        return {"error": f"Error creating multisimulation: {str(e)}"}
+
+@instrumented_tool()
+async def get_job_status(job_id: str) -> Dict[str, Any]:
+    """
+    Get the current state of a simulation job.
+
+    Args:
+        job_id: ID returned by submit_simulation_job or submit_multi_simulation_job
+
+    Returns:
+        The job record; status is one of queued, submitting, running, completed, failed.
+        Completed jobs include alpha_id and the IS summary (or children for multisimulations).
+    """
+    try:
+        job = brain_client.get_job(job_id)
+        if job is None:
+            return {"error": f"Unknown job: {job_id}"}
+        return job
+    except Exception as e:
+        return {"error": f"An unexpected error occurred: {str(e)}"}
+
+@instrumented_tool()
+async def wait_for_jobs(
+    job_ids: List[str],
+    timeout: float = 600,
+    return_when: str = "ALL_COMPLETED",
+) -> Dict[str, Any]:
+    """
+    Wait for simulation jobs to finish.
+
+    Args:
+        job_ids: Job IDs to wait for
+        timeout: Maximum seconds to wait (default: 600); pending jobs keep running afterwards
+        return_when: "ALL_COMPLETED" (default) or "FIRST_COMPLETED"
+
+    Returns:
+        jobs (records in the order given), finished/pending counts and timed_out
+    """
+    try:
+        if return_when not in ("ALL_COMPLETED", "FIRST_COMPLETED"):
+            return {"error": "return_when must be ALL_COMPLETED or FIRST_COMPLETED"}
+        return await brain_client.wait_for_jobs(job_ids, timeout, return_when)
+    except Exception as e:
+        return {"error": f"An unexpected error occurred: {str(e)}"}
+
+@instrumented_tool()
+async def list_jobs(status: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+    """
+    List this account's simulation jobs, newest first.
+
+    Args:
+        status: Only jobs with this status (queued, submitting, running, completed, failed)
+        limit: Maximum number of jobs to return (default: 50)
+    """
+    try:
+        jobs = brain_client.list_jobs(status, limit)
+        return {"count": len(jobs), "jobs": jobs}
+    except Exception as e:
+        return {"error": f"An unexpected error occurred: {str(e)}"}
+
+@instrumented_tool()
+async def get_simulation_queue() -> Dict[str, Any]:
+    """
+    Show how the account's simulation slots are shared between MCP clients.
+
+    Returns:
+        capacity and in_use slot counts, simulations waiting per priority class
+        ("interactive" for create_simulation / create_multi_simulation, "batch" for
+        create_simulation_batch and jobs) and per client, slots held per client, and
+        this caller's client key
+    """
+    try:
+        return brain_client._simulation_slots.snapshot(current_mcp_client.get())
+    except Exception as e:
+        return {"error": f"An unexpected error occurred: {str(e)}"}
+
 # --- Payment and Financial Tools ---
 
-@mcp.tool()
+@instrumented_tool()
 async def get_daily_and_quarterly_payment(email: str = "", password: str = "") -> Dict[str, Any]:
     """
     Get daily and quarterly payment information from WorldQuant BRAIN platform.
@@ -3058,7 +6023,7 @@ async def get_daily_and_quarterly_payment(email: str = "", password: str = "") -
         return {"error": f"An unexpected error occurred: {str(e)}"}
 
 from typing import Sequence
-@mcp.tool()
+@instrumented_tool()
 async def lookINTO_SimError_message(locations: Sequence[str]) -> dict:
     """
     Fetch and parse error/status from multiple simulation locations (URLs).
@@ -3115,7 +6080,7 @@ if __name__ == "__main__":
     if brain_client.redis_client:
         print("[INFO] Redis connection established successfully", file=sys.stderr)
     else:
-        print("[WARNING] Redis connection failed - caching disabled", file=sys.stderr)
+        print("[WARNING] Redis connection failed - using in-process and disk cache only", file=sys.stderr)
     
     # Run using Streamable HTTP transport in container environment so the server remains
     # running and accessible over HTTP (not stdio which exits in non-interactive containers).
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Lightweight tracing for the BRAIN MCP server.
+
+A trace is started per MCP tool call; span() records nested timings (HTTP requests,
+cache operations, auth checks, polling sleeps, Playwright steps) into it. Spans opened
+while no trace is active cost one context-variable lookup. Tool calls slower than
+BRAIN_TRACE_SLOW_SECONDS are written as Chrome trace-event JSON files to BRAIN_TRACE_DIR,
+which open in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Spans kept per trace; long polling loops should not grow a trace without bound
+MAX_SPANS_PER_TRACE = 20000
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.environ.get(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+class Trace:
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.wall_start = time.time()
+        self.events: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self._thread_ids: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _tid(self) -> int:
+        """Small stable row id per asyncio task (or thread) so overlapping spans don't stack."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else threading.get_ident()
+        with self._lock:
+            return self._thread_ids.setdefault(key, len(self._thread_ids) + 1)
+
+    def add(self, name: str, category: str, start: float, end: float, attributes: Dict[str, Any]):
+        with self._lock:
+            if len(self.events) >= MAX_SPANS_PER_TRACE:
+                self.dropped += 1
+                return
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round((start - self.start) * 1e6, 1),
+            'dur': round((end - start) * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': self._tid(),
+        }
+        if attributes:
+            event['args'] = {key: _jsonable(value) for key, value in attributes.items()}
+        with self._lock:
+            self.events.append(event)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        return {
+            'traceEvents': list(self.events),
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'name': self.name,
+                'started_at': datetime.fromtimestamp(self.wall_start).isoformat(),
+                'attributes': {key: _jsonable(value) for key, value in self.attributes.items()},
+                'dropped_spans': self.dropped,
+            },
+        }
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    text = str(value)
+    return text if len(text) <= 200 else text[:200] + '...'
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar('brain_trace', default=None)
+
+TRACING_ENABLED = _env_flag("BRAIN_TRACE", "true")
+try:
+    SLOW_SECONDS = float(os.environ.get("BRAIN_TRACE_SLOW_SECONDS", "30"))
+except Exception:
+    SLOW_SECONDS = 30.0
+TRACE_DIR = Path(os.environ.get("BRAIN_TRACE_DIR") or Path(__file__).parent / ".cache" / "traces")
+
+
+@contextmanager
+def span(name: str, category: str = "app", **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """Record a span in the active trace, if any.
+
+    Yields a dict; keys added to it inside the block are attached to the span.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield attributes
+        return
+    start = time.perf_counter()
+    try:
+        yield attributes
+    except BaseException as e:
+        attributes['error'] = type(e).__name__
+        raise
+    finally:
+        trace.add(name, category, start, time.perf_counter(), attributes)
+
+
+@contextmanager
+def trace_call(name: str, **attributes: Any) -> Iterator[Optional[Trace]]:
+    """Trace one top-level call; write it out if it took at least BRAIN_TRACE_SLOW_SECONDS.
+
+    Nested trace_call blocks join the outer trace instead of starting a new one.
+    """
+    if not TRACING_ENABLED or _current_trace.get() is not None:
+        with span(name, "tool", **attributes):
+            yield _current_trace.get()
+        return
+    trace = Trace(name, attributes)
+    token = _current_trace.set(trace)
+    try:
+        with span(name, "tool", **attributes):
+            yield trace
+    finally:
+        _current_trace.reset(token)
+        elapsed = time.perf_counter() - trace.start
+        if elapsed >= SLOW_SECONDS:
+            _write_trace(trace, elapsed)
+
+
+def _write_trace(trace: Trace, elapsed: float):
+    try:
+        TRACE_DIR.mkdir(parents=True, exist_ok=True)
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', trace.name)
+        stamp = datetime.fromtimestamp(trace.wall_start).strftime('%Y%m%d-%H%M%S')
+        path = TRACE_DIR / f"{stamp}-{safe_name}-{os.getpid()}-{id(trace) % 100000}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace.to_chrome_trace(), f)
+        print(f"[INFO] Slow call {trace.name} took {elapsed:.1f}s, trace written to {path}", file=sys.stderr)
+    except Exception as e:
+        print(f"[WARNING] Could not write trace for {trace.name}: {str(e)}", file=sys.stderr)
+
+
+async def traced_sleep(seconds: float, reason: str = "sleep"):
+    """asyncio.sleep recorded as a span, so backoff and Retry-After waits show up in traces."""
+    with span(f"sleep:{reason}", "sleep", seconds=seconds):
+        await asyncio.sleep(seconds)
+
+
+def traced(name: str, category: str = "app"):
+    """Decorator recording every call of a function (sync or async) as a span."""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name, category):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, category):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def detached(awaitable):
+    """Await outside any trace; for background tasks started from inside a traced call."""
+    _current_trace.set(None)
+    return await awaitable
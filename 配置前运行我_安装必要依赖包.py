@@ -24,6 +24,7 @@ from typing import List, Tuple, Optional
 REQUIRED_PACKAGES: List[str] = [
     "fastmcp>=0.1.0",
     "requests>=2.31.0",
+    "httpx>=0.27.0",
     "pandas>=2.0.0",
     "selenium>=4.15.0",
     "beautifulsoup4>=4.12.0",